@@ -0,0 +1,94 @@
+"""
+Benchmarks decoding Bybit/Binance websocket messages and reading their values as floats, comparing
+orjson dicts against the typed structs of src.exchanges.*.websockets.schemas (requires msgspec).
+
+Run from the project root with:
+    $ python -m benchmarks.decode_messages
+"""
+
+import orjson
+import numpy as np
+from timeit import timeit
+from typing import Callable, Dict, Tuple
+from src.exchanges.bybit.websockets.schemas import bybit_decoder
+from src.exchanges.binance.websockets.schemas import binance_decoder
+
+def make_messages() -> Dict[str, Tuple[bytes, Callable, Callable]]:
+    """
+    Builds messages shaped like the ones seen live, each with a dict and a typed reader extracting the values handlers use.
+    """
+    rng = np.random.default_rng(0)
+    bybit = bybit_decoder(["publicTrade.ETHUSDT", "tickers.ETHUSDT", "kline.1.ETHUSDT"])
+    binance = binance_decoder(["ethusdt@bookTicker", "ethusdt@trade"])
+
+    trades = orjson.dumps({
+        "topic": "publicTrade.ETHUSDT", "type": "snapshot", "ts": 1700000000000,
+        "data": [
+            {"T": 1700000000000 + i, "s": "ETHUSDT", "S": "Buy", "v": f"{rng.random():.3f}",
+             "p": f"{3000 + rng.random():.2f}", "L": "PlusTick", "i": "2c5a5a2b-49ba-5ef6-b0d6-d0a2ab1e8d70", "BT": False}
+            for i in range(5)
+        ],
+    })
+    ticker = orjson.dumps({
+        "topic": "tickers.ETHUSDT", "type": "delta", "cs": 1, "ts": 1700000000000,
+        "data": {"symbol": "ETHUSDT", "markPrice": "3000.51", "indexPrice": "3000.22", "bid1Price": "3000.50",
+                 "bid1Size": "12.5", "ask1Price": "3000.51", "ask1Size": "3.1"},
+    })
+    kline = orjson.dumps({
+        "topic": "kline.1.ETHUSDT", "type": "snapshot", "ts": 1700000000000,
+        "data": [{"start": 1700000000000, "end": 1700000059999, "interval": "1", "open": "3000.1", "close": "3001.5",
+                  "high": "3002.0", "low": "2999.8", "volume": "1520.23", "turnover": "4561234.12",
+                  "confirm": False, "timestamp": 1700000000000}],
+    })
+    book_ticker = orjson.dumps({
+        "stream": "ethusdt@bookTicker",
+        "data": {"e": "bookTicker", "u": 400900217, "E": 1700000000000, "T": 1700000000000, "s": "ETHUSDT",
+                 "b": "3000.50", "B": "31.21", "a": "3000.51", "A": "40.66"},
+    })
+    trade = orjson.dumps({
+        "stream": "ethusdt@trade",
+        "data": {"e": "trade", "E": 1700000000000, "T": 1700000000000, "s": "ETHUSDT", "t": 12345,
+                 "p": "3000.51", "q": "0.004", "X": "MARKET", "m": True},
+    })
+
+    candle_keys = ["start", "open", "high", "low", "close", "volume", "turnover"]
+
+    return {
+        "bybit publicTrade (5 trades)": (
+            trades,
+            lambda m: [(float(t["T"]), t["S"], float(t["p"]), float(t["v"])) for t in orjson.loads(m)["data"]],
+            lambda m: [(float(t.T), t.S, t.p, t.v) for t in bybit.decode(m).data],
+        ),
+        "bybit tickers": (
+            ticker,
+            lambda m: float(orjson.loads(m)["data"]["markPrice"]),
+            lambda m: bybit.decode(m).data.markPrice,
+        ),
+        "bybit kline": (
+            kline,
+            lambda m: [[float(c[k]) for k in candle_keys] for c in orjson.loads(m)["data"]],
+            lambda m: [[c.start, c.open, c.high, c.low, c.close, c.volume, c.turnover] for c in bybit.decode(m).data],
+        ),
+        "binance bookTicker": (
+            book_ticker,
+            lambda m: [float(v) for v in map(orjson.loads(m)["data"].get, "bBaA")],
+            lambda m: (lambda d: [d.b, d.B, d.a, d.A])(binance.decode(m).data),
+        ),
+        "binance trade": (
+            trade,
+            lambda m: (lambda d: (float(d["T"]), float(d["p"]), float(d["q"]), d["m"]))(orjson.loads(m)["data"]),
+            lambda m: (lambda d: (float(d.T), d.p, d.q, d.m))(binance.decode(m).data),
+        ),
+    }
+
+def run(number: int=20000) -> None:
+    for name, (msg, read_dict, read_typed) in make_messages().items():
+        assert read_dict(msg) == read_typed(msg)
+
+        baseline = timeit(lambda: read_dict(msg), number=number) / number * 1e6
+        typed = timeit(lambda: read_typed(msg), number=number) / number * 1e6
+
+        print(f"{name:<32} | orjson: {baseline:6.2f}us | typed: {typed:6.2f}us | {baseline / typed:5.2f}x")
+
+if __name__ == "__main__":
+    run()
@@ -0,0 +1,146 @@
+"""
+Benchmarks ingesting trades into the shared trade buffers, comparing the previous path (one
+np.array row allocated and appended per trade) against the handlers, for both the startup REST
+page and websocket messages of a few sizes.
+
+Both paths do the same work: each trade also updates the streaming trades imbalance, and each
+page or message marks the trades as updated (and sets Binance's last price). The handlers extend
+the buffer in bulk, except for messages of a trade or two, which are added one at a time.
+
+Run from the project root with:
+    $ python -m benchmarks.ingest_trades
+"""
+
+import numpy as np
+from timeit import timeit
+from types import SimpleNamespace
+from typing import Dict, List, Tuple
+from src.exchanges.bybit.websockets.handlers.trades import BybitTradesHandler
+from src.exchanges.binance.websockets.handlers.trades import BinanceTradesHandler
+from src.strategy.features.trades_imbalance import StreamingTradesImbalance
+from src.utils.events import MarketEvents
+from src.utils.ringbuffer import TimedRingBuffer
+
+def make_state() -> SimpleNamespace:
+    """
+    Holds just the trade buffers and streams the handlers write to, avoiding the need to load settings and API keys.
+    """
+    return SimpleNamespace(
+        bybit_trades=TimedRingBuffer(capacity=1000, width=4),
+        binance_trades=TimedRingBuffer(capacity=1000, width=4),
+        bybit_trades_imbalance=StreamingTradesImbalance(window=1000),
+        binance_trades_imbalance=StreamingTradesImbalance(window=1000),
+        binance_last_price=0,
+        market_events=MarketEvents(),
+    )
+
+def make_bybit_page(num_trades: int) -> List[Dict]:
+    rng = np.random.default_rng(0)
+    return [
+        {"execId": "2c5a5a2b", "symbol": "ETHUSDT", "price": f"{3000 + rng.random():.2f}", "size": f"{rng.random():.3f}",
+         "side": "Buy" if rng.random() > 0.5 else "Sell", "time": str(1700000000000 - i), "isBlockTrade": False}
+        for i in range(num_trades)
+    ]
+
+def make_bybit_msg(num_trades: int) -> Dict:
+    rng = np.random.default_rng(1)
+    return {
+        "topic": "publicTrade.ETHUSDT",
+        "data": [
+            {"T": 1700000000000 + i, "s": "ETHUSDT", "S": "Buy" if rng.random() > 0.5 else "Sell",
+             "v": f"{rng.random():.3f}", "p": f"{3000 + rng.random():.2f}", "L": "PlusTick", "BT": False}
+            for i in range(num_trades)
+        ],
+    }
+
+def make_binance_page(num_trades: int) -> List[Dict]:
+    rng = np.random.default_rng(2)
+    return [
+        {"id": i, "price": f"{3000 + rng.random():.2f}", "qty": f"{rng.random():.3f}", "quoteQty": "0",
+         "time": 1700000000000 + i, "isBuyerMaker": bool(rng.random() > 0.5), "isBestMatch": True}
+        for i in range(num_trades)
+    ]
+
+def make_binance_msg() -> Dict:
+    return {
+        "stream": "ethusdt@trade",
+        "data": {"e": "trade", "T": 1700000000000, "s": "ETHUSDT", "p": "3000.51", "q": "0.004", "m": True},
+    }
+
+def add_per_trade(ss: SimpleNamespace, venue: str, trade: Tuple[float, float, float, float]) -> None:
+    buffer, stream = getattr(ss, f"{venue}_trades"), getattr(ss, f"{venue}_trades_imbalance")
+    stream.push(trade[1], trade[3], buffer.recent(stream.window))
+    buffer.append(np.array(trade))
+
+def bybit_page_per_trade(ss: SimpleNamespace, data: List[Dict]) -> None:
+    for row in reversed(data):
+        side = 0.0 if row["side"] == "Buy" else 1.0
+        add_per_trade(ss, "bybit", (float(row["time"]), side, float(row["price"]), float(row["size"])))
+
+    ss.market_events.mark("bybit_trades")
+
+def bybit_msg_per_trade(ss: SimpleNamespace, recv: Dict) -> None:
+    for trade in recv["data"]:
+        side = 0.0 if trade["S"] == "Buy" else 1.0
+        add_per_trade(ss, "bybit", (float(trade["T"]), side, float(trade["p"]), float(trade["v"])))
+
+    ss.market_events.mark("bybit_trades")
+
+def binance_page_per_trade(ss: SimpleNamespace, data: List[Dict]) -> None:
+    for row in data:
+        side = 1.0 if row["isBuyerMaker"] else 0.0
+        add_per_trade(ss, "binance", (float(row["time"]), side, float(row["price"]), float(row["qty"])))
+
+    ss.market_events.mark("binance_trades")
+
+def binance_msg_per_trade(ss: SimpleNamespace, recv: Dict) -> None:
+    side = 1.0 if recv["data"]["m"] else 0.0
+    add_per_trade(ss, "binance", (float(recv["data"]["T"]), side, float(recv["data"]["p"]), float(recv["data"]["q"])))
+    ss.market_events.mark("binance_trades")
+    ss.binance_last_price = float(recv["data"]["p"])
+
+def report(name: str, per_trade: float, bulk: float, num_trades: int) -> None:
+    print(
+        f"{name:<34} | per-trade: {num_trades / per_trade / 1e3:8.0f}k trades/s "
+        f"| handler: {num_trades / bulk / 1e3:8.0f}k trades/s | {per_trade / bulk:5.2f}x"
+    )
+
+def run(number: int=200) -> None:
+    ss = make_state()
+    bybit, binance = BybitTradesHandler(ss), BinanceTradesHandler(ss)
+
+    page = make_bybit_page(1000)
+    report(
+        "bybit startup (1000 trade page)",
+        timeit(lambda: bybit_page_per_trade(ss, page), number=number) / number,
+        timeit(lambda: bybit.initialize(page), number=number) / number,
+        len(page),
+    )
+
+    page = make_binance_page(1000)
+    report(
+        "binance startup (1000 trade page)",
+        timeit(lambda: binance_page_per_trade(ss, page), number=number) / number,
+        timeit(lambda: binance.initialize(page), number=number) / number,
+        len(page),
+    )
+
+    for num_trades in (1, 2, 5, 50):
+        msg = make_bybit_msg(num_trades)
+        report(
+            f"bybit publicTrade ({num_trades} trade{'s' if num_trades > 1 else ''})",
+            timeit(lambda: bybit_msg_per_trade(ss, msg), number=number * 10) / (number * 10),
+            timeit(lambda: bybit.process(msg), number=number * 10) / (number * 10),
+            num_trades,
+        )
+
+    msg = make_binance_msg()
+    report(
+        "binance trade (1 trade)",
+        timeit(lambda: binance_msg_per_trade(ss, msg), number=number * 10) / (number * 10),
+        timeit(lambda: binance.process(msg), number=number * 10) / (number * 10),
+        1,
+    )
+
+if __name__ == "__main__":
+    run()
@@ -1,16 +1,22 @@
 import asyncio
-import uvloop
-from dotenv import load_dotenv
-load_dotenv()
+from src.utils.importtime import ImportProfiler
 
-from src.strategy.core import Strategy
-from src.sharedstate import SharedState
+with ImportProfiler() as imports:
+    import uvloop
+    from dotenv import load_dotenv
+    load_dotenv()
+
+    from src.strategy.core import Strategy
+    from src.sharedstate import SharedState
+    from src.exchanges.common.session import close_session
 
 async def main():
     """
     The main entry point of the application. Initializes the shared state and strategy,
     then concurrently refreshes parameters and runs the trading strategy.
     """
+    imports.report()
+
     try:
         sharedstate = SharedState()
         await asyncio.gather(
@@ -23,6 +29,10 @@ async def main():
         # TODO: Add shutdown sequence here
         raise e
 
+    finally:
+        # NOTE: Closes the pooled connections shared by every REST client
+        await close_session()
+
 if __name__ == "__main__":
     asyncio.set_event_loop_policy(uvloop.EventLoopPolicy())
     asyncio.run(main())
\ No newline at end of file
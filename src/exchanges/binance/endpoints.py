@@ -1,5 +1,17 @@
 from dataclasses import dataclass
 
+@dataclass
+class BaseEndpoints:
+    FUTURES = "https://fapi.binance.com"
+
+@dataclass
+class PublicGetLinks:
+    SERVER_TIME = "/fapi/v1/time"
+    ORDERBOOK = "/fapi/v1/depth"
+    KLINES = "/fapi/v1/klines"
+    RECENT_TRADES = "/fapi/v1/trades"
+    EXCHANGE_INFO = "/fapi/v1/exchangeInfo"
+
 @dataclass
 class WsStreamLinks:
     SPOT_PUBLIC_STREAM = "wss://stream.binance.com:9443"
@@ -1,36 +1,59 @@
-from binance.client import Client
-from typing import Dict
+import asyncio
+import orjson
+from typing import Dict, List, Union
+from src.exchanges.binance.endpoints import BaseEndpoints, PublicGetLinks
+from src.exchanges.common.localorderbook import BaseOrderBook
+from src.exchanges.common.session import shared_session
 from src.sharedstate import SharedState
 
 class BinancePublicGet:
     """
-    Provides access to public data from Binance such as order books, klines (candlesticks),
-    and recent trades for a specified symbol.
+    Provides access to public data from Binance USD-M futures, such as order books, klines
+    (candlesticks), and recent trades for a specified symbol.
+
+    Requests are sent on the shared session (see src.exchanges.common.session), so several can
+    run concurrently over pooled connections, without blocking the event loop.
 
     Attributes
     ----------
+    max_retries : int
+        Maximum number of attempts for a request before giving up.
+    snapshot_attempts : int
+        Maximum number of snapshots fetched by `depth_snapshot` until one can be synced from.
+    trades_limit : int
+        The most trades Binance returns per request.
     ss : SharedState
         An instance of SharedState containing configuration and shared data.
     symbol : str
         The trading symbol to query data for.
-    client : Client
-        The Binance client from the python-binance package for making API requests.
+    base_endpoint : str
+        The base URL of Binance's futures REST API.
+    session : aiohttp.ClientSession
+        The shared session requests are sent on.
 
     Methods
     -------
+    _get_(endpoint: str, params: Dict) -> Union[Dict, List]:
+        Sends a GET request and returns its response, raising if Binance reports an error.
     orderbook(limit: int) -> Dict:
         Fetches the order book for the symbol up to a specified limit.
-    klines(limit: int, interval: int) -> Dict:
+    depth_snapshot(book: BaseOrderBook, limit: int) -> Dict:
+        Fetches an order book snapshot which the book's buffered diffs can be applied on.
+    klines(limit: int, interval: str) -> List:
         Retrieves klines (candlestick data) for the symbol, given a limit and time interval.
-    trades(limit: int) -> Dict:
+    trades(limit: int) -> List:
         Obtains recent trades for the symbol up to a specified limit.
     instrument_info() -> Dict:
         Gets detailed symbol information.
     """
 
+    max_retries = 3
+    snapshot_attempts = 5
+    trades_limit = 1000
+
     def __init__(self, ss: SharedState) -> None:
         """
-        Initializes the BinancePublicGet class with shared state and prepares the Binance client.
+        Initializes the BinancePublicGet class with shared state and the shared session.
 
         Parameters
         ----------
@@ -38,8 +61,46 @@ class BinancePublicGet:
             The shared state instance from which the Binance symbol is retrieved.
         """
         self.ss = ss
-        self.symbol: str = self.ss.binance_symbol
-        self.client = Client()
+        self.symbol: str = self.ss.binance_symbol.upper()
+        self.base_endpoint = BaseEndpoints.FUTURES
+        self.session = shared_session()
+
+    async def _get_(self, endpoint: str, params: Dict) -> Union[Dict, List]:
+        """
+        Sends a GET request, retrying failed attempts, and returns its response.
+
+        Parameters
+        ----------
+        endpoint : str
+            The API endpoint to which the request is sent.
+        params : Dict
+            The query parameters of the request.
+
+        Returns
+        -------
+        Union[Dict, List]
+            The JSON response from the API.
+
+        Raises
+        ------
+        Exception
+            If the request still fails after `max_retries` attempts, or Binance reports an error.
+        """
+        for attempt in range(self.max_retries):
+            try:
+                async with self.session.get(self.base_endpoint + endpoint, params=params) as req:
+                    response = orjson.loads(await req.read())
+
+                    if req.status != 200:
+                        raise Exception(f"Error: {response.get('code')}/{response.get('msg')} | Endpoint: {endpoint}")
+
+                return response
+
+            except Exception as e:
+                if attempt < self.max_retries - 1:
+                    await asyncio.sleep(attempt)
+                else:
+                    raise e
 
     async def orderbook(self, limit: int) -> Dict:
         """
@@ -53,11 +114,44 @@ class BinancePublicGet:
         Returns
         -------
         Dict
-            A dictionary containing the current order book, including bids and asks.
+            A dictionary containing the current order book, including bids, asks and its "lastUpdateId".
+        """
+        return await self._get_(PublicGetLinks.ORDERBOOK, {"symbol": self.symbol, "limit": limit})
+
+    async def depth_snapshot(self, book: BaseOrderBook, limit: int=500) -> Dict:
+        """
+        Fetches an order book snapshot to sync `book` from, following Binance's procedure for a
+        local order book: diffs are streamed (and buffered by the book) before the snapshot is
+        fetched, and the snapshot can only be synced from if it doesn't predate the first of them.
+
+        Snapshots which predate the first buffered diff, or arrive before any diff is buffered,
+        are refetched, up to `snapshot_attempts` times. The last one is returned regardless, in
+        which case the book detects the gap and requests another resync.
+
+        Parameters
+        ----------
+        book : BaseOrderBook
+            The book being resynced, buffering the streamed diffs.
+        limit : int, optional
+            The maximum number of levels to retrieve for each side, by default 500.
+
+        Returns
+        -------
+        Dict
+            A dictionary containing the order book, including bids, asks and its "lastUpdateId".
         """
-        return self.client.get_order_book(symbol=self.symbol, limit=limit)
+        for attempt in range(self.snapshot_attempts):
+            snapshot = await self.orderbook(limit)
+
+            if 0 < book.first_pending_id <= snapshot["lastUpdateId"]:
+                break
 
-    async def klines(self, limit: int, interval: str) -> Dict:
+            # NOTE: Diffs are streamed every 100ms, so the next one will have been buffered by then
+            await asyncio.sleep(0.1)
+
+        return snapshot
+
+    async def klines(self, limit: int, interval: str) -> List:
         """
         Retrieves klines (candlestick data) for the specified symbol.
 
@@ -70,15 +164,17 @@ class BinancePublicGet:
 
         Returns
         -------
-        Dict
-            A dictionary containing the kline data.
+        List
+            A list of klines, oldest first.
         """
-        return self.client.get_klines(symbol=self.symbol, interval=interval, limit=limit)
+        return await self._get_(PublicGetLinks.KLINES, {"symbol": self.symbol, "interval": interval, "limit": limit})
 
-    async def trades(self, limit: int) -> Dict:
+    async def trades(self, limit: int) -> List:
         """
         Obtains a list of recent trades for the specified symbol.
 
+        NOTE: Binance only serves the latest `trades_limit` trades, so larger limits are capped.
+
         Parameters
         ----------
         limit : int
@@ -86,11 +182,11 @@ class BinancePublicGet:
 
         Returns
         -------
-        Dict
-            A dictionary containing recent trade data.
+        List
+            A list of recent trades, oldest first.
         """
-        return self.client.get_recent_trades(symbol=self.symbol, limit=limit)
-    
+        return await self._get_(PublicGetLinks.RECENT_TRADES, {"symbol": self.symbol, "limit": min(limit, self.trades_limit)})
+
     async def instrument_info(self) -> Dict:
         """
         Gets detailed information about the specified symbol.
@@ -98,6 +194,17 @@ class BinancePublicGet:
         Returns
         -------
         Dict
-            A dictionary containing detailed symbol information, such as trading pairs and limits.
+            A dictionary containing detailed symbol information, such as its precision and filters.
+
+        Raises
+        ------
+        ValueError
+            If the symbol isn't listed on Binance USD-M futures.
         """
-        return self.client.get_symbol_info(symbol=self.symbol)
+        info = await self._get_(PublicGetLinks.EXCHANGE_INFO, {})
+
+        for symbol in info["symbols"]:
+            if symbol["symbol"] == self.symbol:
+                return symbol
+
+        raise ValueError(f"Symbol {self.symbol} isn't listed on Binance USD-M futures!")
@@ -1,6 +1,11 @@
-import numpy as np
-from typing import Dict
+from numpy.typing import NDArray
+from typing import TYPE_CHECKING, Dict, List, Tuple
 from src.exchanges.common.localorderbook import BaseOrderBook
+from src.exchanges.common.ladderorderbook import LadderOrderBook
+from src.utils.parsing import parse_levels
+
+if TYPE_CHECKING:
+    from src.exchanges.binance.websockets.schemas import BinanceBookTickerMsg, BinanceDepthMsg
 
 class OrderBookBinance(BaseOrderBook):
     """
@@ -11,31 +16,87 @@ class OrderBookBinance(BaseOrderBook):
 
     def process_snapshot(self, snapshot: Dict) -> None:
         """
-        Processes the initial snapshot of the order book.
+        Processes a REST snapshot of the order book, then applies any diffs buffered
+        while it was being fetched.
 
         Parameters
         ----------
         snapshot : Dict
             A dictionary containing the initial state of the asks and bids in the order book.
         """
-        self.asks = np.array(snapshot["asks"], dtype=float)
-        self.bids = np.array(snapshot["bids"], dtype=float)
-        self.sort_book()
+        self.initialize_book(
+            asks=parse_levels(snapshot["asks"], self._ask_buffer_),
+            bids=parse_levels(snapshot["bids"], self._bid_buffer_)
+        )
+        self.reset_sequence(int(snapshot["lastUpdateId"]), bridge=True)
 
     def process(self, recv: Dict) -> None:
         """
         Processes real-time updates to the order book.
 
+        Each diff carries its first ("U") and final ("u") update IDs, along with the final
+        update ID of the previous diff ("pu"), which must match the last one applied.
+
         Parameters
         ----------
         recv : Dict
             A dictionary containing the updates to the asks and bids in the order book.
         """
-        asks = np.array(recv["data"]["a"], dtype=float)
-        bids = np.array(recv["data"]["b"], dtype=float)
-        self.asks = self.update_book(self.asks, asks)
-        self.bids = self.update_book(self.bids, bids)
-        self.sort_book()
+        data = recv["data"]
+        asks = parse_levels(data["a"], self._ask_buffer_)
+        bids = parse_levels(data["b"], self._bid_buffer_)
+        self.sequence_update(data["U"], data["pu"], data["u"], asks, bids)
+
+    def unpack(self, recv: Dict) -> Tuple[int, int, int, NDArray, NDArray]:
+        """
+        Parses an update message into the fields needed to apply it, for use with `process_batch`.
+
+        Parameters
+        ----------
+        recv : Dict
+            A dictionary containing the updates to the asks and bids in the order book.
+
+        Returns
+        -------
+        Tuple[int, int, int, NDArray, NDArray]
+            The first, previous and final update IDs of the diff, and its asks and bids.
+        """
+        data = recv["data"]
+        return data["U"], data["pu"], data["u"], parse_levels(data["a"]), parse_levels(data["b"])
+
+    def unpack_typed(self, msg: "BinanceDepthMsg") -> Tuple[int, int, int, NDArray, NDArray]:
+        """
+        Parses a typed update message into the fields needed to apply it, for use with `process_batch`.
+
+        Parameters
+        ----------
+        msg : BinanceDepthMsg
+            The decoded message containing the updates to the asks and bids in the order book.
+
+        Returns
+        -------
+        Tuple[int, int, int, NDArray, NDArray]
+            The first, previous and final update IDs of the diff, and its asks and bids.
+        """
+        data = msg.data
+        return data.U, data.pu, data.u, parse_levels(data.a), parse_levels(data.b)
+
+    def process_batch(self, deltas: List[Tuple[int, int, int, NDArray, NDArray]]) -> None:
+        """
+        Processes several queued updates at once, coalescing them into a single update where their sequence allows.
+
+        Parameters
+        ----------
+        deltas : List[Tuple[int, int, int, NDArray, NDArray]]
+            The queued updates, unpacked with `unpack` or `unpack_typed`, in the order they were received.
+        """
+        self.sequence_updates(deltas)
+
+
+class LadderOrderBookBinance(LadderOrderBook, OrderBookBinance):
+    """
+    Order book class for Binance, storing levels in the tick-indexed ladder instead of sorted arrays.
+    """
 
 
 class BinanceBBAHandler:
@@ -74,3 +135,20 @@ class BinanceBBAHandler:
         self.ss.binance_bba[0, 1] = float(recv["data"]["B"])
         self.ss.binance_bba[1, 0] = float(recv["data"]["a"])
         self.ss.binance_bba[1, 1] = float(recv["data"]["A"])
+        self.ss.market_events.mark("binance_bba")
+
+    def process_typed(self, msg: "BinanceBookTickerMsg") -> None:
+        """
+        Processes real-time BBA updates from a typed message, with prices and quantities already converted to floats.
+
+        Parameters
+        ----------
+        msg : BinanceBookTickerMsg
+            The decoded message containing the latest best bid and ask prices and quantities.
+        """
+        data = msg.data
+        self.ss.binance_bba[0, 0] = data.b
+        self.ss.binance_bba[0, 1] = data.B
+        self.ss.binance_bba[1, 0] = data.a
+        self.ss.binance_bba[1, 1] = data.A
+        self.ss.market_events.mark("binance_bba")
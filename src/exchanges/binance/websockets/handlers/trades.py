@@ -1,6 +1,10 @@
 import numpy as np
+from numpy.typing import NDArray
 from src.sharedstate import SharedState
-from typing import Dict, List
+from typing import TYPE_CHECKING, Dict, List
+
+if TYPE_CHECKING:
+    from src.exchanges.binance.websockets.schemas import BinanceTradeMsg
 
 class BinanceTradesHandler:
     """
@@ -28,6 +32,29 @@ class BinanceTradesHandler:
         """
         self.ss = ss
 
+    def _add_trades_(self, trades: NDArray) -> None:
+        """
+        Adds a block of trades to the streaming trades imbalance, then to the shared trade buffer.
+
+        Parameters
+        ----------
+        trades : NDArray
+            The new trades, oldest first, in format [time, side, price, size].
+        """
+        stream = self.ss.binance_trades_imbalance
+        stream.update(self.ss.binance_trades.recent(stream.window), trades)
+        self.ss.binance_trades.extend(trades)
+        self.ss.market_events.mark("binance_trades")
+
+    def _add_trade_(self, time: float, side: float, price: float, qty: float) -> None:
+        """
+        Adds a single trade to the streaming trades imbalance, then writes it straight into the shared trade buffer's row.
+        The caller marks the trades as updated, once per message.
+        """
+        stream = self.ss.binance_trades_imbalance
+        stream.push(side, qty, self.ss.binance_trades.recent(stream.window))
+        self.ss.binance_trades.append((time, side, price, qty))
+
     def initialize(self, data: List[Dict]) -> None:
         """
         Initializes the shared state with historical trade data.
@@ -37,13 +64,14 @@ class BinanceTradesHandler:
         data : List[Dict]
             A list of dictionaries where each dictionary contains information about a single trade.
         """
-        for row in data:
-            time = float(row["time"])
-            price = float(row["price"])
-            qty = float(row["qty"])
-            side = 1.0 if row["isBuyerMaker"] else 0.0
-            new_trade = np.array([[time, side, price, qty]])
-            self.ss.binance_trades.append(new_trade)
+        trades = np.array([
+            (float(row["time"]), 1.0 if row["isBuyerMaker"] else 0.0, float(row["price"]), float(row["qty"]))
+            for row in data
+        ], dtype=np.float64).reshape(-1, 4)
+
+        # NOTE: The buffer is ordered oldest to newest, whichever order the page is returned in
+        trades = trades[np.argsort(trades[:, 0], kind="stable")]
+        self._add_trades_(trades)
 
     def process(self, recv: Dict) -> None:
         """
@@ -58,6 +86,21 @@ class BinanceTradesHandler:
         price = float(recv["data"]["p"])
         qty = float(recv["data"]["q"])
         side = 1.0 if recv["data"]["m"] else 0.0
-        new_trade = np.array([[time, side, price, qty]])
-        self.ss.binance_trades.append(new_trade)
-        self.ss.binance_last_price = float(price)
\ No newline at end of file
+        self._add_trade_(time, side, price, qty)
+        self.ss.binance_last_price = float(price)
+        self.ss.market_events.mark("binance_trades")
+
+    def process_typed(self, msg: "BinanceTradeMsg") -> None:
+        """
+        Processes a new incoming trade from a typed message, with its price and quantity already converted to floats.
+
+        Parameters
+        ----------
+        msg : BinanceTradeMsg
+            The decoded message containing information about a single new trade.
+        """
+        data = msg.data
+        side = 1.0 if data.m else 0.0
+        self._add_trade_(float(data.T), side, data.p, data.q)
+        self.ss.binance_last_price = data.p
+        self.ss.market_events.mark("binance_trades")
@@ -0,0 +1,59 @@
+from msgspec import Struct
+from typing import List
+from src.exchanges.common.decoding import TopicDecoder
+
+# NOTE: Messages never contain cycles, so none of the Structs need to be tracked by the GC.
+# Fields that aren't declared are skipped while decoding.
+
+class BinanceDepthData(Struct, gc=False):
+    U: int
+    u: int
+    pu: int
+    a: List[List[str]]  # NOTE: Levels are left as strings for src.utils.parsing.parse_levels
+    b: List[List[str]]
+
+class BinanceDepthMsg(Struct, gc=False):
+    data: BinanceDepthData
+
+class BinanceBookTickerData(Struct, gc=False):
+    b: float
+    B: float
+    a: float
+    A: float
+
+class BinanceBookTickerMsg(Struct, gc=False):
+    data: BinanceBookTickerData
+
+class BinanceTradeData(Struct, gc=False):
+    T: int
+    p: float
+    q: float
+    m: bool
+
+class BinanceTradeMsg(Struct, gc=False):
+    data: BinanceTradeData
+
+SCHEMAS = {
+    "depth": BinanceDepthMsg,
+    "bookTicker": BinanceBookTickerMsg,
+    "trade": BinanceTradeMsg,
+}
+
+def binance_decoder(list_of_topics: List[str]) -> TopicDecoder:
+    """
+    Creates a decoder for the given Binance streams, as returned by `BinancePublicWs.multi_stream_request`.
+
+    Parameters
+    ----------
+    list_of_topics : List[str]
+        The stream names (eg, "ethusdt@depth@100ms", "ethusdt@trade").
+
+    Returns
+    -------
+    TopicDecoder
+        A decoder returning the typed message of each stream.
+    """
+    return TopicDecoder(
+        schemas={topic: SCHEMAS[topic.split("@")[1]] for topic in list_of_topics},
+        tag_field="stream"
+    )
@@ -15,6 +15,13 @@ class WsStreamLinks:
     FUTURES_PUBLIC_STREAM = f"wss://{domain}/v5/public/linear"
     COMBINED_PRIVATE_STREAM = f"wss://{domain}/v5/private"
 
+@dataclass
+class PublicGetLinks:
+    SERVER_TIME = "/v5/market/time"
+    KLINES = "/v5/market/kline"
+    RECENT_TRADES = "/v5/market/recent-trade"
+    INSTRUMENTS_INFO = "/v5/market/instruments-info"
+
 @dataclass
 class PrivateGetLinks:
     OPEN_ORDERS = "/v5/order/realtime"
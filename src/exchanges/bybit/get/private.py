@@ -1,11 +1,11 @@
-import hashlib
-import hmac
 import aiohttp
 import orjson
 import asyncio
 from typing import Dict, Union
-from src.utils.misc import time_ms, datetime_now as dt_now
+from src.utils.misc import datetime_now as dt_now
 from src.exchanges.bybit.endpoints import BaseEndpoints, PrivateGetLinks
+from src.exchanges.bybit.ratelimit import Priority
+from src.exchanges.bybit.signer import BybitSigner
 from src.sharedstate import SharedState
 
 
@@ -21,10 +21,14 @@ class BybitPrivateGetClient:
         Maximum number of retries for a request before giving up.
     recv_window : str
         The time in milliseconds the request is valid after the timestamp.
+    signer : BybitSigner
+        Signs each request, returning its own headers.
     _success_ : List[str]
         List of messages indicating a successful request.
     _retry_ : List[int]
         List of error codes that should trigger a retry.
+    _rate_limited_ : List[int]
+        List of error codes for exceeding the rate limit, retried once the endpoint's limit resets.
     _skip_ : List[int]
         List of error codes to skip or ignore without retrying.
 
@@ -38,7 +42,8 @@ class BybitPrivateGetClient:
     recv_window = "5000"
     _success_ = ["OK", "success", "SUCCESS", ""]
     _retry_ = [100016]  # NOTE: Add more as necessary
-    _skip_ = [10006, 110001, 110012]  # NOTE: Add more as necessary
+    _rate_limited_ = [10006]
+    _skip_ = [110001, 110012]  # NOTE: Add more as necessary
 
     def __init__(self, ss: SharedState) -> None:
         """
@@ -52,53 +57,12 @@ class BybitPrivateGetClient:
         self.ss = ss
         self.key, self.secret = self.ss.api_key, self.ss.api_secret
         self.base_endpoint = BaseEndpoints.MAINNET1
-        self.timestamp = time_ms()
-
-        # Predefined headers for requests, except the signature which is calculated per request
-        self.static_headers = {
-            "X-BAPI-TIMESTAMP": self.timestamp,
-            "X-BAPI-RECV-WINDOW": self.recv_window,
-            "X-BAPI-API-KEY": self.key,
-            "X-BAPI-SIGN-TYPE": "2",
-            "X-BAPI-SIGN": ""
-        }
-
-        self.static_partial_str = "".join([self.key, self.recv_window])
-
-    def _update_timestamp_(self) -> None:
-        """
-        Updates the timestamp for signing requests, ensuring it's current.
-        """
-        self.timestamp = str(time_ms())
-
-    def _sign_(self, payload: str) -> Dict:
-        """
-        Signs the request payload with the API secret key.
-
-        Parameters
-        ----------
-        payload : str
-            The request payload to be signed.
-
-        Returns
-        -------
-        Dict
-            The headers including the updated timestamp and signature.
-        """
-        self._update_timestamp_()
-        param_str = "".join([self.timestamp, self.static_partial_str, payload])
-        hash_signature = hmac.new(
-            bytes(self.secret, "utf-8"),
-            param_str.encode("utf-8"),
-            hashlib.sha256
-        ).hexdigest()
-        self.static_headers["X-BAPI-TIMESTAMP"] = self.timestamp
-        self.static_headers["X-BAPI-SIGN"] = hash_signature
-        return self.static_headers
+        self.signer = BybitSigner(self.key, self.secret, self.recv_window)
 
     async def submit(self, session: aiohttp.ClientSession, endpoint: str, payload: str) -> Union[Dict, None]:
         """
-        Asynchronously submits a signed GET request to the specified endpoint.
+        Asynchronously submits a signed GET request to the specified endpoint, once the request
+        scheduler allows it, in its lowest priority lane.
 
         Parameters
         ----------
@@ -114,13 +78,17 @@ class BybitPrivateGetClient:
         Union[Dict, None]
             The JSON response from the API or None if an error occurs.
         """
-        signed_header = self._sign_(payload)
+        scheduler = self.ss.request_scheduler
+        path = endpoint.split("?")[0]
         full_endpoint = self.base_endpoint + endpoint
         max_retries = self.max_retries
     
         for attempt in range(max_retries):
             try:
+                await scheduler.acquire(path, Priority.SYNC)
+                signed_header = self.signer.sign(payload)
                 req = await session.request("GET", url=full_endpoint, headers=signed_header)
+                scheduler.update(path, req.headers)
                 response = orjson.loads(await req.text())
                 code, msg = response["retCode"], response["retMsg"]
 
@@ -128,7 +96,10 @@ class BybitPrivateGetClient:
                     return response
                 
                 else:
-                    if code in self._retry_: 
+                    if code in self._rate_limited_:
+                        scheduler.rate_limited(path)
+
+                    elif code in self._retry_: 
                         raise Exception(f"Error: {code}/{msg} | Endpoint: {endpoint}")
                 
                     else:            
@@ -138,15 +109,14 @@ class BybitPrivateGetClient:
             except Exception as e:
                 if attempt < max_retries - 1:  
                     await asyncio.sleep(attempt)  
-                    signed_header = self._sign_(payload)
                 else:
                     raise e 
 
 
-import aiohttp
 from typing import Dict, Union
 from src.sharedstate import SharedState
 from src.exchanges.bybit.endpoints import PrivateGetLinks
+from src.exchanges.common.session import shared_session
 
 class BybitPrivateGet:
     """
@@ -163,7 +133,7 @@ class BybitPrivateGet:
     client : BybitPrivateGetClient
         A client configured to interact with Bybit's private API endpoints.
     session : aiohttp.ClientSession
-        An active session for making HTTP requests asynchronously.
+        The shared session requests are sent on, reusing its pooled connections.
 
     Methods
     -------
@@ -171,8 +141,6 @@ class BybitPrivateGet:
         Fetches the current open orders for the specified trading symbol.
     current_position() -> Union[Dict, None]:
         Retrieves the current position for the specified trading symbol.
-    _close_() -> None:
-        Closes the active aiohttp session gracefully.
     """
 
     def __init__(self, ss: SharedState) -> None:
@@ -188,7 +156,7 @@ class BybitPrivateGet:
         self.symbol = self.ss.bybit_symbol
         self.endpoints = PrivateGetLinks
         self.client = BybitPrivateGetClient(self.ss)
-        self.session = aiohttp.ClientSession()
+        self.session = shared_session()
 
     async def open_orders(self) -> Union[Dict, None]:
         """
@@ -214,12 +182,4 @@ class BybitPrivateGet:
         """
         payload = f"category=linear&symbol={self.symbol}"
         endpoint = f"{self.endpoints.CURRENT_POSITION}?{payload}"
-        return await self.client.submit(self.session, endpoint, payload)
- 
-    async def _close_(self) -> None:
-        """
-        Closes the aiohttp session associated with this instance.
-
-        This method should be called to release resources before the instance is discarded.
-        """
-        await self.session.close()
\ No newline at end of file
+        return await self.client.submit(self.session, endpoint, payload)
\ No newline at end of file
@@ -1,42 +1,55 @@
-from pybit.unified_trading import HTTP
-from typing import List
+import asyncio
+import orjson
+from typing import Dict, List, Optional
+from src.utils.misc import time_ms
+from src.exchanges.bybit.endpoints import BaseEndpoints, PublicGetLinks
+from src.exchanges.common.session import shared_session
 from src.sharedstate import SharedState
 
 class BybitPublicClient:
     """
-    A client for fetching public trading data from Bybit, such as kline (candlestick) data, 
+    A client for fetching public trading data from Bybit, such as kline (candlestick) data,
     recent trades, and instrument information.
 
+    Public data needs no API key, so requests are unsigned. They are sent on the shared session
+    (see src.exchanges.common.session), so several can run concurrently over pooled connections.
+
     Attributes
     ----------
     category : str
         The category of the trading instrument, e.g., "linear".
+    max_retries : int
+        Maximum number of attempts for a request before giving up.
+    page_limit : int
+        The most rows Bybit returns per request.
     ss : SharedState
         An instance of SharedState containing shared application data.
-    key : str
-        The API key obtained from the shared state for authorized requests.
-    secret : str
-        The API secret obtained from the shared state for signing requests.
-    session : HTTP
-        An instance of the HTTP client from pybit for making API requests.
+    base_endpoint : str
+        The base URL of Bybit's REST API.
+    session : aiohttp.ClientSession
+        The shared session requests are sent on.
     symbol : str
         The trading symbol to query data for, obtained from the shared state.
 
     Methods
     -------
-    klines(interval: int, limit: int) -> List:
-        Fetches kline data for the specified interval and limit.
-    trades(limit: int) -> List:
+    _get_(endpoint: str, params: Dict) -> Dict:
+        Sends a GET request and returns its response, raising if Bybit reports an error.
+    klines(interval: int, limit: int, end: int) -> Dict:
+        Fetches kline data for the specified interval and limit, over several pages if needed.
+    trades(limit: int) -> Dict:
         Retrieves the recent trades up to the specified limit.
-    instrument_info() -> List:
+    instrument_info() -> Dict:
         Gets the instrument information for the specified symbol.
     """
 
     category = "linear"
+    max_retries = 3
+    page_limit = 1000
 
     def __init__(self, ss: SharedState) -> None:
         """
-        Initializes the BybitPublicClient with shared state, API credentials, and trading symbol.
+        Initializes the BybitPublicClient with shared state and trading symbol.
 
         Parameters
         ----------
@@ -44,37 +57,97 @@ class BybitPublicClient:
             An instance of SharedState containing shared application data.
         """
         self.ss = ss
-        self.key, self.secret = self.ss.api_key, self.ss.api_secret
-        self.session = HTTP(api_key=self.key, api_secret=self.secret)
+        self.base_endpoint = BaseEndpoints.MAINNET1
+        self.session = shared_session()
         self.symbol = self.ss.bybit_symbol
 
-    async def klines(self, interval: int, limit: int) -> List:
+    async def _get_(self, endpoint: str, params: Dict) -> Dict:
+        """
+        Sends a GET request, retrying failed attempts, and returns its response.
+
+        Parameters
+        ----------
+        endpoint : str
+            The API endpoint to which the request is sent.
+        params : Dict
+            The query parameters of the request.
+
+        Returns
+        -------
+        Dict
+            The JSON response from the API.
+
+        Raises
+        ------
+        Exception
+            If the request still fails after `max_retries` attempts, or Bybit reports an error.
+        """
+        for attempt in range(self.max_retries):
+            try:
+                async with self.session.get(self.base_endpoint + endpoint, params=params) as req:
+                    response = orjson.loads(await req.read())
+
+                if response["retCode"] != 0:
+                    raise Exception(f"Error: {response['retCode']}/{response['retMsg']} | Endpoint: {endpoint}")
+
+                return response
+
+            except Exception as e:
+                if attempt < self.max_retries - 1:
+                    await asyncio.sleep(attempt)
+                else:
+                    raise e
+
+    async def klines(self, interval: int, limit: int, end: Optional[int]=None) -> Dict:
         """
         Asynchronously fetches kline data for the specified trading symbol, interval, and limit.
 
+        Limits above `page_limit` are fetched as several pages, each covering its own span of
+        time, requested concurrently and merged into a single response.
+
         Parameters
         ----------
         interval : int
-            The time interval for the klines.
+            The time interval for the klines, in minutes.
         limit : int
             The maximum number of kline entries to retrieve.
+        end : int, optional
+            The start time of the newest kline to retrieve in milliseconds, by default the current kline.
 
         Returns
         -------
-        List
-            A list of kline data entries.
+        Dict
+            The response, with the kline data entries of all pages (newest first) in ["result"]["list"].
         """
-        return self.session.get_kline(
-            category=self.category, 
-            symbol=self.symbol, 
-            interval=str(interval),
-            limit=str(limit)
-        )
-
-    async def trades(self, limit: int) -> List:
+        interval_ms = interval * 60_000
+        end = time_ms() if end is None else end
+        end -= end % interval_ms
+
+        pages = []
+
+        for page_end in range(end, end - limit * interval_ms, -self.page_limit * interval_ms):
+            page_size = min(self.page_limit, (page_end - end) // interval_ms + limit)
+            pages.append(self._get_(PublicGetLinks.KLINES, {
+                "category": self.category,
+                "symbol": self.symbol,
+                "interval": str(interval),
+                "start": str(page_end - (page_size - 1) * interval_ms),
+                "end": str(page_end),
+                "limit": str(page_size),
+            }))
+
+        responses = await asyncio.gather(*pages)
+        response = responses[0]
+        response["result"]["list"] = [kline for page in responses for kline in page["result"]["list"]]
+        return response
+
+    async def trades(self, limit: int) -> Dict:
         """
         Asynchronously retrieves recent trade history for the specified trading symbol and limit.
 
+        NOTE: Bybit only serves the latest `page_limit` trades, without pagination, so larger
+        limits are capped.
+
         Parameters
         ----------
         limit : int
@@ -82,25 +155,25 @@ class BybitPublicClient:
 
         Returns
         -------
-        List
-            A list of recent trade data entries.
+        Dict
+            The response, with the recent trade data entries in ["result"]["list"].
         """
-        return self.session.get_public_trade_history(
-            category=self.category, 
-            symbol=self.symbol, 
-            limit=str(limit)
-        )
-    
-    async def instrument_info(self) -> List:
+        return await self._get_(PublicGetLinks.RECENT_TRADES, {
+            "category": self.category,
+            "symbol": self.symbol,
+            "limit": str(min(limit, self.page_limit)),
+        })
+
+    async def instrument_info(self) -> Dict:
         """
         Asynchronously fetches instrument information for the specified trading symbol.
 
         Returns
         -------
-        List
-            A list containing instrument information.
+        Dict
+            The response, with the instrument information in ["result"]["list"].
         """
-        return self.session.get_instruments_info(
-            category=self.category,
-            symbol=self.symbol
-        )
\ No newline at end of file
+        return await self._get_(PublicGetLinks.INSTRUMENTS_INFO, {
+            "category": self.category,
+            "symbol": self.symbol,
+        })
@@ -1,11 +1,11 @@
-import hashlib
-import hmac
 import aiohttp
 import orjson
 import asyncio
-from typing import Dict
-from src.utils.misc import time_ms, datetime_now as dt_now
+from typing import Dict, Optional, Union
+from src.utils.misc import datetime_now as dt_now
 from src.exchanges.bybit.endpoints import BaseEndpoints
+from src.exchanges.bybit.ratelimit import Priority
+from src.exchanges.bybit.signer import BybitSigner
 from src.sharedstate import SharedState
 
 class BybitPrivatePostClient:
@@ -21,20 +21,20 @@ class BybitPrivatePostClient:
         The maximum number of retries for a request before giving up.
     recv_window : str
         The time in milliseconds the server allows for a request to be processed.
+    signer : BybitSigner
+        Signs each request, returning its own headers.
     _success_ : List[str]
         A list of messages indicating a successful request.
     _retry_ : List[int]
         A list of error codes that should trigger a retry of the request.
+    _rate_limited_ : List[int]
+        A list of error codes for exceeding the rate limit, retried once the endpoint's limit resets.
     _skip_ : List[int]
         A list of error codes that should not trigger a retry and instead skip the request.
 
     Methods
     -------
-    _update_timestamp_() -> None:
-        Updates the timestamp for request signing.
-    _sign_(payload: str) -> Dict:
-        Signs the request payload for authentication.
-    submit(session: aiohttp.ClientSession, endpoint: str, payload: dict) -> asyncio.Future:
+    submit(session: aiohttp.ClientSession, endpoint: str, payload: dict, priority: Priority, max_wait: float) -> asyncio.Future:
         Asynchronously submits a POST request to the specified Bybit API endpoint.
     """
 
@@ -42,7 +42,8 @@ class BybitPrivatePostClient:
     recv_window = "5000"
     _success_ = ["OK", "success", "SUCCESS", ""]
     _retry_ = [100016] # NOTE: Add more
-    _skip_ = [10006, 110001, 110012] # NOTE: Add more
+    _rate_limited_ = [10006]
+    _skip_ = [110001, 110012] # NOTE: Add more
 
     def __init__(self, ss: SharedState) -> None:
         """
@@ -56,51 +57,23 @@ class BybitPrivatePostClient:
         self.ss = ss
         self.key, self.secret = self.ss.api_key, self.ss.api_secret
         self.base_endpoint = BaseEndpoints.MAINNET1
-        self.timestamp = time_ms()
-
-        self.static_headers = {
-            "X-BAPI-TIMESTAMP": self.timestamp,
-            "X-BAPI-RECV-WINDOW": self.recv_window,
-            "X-BAPI-API-KEY": self.key, 
-            "X-BAPI-SIGN": ""
-        }
-
-        self.static_partial_str = "".join([self.key, self.recv_window])
-
-    def _update_timestamp_(self) -> None:
-        """
-        Updates the timestamp attribute to the current time in milliseconds.
+        self.signer = BybitSigner(self.key, self.secret, self.recv_window)
+
+    async def submit(
+        self,
+        session: aiohttp.ClientSession,
+        endpoint: str,
+        payload: dict,
+        priority: Priority=Priority.QUOTE,
+        max_wait: Optional[float]=None,
+    ) -> Union[Dict, None]:
         """
-        self.timestamp = str(time_ms())
+        Asynchronously submits a signed POST request to Bybit, once the request scheduler allows it.
 
-    def _sign_(self, payload: str) -> Dict:
-        """
-        Generates a signature for the given payload and updates request headers.
-
-        Parameters
-        ----------
-        payload : str
-            The request payload to be signed.
-
-        Returns
-        -------
-        Dict
-            The updated headers containing the signature.
-        """
-        self._update_timestamp_()
-        param_str = "".join([self.timestamp, self.static_partial_str, payload])
-        hash_signature = hmac.new(
-            bytes(self.secret, "utf-8"), 
-            param_str.encode("utf-8"), 
-            hashlib.sha256
-        ).hexdigest()
-        self.static_headers["X-BAPI-TIMESTAMP"] = self.timestamp
-        self.static_headers["X-BAPI-SIGN"] = hash_signature
-        return self.static_headers
-
-    async def submit(self, session: aiohttp.ClientSession, endpoint: str, payload: dict) -> Dict:
-        """
-        Asynchronously submits a signed POST request to Bybit.
+        Each attempt waits for the endpoint's rate limit first, and is signed only once allowed, so
+        its timestamp is fresh however long it waited. The scheduler is updated with the limit status
+        of every response, and a rate limit error pauses the endpoint until its limit resets, before
+        the request is retried.
 
         Parameters
         ----------
@@ -110,33 +83,44 @@ class BybitPrivatePostClient:
             The API endpoint to which the request is sent.
         payload : dict
             The payload of the request.
+        priority : Priority, optional
+            The lane the request waits in if rate limited, by default Priority.QUOTE.
+        max_wait : float, optional
+            The longest time to wait for the rate limit, in seconds, after which the request is dropped, by default no limit.
 
         Returns
         -------
-        Dict
-            The JSON response from the API if successful.
+        Union[Dict, None]
+            The JSON response from the API if successful, None if it failed or was dropped.
 
         Raises
         ------
         Exception
             If the request fails after the maximum number of retries.
         """
+        scheduler = self.ss.request_scheduler
         str_payload = orjson.dumps(payload).decode()
-        signed_header = self._sign_(str_payload)
         full_endpoint = self.base_endpoint + endpoint
         max_retries = self.max_retries
         
         for attempt in range(max_retries):
             try:
+                if not await scheduler.acquire(endpoint, priority, max_wait):
+                    return None
+
+                signed_header = self.signer.sign(str_payload)
                 req = await session.request("POST", full_endpoint, headers=signed_header, data=str_payload)
+                scheduler.update(endpoint, req.headers)
                 response = orjson.loads(await req.text())
                 code, msg = response["retCode"], response["retMsg"]
 
                 if msg in self._success_:
                     return {
                         "result": response["result"],
-                        "latency": int(response["time"]) - int(self.timestamp)
+                        "latency": int(response["time"]) - int(signed_header["X-BAPI-TIMESTAMP"])
                     }
+                elif code in self._rate_limited_:
+                    scheduler.rate_limited(endpoint)
                 elif code in self._retry_: 
                     raise Exception(f"Error: {code}/{msg} | Endpoint: {endpoint}")
                 else:            
@@ -145,6 +129,5 @@ class BybitPrivatePostClient:
             except Exception as e:
                 if attempt < max_retries - 1:
                     await asyncio.sleep(attempt + 1)  # Incremental back-off
-                    signed_header = self._sign_(str_payload)
                 else:
-                    raise e
\ No newline at end of file
+                    raise e
@@ -1,9 +1,10 @@
 import asyncio
-import aiohttp
-from typing import List, Dict, Tuple, Union
+from typing import List, Dict, Optional, Tuple, Union
 from src.exchanges.bybit.post.client import BybitPrivatePostClient
 from src.exchanges.bybit.endpoints import PrivatePostLinks
+from src.exchanges.bybit.ratelimit import Priority
 from src.exchanges.bybit.post.types import BybitFormats
+from src.exchanges.common.session import shared_session
 from src.sharedstate import SharedState
 
 class Order:
@@ -25,7 +26,7 @@ class Order:
     client : BybitPrivatePostClient
         A client configured for executing signed POST requests to Bybit.
     session : aiohttp.ClientSession
-        A session for making HTTP requests.
+        The shared session requests are sent on, reusing its pooled connections.
 
     Methods
     -------
@@ -33,11 +34,11 @@ class Order:
         Submits a market order.
     order_limit(order: Tuple) -> Union[Dict, None]:
         Submits a limit order.
-    order_limit_batch(orders: List) -> Union[Dict, None]:
+    order_limit_batch(orders: List, priority: Priority, max_wait: float) -> Union[Dict, None]:
         Submits a batch of limit orders.
     amend(order: Tuple) -> Union[Dict, None]:
         Amends an existing order.
-    amend_batch(orders: List) -> Union[Dict, None]:
+    amend_batch(orders: List, max_wait: float) -> Union[Dict, None]:
         Amends a batch of existing orders.
     cancel(orderId: str) -> Union[Dict, None]:
         Cancels an existing order by its ID.
@@ -45,6 +46,9 @@ class Order:
         Cancels a batch of orders by their IDs.
     cancel_all() -> Union[Dict, None]:
         Cancels all orders for the trading symbol.
+
+    Cancels are sent in the scheduler's most urgent lane, ahead of any creates or amends waiting
+    for the rate limit, which can also be dropped if they wait longer than `max_wait`.
     """
 
     category = "linear"
@@ -58,7 +62,7 @@ class Order:
         self.formats = BybitFormats(self.ss.bybit_symbol)
         self.endpoints = PrivatePostLinks
         self.client = BybitPrivatePostClient(self.ss)
-        self.session = aiohttp.ClientSession()
+        self.session = shared_session()
 
     def _order_to_str_(self, order: List) -> List[str]:
         """
@@ -76,7 +80,13 @@ class Order:
         """
         return list(map(str, order))
 
-    async def _submit_(self, endpoint: str, payload: Dict) -> Union[Dict, None]:
+    async def _submit_(
+        self,
+        endpoint: str,
+        payload: Dict,
+        priority: Priority=Priority.QUOTE,
+        max_wait: Optional[float]=None,
+    ) -> Union[Dict, None]:
         """
         Submits an order to a specified endpoint with the given payload.
 
@@ -86,32 +96,17 @@ class Order:
             The API endpoint to submit the order to.
         payload : Dict
             The payload of the order.
+        priority : Priority, optional
+            The lane the request waits in if rate limited, by default Priority.QUOTE.
+        max_wait : float, optional
+            The longest time to wait for the rate limit in seconds, after which it's dropped, by default no limit.
 
         Returns
         -------
         Union[Dict, None]
             The response from the API if successful; otherwise, None.
         """
-        async with self.session:
-            return await self.client.submit(self.session, endpoint, payload)
-
-    async def _sessionless_submit_(self, endpoint: str, payload: Dict) -> Union[Dict, None]:
-        """
-        Submits an order without managing the session lifecycle, assuming the session is already active.
-
-        Parameters
-        ----------
-        endpoint : str
-            The API endpoint to submit the order to.
-        payload : Dict
-            The payload of the order.
-
-        Returns
-        -------
-        Union[Dict, None]
-            The response from the API if successful; otherwise, None.
-        """
-        return await self.client.submit(self.session, endpoint, payload)
+        return await self.client.submit(self.session, endpoint, payload, priority, max_wait)
 
     async def order_market(self, order: Tuple[str, float]) -> Union[Dict, None]:
         """
@@ -151,7 +146,12 @@ class Order:
         payload = self.formats.create_limit(side, price, qty)
         return await self._submit_(endpoint, payload)
 
-    async def order_limit_batch(self, orders: List[Tuple[str, float, float]]) -> Union[Dict, None]:
+    async def order_limit_batch(
+        self,
+        orders: List[Tuple[str, float, float]],
+        priority: Priority=Priority.QUOTE,
+        max_wait: Optional[float]=None,
+    ) -> Union[Dict, None]:
         """
         Asynchronously places a batch of limit orders on Bybit.
 
@@ -159,6 +159,10 @@ class Order:
         ----------
         orders : List[Tuple[str, float, float]]
             A list of orders, each including side ('Buy' or 'Sell'), price, and quantity.
+        priority : Priority, optional
+            The lane the requests wait in if rate limited, by default Priority.QUOTE.
+        max_wait : float, optional
+            The longest time to wait for the rate limit in seconds, after which they're dropped, by default no limit.
 
         Returns
         -------
@@ -178,11 +182,10 @@ class Order:
                     for order in batch_orders
                 ]
             }
-            task = asyncio.create_task(self._sessionless_submit_(batch_endpoint, batch_payload))
+            task = asyncio.create_task(self._submit_(batch_endpoint, batch_payload, priority, max_wait))
             tasks.append(task)
 
         result = await asyncio.gather(*tasks)
-        await self.close_session()
         return result
          
     async def amend(self, order: Tuple[str, float, float]) -> Union[Dict, None]:
@@ -204,7 +207,7 @@ class Order:
         payload = self.formats.create_amend(order_id, price, qty)
         return await self._submit_(endpoint, payload)
 
-    async def amend_batch(self, orders: List[Tuple[str, float, float]]) -> Union[Dict, None]:
+    async def amend_batch(self, orders: List[Tuple[str, float, float]], max_wait: Optional[float]=None) -> Union[Dict, None]:
         """
         Asynchronously amends a batch of existing orders on Bybit.
 
@@ -212,6 +215,8 @@ class Order:
         ----------
         orders : List[Tuple[str, float, float]]
             A list of orders to be amended, each including the order ID, new price, and new quantity.
+        max_wait : float, optional
+            The longest time to wait for the rate limit in seconds, after which they're dropped, by default no limit.
 
         Returns
         -------
@@ -231,11 +236,10 @@ class Order:
                     for order in batch_orders
                 ]
             }
-            task = asyncio.create_task(self._sessionless_submit_(batch_endpoint, batch_payload))
+            task = asyncio.create_task(self._submit_(batch_endpoint, batch_payload, Priority.QUOTE, max_wait))
             tasks.append(task)
 
         result = await asyncio.gather(*tasks)
-        await self.close_session()
         return result
 
     async def cancel(self, order_id: str) -> Union[Dict, None]:
@@ -254,7 +258,7 @@ class Order:
         """
         endpoint = self.endpoints.CANCEL_SINGLE
         payload = self.formats.create_cancel(order_id)
-        return await self._submit_(endpoint, payload)
+        return await self._submit_(endpoint, payload, Priority.URGENT)
 
     async def cancel_batch(self, order_ids: List[str]) -> Union[Dict, None]:
         """
@@ -282,11 +286,10 @@ class Order:
                     for order_id in order_ids[i:i+10]
                 ]
             }
-            task = asyncio.create_task(self._sessionless_submit_(batch_endpoint, batch_payload))
+            task = asyncio.create_task(self._submit_(batch_endpoint, batch_payload, Priority.URGENT))
             tasks.append(task)
 
         result = await asyncio.gather(*tasks)
-        await self.close_session()
         return result
 
     async def cancel_all(self) -> Union[Dict, None]:
@@ -300,10 +303,4 @@ class Order:
         """
         endpoint = self.endpoints.CANCEL_ALL
         payload = self.formats.create_cancel_all()
-        return await self._submit_(endpoint, payload)
-    
-    async def close_session(self) -> None:
-        """
-        Asynchronously close the current session
-        """
-        await self.session.close()
\ No newline at end of file
+        return await self._submit_(endpoint, payload, Priority.URGENT)
@@ -0,0 +1,281 @@
+import asyncio
+from collections import defaultdict
+from enum import IntEnum
+from heapq import heapify, heappop, heappush
+from itertools import count
+from time import monotonic
+from typing import Dict, List, Mapping, Optional
+from src.utils.misc import time_ms, datetime_now as dt_now
+from src.exchanges.bybit.endpoints import PrivateGetLinks, PrivatePostLinks
+
+class Priority(IntEnum):
+    """
+    The lanes requests wait in when rate limited, most urgent first.
+    """
+    URGENT = 0  # NOTE: Cancels and position-reducing orders
+    QUOTE = 1   # NOTE: Creates and amends
+    SYNC = 2    # NOTE: Background reads, eg open orders and position
+
+
+# NOTE: Bybit's default per-second limits of each endpoint, corrected by each response's headers
+DEFAULT_LIMITS = {
+    PrivatePostLinks.CREATE_ORDER: 10,
+    PrivatePostLinks.CREATE_BATCH: 10,
+    PrivatePostLinks.AMEND_ORDER: 10,
+    PrivatePostLinks.AMEND_BATCH: 10,
+    PrivatePostLinks.CANCEL_SINGLE: 10,
+    PrivatePostLinks.CANCEL_BATCH: 10,
+    PrivatePostLinks.CANCEL_ALL: 10,
+    PrivateGetLinks.OPEN_ORDERS: 50,
+    PrivateGetLinks.CURRENT_POSITION: 50,
+}
+
+# NOTE: Batch endpoints count against the limit of their single-order endpoint. Each request is
+# charged one token, whatever the number of orders in it. Should Bybit charge a batch more (eg, per
+# order), the status headers of each response report the requests actually left, and the bucket is
+# lowered to match (see TokenBucket.sync), so the pacing is corrected from the first response on
+SHARED_LIMITS = {
+    PrivatePostLinks.CREATE_BATCH: PrivatePostLinks.CREATE_ORDER,
+    PrivatePostLinks.AMEND_BATCH: PrivatePostLinks.AMEND_ORDER,
+    PrivatePostLinks.CANCEL_BATCH: PrivatePostLinks.CANCEL_SINGLE,
+}
+
+
+class TokenBucket:
+    """
+    Tracks the requests left under a rate limit, refilling continuously at its limit per second.
+
+    Attributes
+    ----------
+    limit : int
+        The number of requests allowed per second, and the most tokens held.
+    tokens : float
+        The number of requests which can be sent now.
+
+    Methods
+    -------
+    refill(now: float) -> None:
+        Adds the tokens accrued since the last refill.
+    wait_time(now: float) -> float:
+        The time until a token is available.
+    sync(limit: int, remaining: int, reset_in: float, now: float) -> None:
+        Corrects the bucket from the limit status reported by Bybit.
+    """
+
+    def __init__(self, limit: int) -> None:
+        self.limit = limit
+        self.tokens = float(limit)
+        self._updated_ = monotonic()
+        self._blocked_until_ = 0.0
+
+    def refill(self, now: float) -> None:
+        start = max(self._updated_, self._blocked_until_)
+
+        if now > start:
+            self.tokens = min(self.limit, self.tokens + (now - start) * self.limit)
+
+        self._updated_ = max(now, self._updated_)
+
+    def wait_time(self, now: float) -> float:
+        return max(self._blocked_until_ - now, 0.0) + max(1.0 - self.tokens, 0.0) / self.limit
+
+    def sync(self, limit: int, remaining: int, reset_in: float, now: float) -> None:
+        """
+        Corrects the bucket from the limit status reported by Bybit, never adding tokens, as
+        requests sent after the one reported on may already have used some.
+
+        Parameters
+        ----------
+        limit : int
+            The endpoint's limit per second ("X-Bapi-Limit").
+        remaining : int
+            The requests left in the current window ("X-Bapi-Limit-Status").
+        reset_in : float
+            The time until the window resets, in seconds (from "X-Bapi-Limit-Reset-Timestamp").
+        now : float
+            The current time, from `monotonic`.
+        """
+        self.limit = max(limit, 1)
+        self.tokens = min(self.tokens, remaining)
+
+        if remaining <= 0:
+            self._blocked_until_ = max(self._blocked_until_, now + reset_in)
+
+
+class RequestScheduler:
+    """
+    Paces private requests to stay within Bybit's per-endpoint rate limits, so a burst of requests
+    is spread out rather than rejected (and eventually banned) with error 10006.
+
+    Each limit has a token bucket, refilled at its limit per second and corrected from the
+    limit status headers of every response. Endpoints sharing a limit (eg, single and batch
+    creates) share its bucket. Requests take a token before being sent, sent at once if one is
+    available and nothing is waiting. Otherwise they wait in their priority lane of the bucket,
+    and are released most urgent first across all its endpoints as tokens are refilled.
+
+    Requests may set a maximum wait, after which they are dropped instead of sent, for requests
+    superseded if not sent in time (eg, quotes, which are replaced by the next quote update).
+
+    Attributes
+    ----------
+    stats : Dict[str, int]
+        The number of requests sent at once, sent after waiting, and dropped, and of rate limit errors,
+        since they were last reset (see OMS.report).
+
+    Methods
+    -------
+    acquire(endpoint: str, priority: Priority, max_wait: float) -> Coroutine:
+        Waits until a request may be sent, returning False if it was dropped instead.
+    update(endpoint: str, headers: Mapping) -> None:
+        Corrects the bucket of an endpoint from the limit status headers of a response.
+    rate_limited(endpoint: str) -> None:
+        Records a rate limit error, blocking the endpoint until its window resets.
+    """
+
+    def __init__(
+        self,
+        limits: Dict[str, int]=DEFAULT_LIMITS,
+        shared: Dict[str, str]=SHARED_LIMITS,
+        default_limit: int=10,
+    ) -> None:
+        self._limits_ = limits
+        self._shared_ = shared
+        self._default_limit_ = default_limit
+        self._buckets_: Dict[str, TokenBucket] = {}
+        self._waiters_: Dict[str, List] = defaultdict(list)
+        self._timers_: Dict[str, asyncio.TimerHandle] = {}
+        self._sequence_ = count()
+        self.stats = dict.fromkeys(["immediate", "waited", "dropped", "limited"], 0)
+
+    def _key_(self, endpoint: str) -> str:
+        return self._shared_.get(endpoint, endpoint)
+
+    def _bucket_(self, key: str) -> TokenBucket:
+        if key not in self._buckets_:
+            self._buckets_[key] = TokenBucket(self._limits_.get(key, self._default_limit_))
+
+        return self._buckets_[key]
+
+    async def acquire(self, endpoint: str, priority: Priority, max_wait: Optional[float]=None) -> bool:
+        """
+        Waits until a request to the endpoint may be sent, taking a token for it.
+
+        Parameters
+        ----------
+        endpoint : str
+            The endpoint's path, without any query string.
+        priority : Priority
+            The lane the request waits in, if it has to.
+        max_wait : float, optional
+            The longest time to wait in seconds, after which the request is dropped, by default no limit.
+
+        Returns
+        -------
+        bool
+            True if the request may be sent, False if it was dropped.
+        """
+        key = self._key_(endpoint)
+        bucket, now = self._bucket_(key), monotonic()
+        bucket.refill(now)
+
+        if not self._waiters_[key] and bucket.tokens >= 1:
+            bucket.tokens -= 1
+            self.stats["immediate"] += 1
+            return True
+
+        future = asyncio.get_running_loop().create_future()
+        deadline = now + max_wait if max_wait is not None else float("inf")
+        heappush(self._waiters_[key], (priority, next(self._sequence_), deadline, future))
+        self._schedule_(key)
+        return await future
+
+    def _schedule_(self, key: str) -> None:
+        """
+        Schedules the next dispatch of a bucket's waiting requests, for when a token is refilled
+        or the earliest request would be dropped, whichever is first.
+        """
+        timer = self._timers_.get(key)
+
+        if timer is not None:
+            timer.cancel()
+
+        now = monotonic()
+        delay = min(
+            self._bucket_(key).wait_time(now),
+            min(waiter[2] for waiter in self._waiters_[key]) - now,
+        )
+        self._timers_[key] = asyncio.get_running_loop().call_later(max(delay, 0.0), self._dispatch_, key)
+
+    def _dispatch_(self, key: str) -> None:
+        """
+        Drops the bucket's waiting requests past their maximum wait, then releases the rest, most
+        urgent first, while tokens are available.
+        """
+        self._timers_.pop(key, None)
+        bucket, waiters, now = self._bucket_(key), self._waiters_[key], monotonic()
+        bucket.refill(now)
+
+        expired = [waiter for waiter in waiters if waiter[2] <= now]
+
+        if expired:
+            waiters[:] = [waiter for waiter in waiters if waiter[2] > now]
+            heapify(waiters)
+
+            for *_, future in expired:
+                if not future.done():
+                    future.set_result(False)
+                    self.stats["dropped"] += 1
+
+            print(f"{dt_now()}: Rate limited, dropped {len(expired)} stale request(s) to {key}")
+
+        while waiters and bucket.tokens >= 1:
+            future = heappop(waiters)[3]
+
+            # NOTE: Skips requests whose sender was cancelled meanwhile, without using a token
+            if future.done():
+                continue
+
+            bucket.tokens -= 1
+            self.stats["waited"] += 1
+            future.set_result(True)
+
+        if waiters:
+            self._schedule_(key)
+
+    def update(self, endpoint: str, headers: Mapping) -> None:
+        """
+        Corrects an endpoint's bucket from the limit status headers of a response, if present.
+
+        Parameters
+        ----------
+        endpoint : str
+            The endpoint's path, without any query string.
+        headers : Mapping
+            The response's headers (case-insensitive, as aiohttp's).
+        """
+        remaining = headers.get("X-Bapi-Limit-Status")
+
+        if remaining is None:
+            return None
+
+        bucket = self._bucket_(self._key_(endpoint))
+        reset_in = (int(headers.get("X-Bapi-Limit-Reset-Timestamp", 0)) - time_ms()) / 1000
+        bucket.sync(int(headers.get("X-Bapi-Limit", bucket.limit)), int(remaining), max(reset_in, 0.0), monotonic())
+
+    def rate_limited(self, endpoint: str) -> None:
+        """
+        Records a rate limit error (10006), blocking the endpoint until its window resets, or for
+        a second if the response didn't report when it does.
+
+        Parameters
+        ----------
+        endpoint : str
+            The endpoint's path, without any query string.
+        """
+        bucket = self._bucket_(self._key_(endpoint))
+        self.stats["limited"] += 1
+
+        if bucket.tokens > 0 or bucket.wait_time(monotonic()) < 1.0:
+            bucket.sync(bucket.limit, 0, 1.0, monotonic())
+
+        print(f"{dt_now()}: Rate limit hit on {endpoint}, pausing it until its limit resets")
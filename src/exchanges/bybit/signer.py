@@ -0,0 +1,69 @@
+import hashlib
+import hmac
+from typing import Dict
+from src.utils.misc import time_ms
+
+class BybitSigner:
+    """
+    Signs Bybit REST requests with HMAC-SHA256, returning the authentication headers of each request.
+
+    The HMAC is keyed with the secret once, and its keyed state copied for each request, rather
+    than keyed anew (which hashes the padded key twice). Each request gets its own header dict,
+    so concurrent requests never share or overwrite each other's timestamp or signature.
+
+    Attributes
+    ----------
+    key : str
+        The API key.
+    recv_window : str
+        The time in milliseconds a request is valid for after its timestamp.
+
+    Methods
+    -------
+    sign(payload: str) -> Dict[str, str]:
+        Signs a request's payload, returning its headers.
+    """
+
+    def __init__(self, key: str, secret: str, recv_window: str) -> None:
+        """
+        Initializes the signer with the API credentials.
+
+        Parameters
+        ----------
+        key : str
+            The API key.
+        secret : str
+            The API secret, used as the HMAC key.
+        recv_window : str
+            The time in milliseconds a request is valid for after its timestamp.
+        """
+        self.key = key
+        self.recv_window = recv_window
+        self._hmac_ = hmac.new(secret.encode(), digestmod=hashlib.sha256)
+        self._suffix_ = key + recv_window
+
+    def sign(self, payload: str) -> Dict[str, str]:
+        """
+        Signs a request's payload (the query string of a GET, or the JSON body of a POST) at the current time.
+
+        Parameters
+        ----------
+        payload : str
+            The request payload to be signed.
+
+        Returns
+        -------
+        Dict[str, str]
+            New headers for the request, including its timestamp and signature.
+        """
+        timestamp = str(time_ms())
+        signature = self._hmac_.copy()
+        signature.update((timestamp + self._suffix_ + payload).encode())
+
+        return {
+            "X-BAPI-API-KEY": self.key,
+            "X-BAPI-TIMESTAMP": timestamp,
+            "X-BAPI-RECV-WINDOW": self.recv_window,
+            "X-BAPI-SIGN-TYPE": "2",
+            "X-BAPI-SIGN": signature.hexdigest(),
+        }
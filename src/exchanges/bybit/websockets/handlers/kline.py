@@ -1,29 +1,41 @@
 import numpy as np
-from typing import List
-from src.indicators.bbw import bbw
+from typing import TYPE_CHECKING, List
+from numpy.typing import NDArray
 from src.sharedstate import SharedState
 
+if TYPE_CHECKING:
+    from src.exchanges.bybit.websockets.schemas import BybitKlineMsg
+
 
 class BybitKlineHandler:
     def __init__(self, ss: SharedState) -> None:
         self.ss = ss
 
     def _update_volatility_(self) -> None:
-        self.ss.volatility_value = bbw(
-            klines=self.ss.bybit_klines._unwrap(), 
-            length=self.ss.bb_length, 
-            multiplier=self.ss.bb_std
-        )
+        """
+        Reads the band width from the streaming BBW, reseeding it from the closes if
+        the band length was changed on reload or its sums are due a refresh
+        """
+        stream = self.ss.bybit_bbw
+
+        if stream.length != self.ss.bb_length or stream.stale:
+            stream.length = self.ss.bb_length
+            stream.seed(self.ss.bybit_klines.recent(stream.length)[:, 4])
 
+        self.ss.volatility_value = stream.width(self.ss.bb_std)
         self.ss.volatility_value += self.ss.volatility_offset
+        self.ss.market_events.mark("bybit_kline")
 
     def initialize(self, data: List) -> None:
         """
         Initialize the klines array and update volatility value
         """
-        for candle in data:
-            arr = np.array(candle, dtype=np.float64)
-            self.ss.bybit_klines.appendleft(arr)
+        klines = np.array(data, dtype=np.float64).reshape(-1, 7)
+
+        # NOTE: The buffer is ordered oldest to newest, whichever order the page is returned in
+        klines = klines[np.argsort(klines[:, 0], kind="stable")]
+        self.ss.bybit_klines.extend(klines)
+        self.ss.bybit_bbw.seed(self.ss.bybit_klines.recent(self.ss.bybit_bbw.length)[:, 4])
 
         self._update_volatility_()
 
@@ -42,12 +54,42 @@ class BybitKlineHandler:
                 float(candle["turnover"]),
             ])
 
-            # If previous time same, then overwrite, else append
-            if self.ss.bybit_klines[-1][0] != new[0]:
-                self.ss.bybit_klines.append(new)
+            self._update_(new)
+
+    def process_typed(self, msg: "BybitKlineMsg") -> None:
+        """
+        Same as process(), from a typed message with the candle values already converted to floats
+        """
+        for candle in msg.data:
+            new = np.array([
+                candle.start,
+                candle.open,
+                candle.high,
+                candle.low,
+                candle.close,
+                candle.volume,
+                candle.turnover,
+            ])
+
+            self._update_(new)
+
+    def _update_(self, new: NDArray) -> None:
+        """
+        Adds the latest candle and recalculates volatility
+        """
+        klines, stream = self.ss.bybit_klines, self.ss.bybit_bbw
+        last = klines[-1]
+
+        # If previous time same, then overwrite, else append
+        if last[0] != new[0]:
+            window = klines.recent(stream.length)
+            outgoing = window[0, 4] if window.shape[0] == stream.length else None
+            stream.push(new[4], outgoing)
+            klines.append(new)
 
-            else:
-                self.ss.bybit_klines.pop()
-                self.ss.bybit_klines.append(new)
+        else:
+            stream.replace(last[4], new[4])
+            klines.pop()
+            klines.append(new)
 
-            self._update_volatility_()
\ No newline at end of file
+        self._update_volatility_()
\ No newline at end of file
@@ -1,6 +1,9 @@
-from typing import Dict
+from typing import TYPE_CHECKING, Dict
 from src.sharedstate import SharedState
 
+if TYPE_CHECKING:
+    from src.exchanges.bybit.websockets.schemas import BybitOrderMsg
+
 
 class BybitOrderHandler:
     _opened_ = ["New", "PartiallyFilled"]
@@ -35,3 +38,11 @@ class BybitOrderHandler:
         # Remove filled orders
         for order_id in filled_orders:
             self.ss.current_orders.pop(order_id, None)
+
+    def process_typed(self, msg: "BybitOrderMsg") -> None:
+        for order in msg.data:
+            if order.orderStatus in self._opened_:
+                self.ss.current_orders[order.orderId] = {"side": order.side, "price": order.price, "qty": order.qty}
+
+            elif order.orderStatus in self._closed_:
+                self.ss.current_orders.pop(order.orderId, None)
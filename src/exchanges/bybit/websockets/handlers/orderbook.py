@@ -1,6 +1,12 @@
 import numpy as np
-from typing import Dict, List
+from numpy.typing import NDArray
+from typing import TYPE_CHECKING, Dict, List, Tuple
 from src.exchanges.common.localorderbook import BaseOrderBook
+from src.exchanges.common.ladderorderbook import LadderOrderBook
+from src.utils.parsing import parse_levels
+
+if TYPE_CHECKING:
+    from src.exchanges.bybit.websockets.schemas import BybitBookMsg
 
 class OrderBookBybit(BaseOrderBook):
     """
@@ -12,6 +18,12 @@ class OrderBookBybit(BaseOrderBook):
         Processes the initial snapshot of the order book.
     process(recv: Dict) -> None:
         Processes incoming messages from Bybit to update the order book.
+    unpack(recv: Dict) -> Tuple[bool, int, NDArray, NDArray]:
+        Parses a message from Bybit into a snapshot flag, update ID, asks and bids.
+    unpack_typed(msg: BybitBookMsg) -> Tuple[bool, int, NDArray, NDArray]:
+        Parses a typed message from Bybit into a snapshot flag, update ID, asks and bids.
+    process_batch(updates: List[Tuple[bool, int, NDArray, NDArray]]) -> None:
+        Processes several queued, unpacked messages from Bybit, coalescing their deltas.
     """
 
     def process_snapshot(self, asks: List[List[float]], bids: List[List[float]]) -> None:
@@ -25,29 +37,103 @@ class OrderBookBybit(BaseOrderBook):
         bids : List[List[float]]
             A list of bid orders, each represented as [price, quantity].
         """
-        self.asks = np.array(asks, dtype=float)
-        self.bids = np.array(bids, dtype=float)
-        self.sort_book()
+        self.initialize_book(np.asarray(asks, dtype=float), np.asarray(bids, dtype=float))
 
     def process(self, recv: Dict) -> None:
         """
         Handles incoming WebSocket messages to update the order book.
 
+        Deltas carry a consecutive update ID ("u"), so each one is expected to directly follow
+        the previous. A snapshot (sent on subscription, or with "u" = 1 after a service restart)
+        resets the sequence.
+
         Parameters
         ----------
         recv : Dict
             The incoming message containing either a snapshot or delta update of the order book.
         """
-        asks = np.array(recv["data"]["a"], dtype=float)
-        bids = np.array(recv["data"]["b"], dtype=float)
+        update_id = int(recv["data"]["u"])
+        asks = parse_levels(recv["data"]["a"], self._ask_buffer_)
+        bids = parse_levels(recv["data"]["b"], self._bid_buffer_)
 
         if recv["type"] == "snapshot":
             self.process_snapshot(asks, bids)
+            self.reset_sequence(update_id)
             
         elif recv["type"] == "delta":
-            self.asks = self.update_book(self.asks, asks)
-            self.bids = self.update_book(self.bids, bids)
-            self.sort_book()
+            self.sequence_update(update_id, update_id - 1, update_id, asks, bids)
+
+    def unpack(self, recv: Dict) -> Tuple[bool, int, NDArray, NDArray]:
+        """
+        Parses a WebSocket message into the fields needed to apply it, for use with `process_batch`.
+
+        Parameters
+        ----------
+        recv : Dict
+            The incoming message containing either a snapshot or delta update of the order book.
+
+        Returns
+        -------
+        Tuple[bool, int, NDArray, NDArray]
+            Whether the message is a snapshot, its update ID, and its asks and bids.
+        """
+        data = recv["data"]
+        return recv["type"] == "snapshot", int(data["u"]), parse_levels(data["a"]), parse_levels(data["b"])
+
+    def unpack_typed(self, msg: "BybitBookMsg") -> Tuple[bool, int, NDArray, NDArray]:
+        """
+        Parses a typed WebSocket message into the fields needed to apply it, for use with `process_batch`.
+
+        Parameters
+        ----------
+        msg : BybitBookMsg
+            The decoded message containing either a snapshot or delta update of the order book.
+
+        Returns
+        -------
+        Tuple[bool, int, NDArray, NDArray]
+            Whether the message is a snapshot, its update ID, and its asks and bids.
+        """
+        data = msg.data
+        return msg.type == "snapshot", data.u, parse_levels(data.a), parse_levels(data.b)
+
+    def process_batch(self, updates: List[Tuple[bool, int, NDArray, NDArray]]) -> None:
+        """
+        Handles several queued WebSocket messages at once.
+
+        Messages before the latest snapshot in the batch are superseded by it and skipped,
+        and the deltas after it are coalesced into a single update where their sequence allows.
+
+        Parameters
+        ----------
+        updates : List[Tuple[bool, int, NDArray, NDArray]]
+            The queued messages, unpacked with `unpack` or `unpack_typed`, in the order they were received.
+        """
+        start = 0
+
+        for i in range(len(updates) - 1, -1, -1):
+            is_snapshot, update_id, asks, bids = updates[i]
+
+            if is_snapshot:
+                self.process_snapshot(asks, bids)
+                self.reset_sequence(update_id)
+                self.coalesced_count += i
+                start = i + 1
+                break
+
+        deltas = [
+            (update_id, update_id - 1, update_id, asks, bids)
+            for _, update_id, asks, bids in updates[start:]
+        ]
+
+        if deltas:
+            self.sequence_updates(deltas)
+
+
+class LadderOrderBookBybit(LadderOrderBook, OrderBookBybit):
+    """
+    Order book class for Bybit, storing levels in the tick-indexed ladder instead of sorted arrays.
+    """
 
 
 class BybitBBAHandler:
@@ -63,6 +149,8 @@ class BybitBBAHandler:
     -------
     process(recv: Dict) -> None:
         Processes real-time BBA updates.
+    process_typed(msg: BybitBookMsg) -> None:
+        Processes real-time BBA updates decoded into a typed message.
     """
 
     def __init__(self, ss) -> None:
@@ -85,17 +173,45 @@ class BybitBBAHandler:
         recv : Dict
             A dictionary containing the latest BBA prices and quantities.
         """
-        best_bid = recv["data"]["b"]
-        best_ask = recv["data"]["a"]
+        self._update_(recv["data"]["b"], recv["data"]["a"])
+
+    def _update_(self, best_bid: List[List[str]], best_ask: List[List[str]]) -> None:
+        """
+        Updates the shared BBA with the top bid and ask levels, ignoring levels being removed.
+
+        Parameters
+        ----------
+        best_bid : List[List[str]]
+            The top bid level as [price, quantity], or empty if unchanged.
+        best_ask : List[List[str]]
+            The top ask level as [price, quantity], or empty if unchanged.
+        """
+        updated = False
 
         if best_bid:
             price, qty = list(map(float, best_bid[0]))
             if qty > 0:
                 self.ss.bybit_bba[0, 0] = price
                 self.ss.bybit_bba[0, 1] = qty
+                updated = True
 
         if best_ask:
             price, qty = list(map(float, best_ask[0]))
             if qty > 0:
                 self.ss.bybit_bba[1, 0] = price
-                self.ss.bybit_bba[1, 1] = qty
\ No newline at end of file
+                self.ss.bybit_bba[1, 1] = qty
+                updated = True
+
+        if updated:
+            self.ss.market_events.mark("bybit_bba")
+
+    def process_typed(self, msg: "BybitBookMsg") -> None:
+        """
+        Processes real-time updates to the best bid and ask prices and quantities, from a typed message.
+
+        Parameters
+        ----------
+        msg : BybitBookMsg
+            The decoded message containing the latest BBA prices and quantities.
+        """
+        self._update_(msg.data.b, msg.data.a)
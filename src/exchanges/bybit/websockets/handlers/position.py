@@ -1,7 +1,10 @@
-from typing import Dict, List, Union
+from typing import TYPE_CHECKING, Dict, List, Union
 from src.strategy.inventory import Inventory
 from src.sharedstate import SharedState
 
+if TYPE_CHECKING:
+    from src.exchanges.bybit.websockets.schemas import BybitPositionMsg
+
 
 class BybitPositionHandler:
     def __init__(self, ss: SharedState) -> None:
@@ -20,3 +23,13 @@ class BybitPositionHandler:
             value = float(data["positionValue"])
             leverage = float(data["leverage"])
             self.inventory.position_delta(data["side"], value, leverage)
+            self.ss.market_events.mark("bybit_position")
+
+    def process_typed(self, msg: "BybitPositionMsg") -> None:
+        data = msg.data[0]
+
+        if data.side:
+            value = float(data.positionValue)
+            leverage = float(data.leverage)
+            self.inventory.position_delta(data.side, value, leverage)
+            self.ss.market_events.mark("bybit_position")
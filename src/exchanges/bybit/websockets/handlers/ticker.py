@@ -1,6 +1,9 @@
-from typing import Dict
+from typing import TYPE_CHECKING, Dict
 from src.sharedstate import SharedState
 
+if TYPE_CHECKING:
+    from src.exchanges.bybit.websockets.schemas import BybitTickerMsg
+
 
 class BybitTickerHandler:
     def __init__(self, ss: SharedState) -> None:
@@ -9,4 +12,10 @@ class BybitTickerHandler:
     def process(self, recv: Dict) -> None:
         data = recv["data"]
         if "markPrice" in data:
-            self.ss.bybit_mark_price = float(data["markPrice"])
\ No newline at end of file
+            self.ss.bybit_mark_price = float(data["markPrice"])
+            self.ss.market_events.mark("bybit_ticker")
+
+    def process_typed(self, msg: "BybitTickerMsg") -> None:
+        if msg.data.markPrice is not None:
+            self.ss.bybit_mark_price = msg.data.markPrice
+            self.ss.market_events.mark("bybit_ticker")
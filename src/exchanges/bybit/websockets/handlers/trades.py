@@ -1,7 +1,11 @@
 import numpy as np
-from typing import Dict, List
+from numpy.typing import NDArray
+from typing import TYPE_CHECKING, Dict, List
 from src.sharedstate import SharedState
 
+if TYPE_CHECKING:
+    from src.exchanges.bybit.websockets.schemas import BybitTradesMsg
+
 class BybitTradesHandler:
     """
     Handler for processing trades data from Bybit and updating the shared state.
@@ -17,8 +21,18 @@ class BybitTradesHandler:
         Initializes the handler with historical trades data.
     process(recv: List[Dict]) -> None:
         Processes real-time trades data received from Bybit.
+    process_typed(msg: BybitTradesMsg) -> None:
+        Processes real-time trades data received from Bybit, decoded into a typed message.
+    _add_trades_(trades: NDArray) -> None:
+        Adds trades to the shared trade buffer and the streaming trades imbalance.
+    _add_trade_(time: float, side: float, price: float, qty: float) -> None:
+        Adds a single trade to the shared trade buffer and the streaming trades imbalance.
     """
 
+    # NOTE: Messages of at most this many trades are added one at a time, as building an array of
+    # them costs more than it saves (see benchmarks/ingest_trades.py)
+    _scalar_max_ = 2
+
     def __init__(self, ss: SharedState) -> None:
         """
         Initializes the BybitTradesHandler with a reference to SharedState.
@@ -30,6 +44,29 @@ class BybitTradesHandler:
         """
         self.ss = ss
 
+    def _add_trades_(self, trades: NDArray) -> None:
+        """
+        Adds a block of trades to the streaming trades imbalance, then to the shared trade buffer.
+
+        Parameters
+        ----------
+        trades : NDArray
+            The new trades, oldest first, in format [time, side, price, size].
+        """
+        stream = self.ss.bybit_trades_imbalance
+        stream.update(self.ss.bybit_trades.recent(stream.window), trades)
+        self.ss.bybit_trades.extend(trades)
+        self.ss.market_events.mark("bybit_trades")
+
+    def _add_trade_(self, time: float, side: float, price: float, qty: float) -> None:
+        """
+        Adds a single trade to the streaming trades imbalance, then writes it straight into the shared trade buffer's row.
+        The caller marks the trades as updated, once per message.
+        """
+        stream = self.ss.bybit_trades_imbalance
+        stream.push(side, qty, self.ss.bybit_trades.recent(stream.window))
+        self.ss.bybit_trades.append((time, side, price, qty))
+
     def initialize(self, data: List[Dict]) -> None:
         """
         Initializes the shared state with historical trades data.
@@ -39,13 +76,14 @@ class BybitTradesHandler:
         data : List[Dict]
             A list of dictionaries, each representing a trade with time, price, size, and side information.
         """
-        for row in data:
-            time = float(row["time"])
-            price = float(row["price"])
-            qty = float(row["size"])
-            side = 0.0 if row["side"] == "Buy" else 1.0
-            new_trade = np.array([[time, side, price, qty]])
-            self.ss.bybit_trades.append(new_trade)
+        trades = np.array([
+            (float(row["time"]), 0.0 if row["side"] == "Buy" else 1.0, float(row["price"]), float(row["size"]))
+            for row in data
+        ], dtype=np.float64).reshape(-1, 4)
+
+        # NOTE: The buffer is ordered oldest to newest, whichever order the page is returned in
+        trades = trades[np.argsort(trades[:, 0], kind="stable")]
+        self._add_trades_(trades)
 
     def process(self, recv: List[Dict]) -> None:
         """
@@ -56,10 +94,39 @@ class BybitTradesHandler:
         recv : List[Dict]
             A list of dictionaries, each representing a trade with time, price, quantity, and side information.
         """
-        for trade in recv["data"]:
-            time = float(trade["T"])
-            price = float(trade["p"])
-            qty = float(trade["v"])
-            side = 0.0 if trade["S"] == "Buy" else 1.0
-            new_trade = np.array([[time, side, price, qty]])
-            self.ss.bybit_trades.append(new_trade)
\ No newline at end of file
+        if len(recv["data"]) <= self._scalar_max_:
+            for trade in recv["data"]:
+                self._add_trade_(float(trade["T"]), 0.0 if trade["S"] == "Buy" else 1.0, float(trade["p"]), float(trade["v"]))
+
+            self.ss.market_events.mark("bybit_trades")
+            return
+
+        trades = np.array([
+            (float(trade["T"]), 0.0 if trade["S"] == "Buy" else 1.0, float(trade["p"]), float(trade["v"]))
+            for trade in recv["data"]
+        ], dtype=np.float64).reshape(-1, 4)
+
+        self._add_trades_(trades)
+
+    def process_typed(self, msg: "BybitTradesMsg") -> None:
+        """
+        Processes and updates the shared state with real-time trades data, from a typed message.
+
+        Parameters
+        ----------
+        msg : BybitTradesMsg
+            The decoded message, with each trade's prices and quantities already converted to floats.
+        """
+        if len(msg.data) <= self._scalar_max_:
+            for trade in msg.data:
+                self._add_trade_(float(trade.T), 0.0 if trade.S == "Buy" else 1.0, trade.p, trade.v)
+
+            self.ss.market_events.mark("bybit_trades")
+            return
+
+        trades = np.array([
+            (float(trade.T), 0.0 if trade.S == "Buy" else 1.0, trade.p, trade.v)
+            for trade in msg.data
+        ], dtype=np.float64).reshape(-1, 4)
+
+        self._add_trades_(trades)
@@ -16,6 +16,8 @@ class BybitPublicWs:
     -------
     multi_stream_request(topics: list, **kwargs) -> tuple:
         Generates a WebSocket subscription request for a list of topics.
+    resubscribe_requests(list_of_topics: list) -> tuple:
+        Generates unsubscribe and subscribe requests for already formatted topics.
     """
 
     def __init__(self, ss: SharedState) -> None:
@@ -72,4 +74,26 @@ class BybitPublicWs:
 
         req = json.dumps({"op": "subscribe", "args": list_of_topics})
 
-        return req, list_of_topics
\ No newline at end of file
+        return req, list_of_topics
+
+    def resubscribe_requests(self, list_of_topics: list) -> tuple:
+        """
+        Constructs requests to unsubscribe from and then resubscribe to already formatted topics.
+
+        Resubscribing to an orderbook topic makes Bybit send a fresh snapshot, which is
+        used to resync a local order book after a sequence gap.
+
+        Parameters
+        ----------
+        list_of_topics : list
+            A list of formatted topics, as returned by `multi_stream_request`.
+
+        Returns
+        -------
+        tuple
+            A tuple containing the unsubscribe and subscribe requests as JSON strings.
+        """
+        unsub = json.dumps({"op": "unsubscribe", "args": list_of_topics})
+        sub = json.dumps({"op": "subscribe", "args": list_of_topics})
+
+        return unsub, sub
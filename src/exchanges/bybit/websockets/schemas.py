@@ -0,0 +1,88 @@
+from msgspec import Struct
+from typing import List, Optional
+from src.exchanges.common.decoding import TopicDecoder
+
+# NOTE: Messages never contain cycles, so none of the Structs need to be tracked by the GC.
+# Fields that aren't declared are skipped while decoding.
+
+class BybitBookData(Struct, gc=False):
+    u: int
+    a: List[List[str]]  # NOTE: Levels are left as strings for src.utils.parsing.parse_levels
+    b: List[List[str]]
+
+class BybitBookMsg(Struct, gc=False):
+    type: str
+    data: BybitBookData
+
+class BybitTrade(Struct, gc=False):
+    T: int
+    S: str
+    p: float
+    v: float
+
+class BybitTradesMsg(Struct, gc=False):
+    data: List[BybitTrade]
+
+class BybitTickerData(Struct, gc=False):
+    markPrice: Optional[float] = None  # NOTE: Deltas only carry the fields that changed
+
+class BybitTickerMsg(Struct, gc=False):
+    data: BybitTickerData
+
+class BybitCandle(Struct, gc=False):
+    start: float
+    open: float
+    high: float
+    low: float
+    close: float
+    volume: float
+    turnover: float
+
+class BybitKlineMsg(Struct, gc=False):
+    data: List[BybitCandle]
+
+class BybitPosition(Struct, gc=False):
+    side: str
+    positionValue: str  # NOTE: Can be empty while flat, so converted only when a side is set
+    leverage: str
+
+class BybitPositionMsg(Struct, gc=False):
+    data: List[BybitPosition]
+
+class BybitOrder(Struct, gc=False):
+    orderId: str
+    side: str
+    price: float
+    qty: float
+    orderStatus: str
+
+class BybitOrderMsg(Struct, gc=False):
+    data: List[BybitOrder]
+
+SCHEMAS = {
+    "orderbook": BybitBookMsg,
+    "publicTrade": BybitTradesMsg,
+    "tickers": BybitTickerMsg,
+    "kline": BybitKlineMsg,
+    "position": BybitPositionMsg,
+    "order": BybitOrderMsg,
+}
+
+def bybit_decoder(list_of_topics: List[str]) -> TopicDecoder:
+    """
+    Creates a decoder for the given Bybit topics, as returned by the public/private `multi_stream_request`.
+
+    Parameters
+    ----------
+    list_of_topics : List[str]
+        The formatted topics (eg, "orderbook.500.ETHUSDT", "order").
+
+    Returns
+    -------
+    TopicDecoder
+        A decoder returning the typed message of each topic.
+    """
+    return TopicDecoder(
+        schemas={topic: SCHEMAS[topic.split(".")[0]] for topic in list_of_topics},
+        tag_field="topic"
+    )
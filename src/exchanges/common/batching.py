@@ -0,0 +1,67 @@
+import asyncio
+import websockets
+from typing import List, Optional, Union
+
+class MessageBatcher:
+    """
+    Receives a websocket's messages in batches, so a loop which fell behind can process all the
+    messages queued up together (eg, coalescing order book deltas).
+
+    Only the public `recv` is used. After the first message, each further one is received by a
+    task given a single pass of the event loop, which completes only if the message had already
+    arrived. A task still waiting is kept, and awaited for the first message of the next batch,
+    so no message is lost or reordered and `recv` is never cancelled midway.
+
+    Attributes
+    ----------
+    websocket : websockets.WebSocketClientProtocol
+        The connected websocket, with one batcher per connection.
+    max_batch : int
+        The most messages returned at once.
+
+    Methods
+    -------
+    recv() -> Coroutine:
+        Waits for the next message, then collects those already received behind it.
+    """
+
+    def __init__(self, websocket: websockets.WebSocketClientProtocol, max_batch: int=100) -> None:
+        self.websocket = websocket
+        self.max_batch = max_batch
+        self._next_: Optional[asyncio.Task] = None
+
+    def _recv_task_(self) -> asyncio.Task:
+        task = asyncio.ensure_future(self.websocket.recv())
+
+        # NOTE: Marks a failure as retrieved, in case the connection closes before the task is awaited
+        task.add_done_callback(lambda done: done.cancelled() or done.exception())
+        return task
+
+    async def recv(self) -> List[Union[str, bytes]]:
+        """
+        Waits for the next message, then collects any messages already received behind it without waiting.
+
+        Returns
+        -------
+        List[Union[str, bytes]]
+            The raw messages, in the order they were received.
+
+        Raises
+        ------
+        websockets.ConnectionClosed
+            If the connection closed, as from `recv`.
+        """
+        pending, self._next_ = self._next_, None
+        batch = [await pending if pending is not None else await self.websocket.recv()]
+
+        while len(batch) < self.max_batch:
+            task = self._recv_task_()
+            await asyncio.sleep(0)
+
+            if not task.done():
+                self._next_ = task
+                break
+
+            batch.append(task.result())
+
+        return batch
@@ -0,0 +1,63 @@
+import msgspec
+from typing import Dict, Optional, Type, Union
+
+class TopicDecoder:
+    """
+    Decodes websocket messages straight into typed Structs, picking the schema by the message's topic.
+
+    Each topic gets its own subclass of its schema, tagged with the topic string, and all of them
+    are combined into a single tagged union. The message is then decoded in one pass, with prices
+    and quantities converted from strings as they are read, and the type of the returned Struct
+    identifies the topic it came from.
+
+    Attributes
+    ----------
+    schemas : Dict[str, Type[msgspec.Struct]]
+        A mapping of topics to the tagged Struct types their messages are decoded into.
+
+    Methods
+    -------
+    decode(msg: Union[bytes, str]) -> Optional[msgspec.Struct]:
+        Decodes a message, or returns None if it doesn't match any topic's schema.
+    """
+
+    def __init__(self, schemas: Dict[str, Type[msgspec.Struct]], tag_field: str) -> None:
+        """
+        Initializes the TopicDecoder with the schemas of the subscribed topics.
+
+        Parameters
+        ----------
+        schemas : Dict[str, Type[msgspec.Struct]]
+            A mapping of topics to the Struct types describing their messages.
+        tag_field : str
+            The message field holding the topic (eg, "topic" for Bybit, "stream" for Binance).
+        """
+        self.schemas = {
+            topic: msgspec.defstruct(schema.__name__, [], bases=(schema,), tag_field=tag_field, tag=topic)
+            for topic, schema in schemas.items()
+        }
+
+        # NOTE: strict=False lets numeric strings (eg, "3000.12") decode into float/int fields
+        self._decoder_ = msgspec.json.Decoder(Union[tuple(self.schemas.values())], strict=False)
+
+    def decode(self, msg: Union[bytes, str]) -> Optional[msgspec.Struct]:
+        """
+        Decodes a raw message into the Struct of its topic.
+
+        Parameters
+        ----------
+        msg : Union[bytes, str]
+            The raw JSON message.
+
+        Returns
+        -------
+        Optional[msgspec.Struct]
+            The decoded message, or None if it carries no known topic or doesn't match its
+            schema (eg, subscription acks) or isn't valid JSON, in which case it should be decoded as a dict instead.
+        """
+        try:
+            return self._decoder_.decode(msg)
+
+        # NOTE: DecodeError is the base of ValidationError, so malformed JSON falls back to dicts too
+        except msgspec.DecodeError:
+            return None
@@ -0,0 +1,316 @@
+import numpy as np
+from numba import njit
+from numpy.typing import NDArray
+from typing import Tuple
+from src.exchanges.common.localorderbook import BaseOrderBook
+
+@njit(cache=True)
+def update_ladder(
+    asks: NDArray,
+    bids: NDArray,
+    base_tick: int,
+    tick_size: float,
+    ask_data: NDArray,
+    bid_data: NDArray,
+    best_ask: int,
+    best_bid: int
+) -> Tuple[int, int]:
+    """
+    Applies level updates to a pair of tick-indexed ladders, tracking the best bid and ask incrementally.
+
+    Steps:
+    1. Convert each price to an integer tick offset from the window's base tick.
+    2. Write the quantity straight into the ladder (O(1)), discarding prices outside the window.
+    3. Move the best level inwards on inserts, and scan outwards to the next populated tick
+       only when the best level itself is removed.
+
+    Parameters
+    ----------
+    asks : NDArray
+        The ask quantities, indexed by tick offset from `base_tick`.
+    bids : NDArray
+        The bid quantities, indexed by tick offset from `base_tick`.
+    base_tick : int
+        The absolute tick (price / tick_size) of index 0.
+    tick_size : float
+        The symbol's tick size.
+    ask_data : NDArray
+        Ask level updates, each a [price, quantity] pair.
+    bid_data : NDArray
+        Bid level updates, each a [price, quantity] pair.
+    best_ask : int
+        Index of the best ask, or the ladder length if there are no asks.
+    best_bid : int
+        Index of the best bid, or -1 if there are no bids.
+
+    Returns
+    -------
+    Tuple[int, int]
+        The updated best ask and best bid indices.
+    """
+    window = asks.size
+
+    for i in range(ask_data.shape[0]):
+        idx = int(np.rint(ask_data[i, 0] / tick_size)) - base_tick
+
+        if idx < 0 or idx >= window:
+            continue
+
+        asks[idx] = ask_data[i, 1]
+
+        if ask_data[i, 1] > 0:
+            if idx < best_ask:
+                best_ask = idx
+
+        elif idx == best_ask:
+            while best_ask < window and asks[best_ask] <= 0:
+                best_ask += 1
+
+    for i in range(bid_data.shape[0]):
+        idx = int(np.rint(bid_data[i, 0] / tick_size)) - base_tick
+
+        if idx < 0 or idx >= window:
+            continue
+
+        bids[idx] = bid_data[i, 1]
+
+        if bid_data[i, 1] > 0:
+            if idx > best_bid:
+                best_bid = idx
+
+        elif idx == best_bid:
+            while best_bid >= 0 and bids[best_bid] <= 0:
+                best_bid -= 1
+
+    return best_ask, best_bid
+
+@njit(cache=True)
+def ladder_levels(ladder: NDArray, base_tick: int, tick_size: float, start: int, step: int, out: NDArray) -> int:
+    """
+    Collects the populated levels of a ladder into [price, quantity] rows, best first.
+
+    Parameters
+    ----------
+    ladder : NDArray
+        The quantities, indexed by tick offset from `base_tick`.
+    base_tick : int
+        The absolute tick of index 0.
+    tick_size : float
+        The symbol's tick size.
+    start : int
+        The index of the best level.
+    step : int
+        The direction to walk away from the best level, 1 for asks and -1 for bids.
+    out : NDArray
+        A preallocated array to fill, at most `out.shape[0]` levels are collected.
+
+    Returns
+    -------
+    int
+        The number of levels written to `out`.
+    """
+    num_levels = 0
+    idx = start
+
+    while 0 <= idx < ladder.size and num_levels < out.shape[0]:
+        if ladder[idx] > 0:
+            out[num_levels, 0] = (base_tick + idx) * tick_size
+            out[num_levels, 1] = ladder[idx]
+            num_levels += 1
+
+        idx += step
+
+    return num_levels
+
+
+class LadderOrderBook(BaseOrderBook):
+    """
+    An order book storing quantities in dense arrays indexed by integer tick offset,
+    over a window of ticks which is re-centered around the mid price as it drifts.
+
+    Level updates are O(1) array writes with no float-equality searches, and the best bid
+    and ask are tracked incrementally. The sorted `asks` and `bids` views are only rebuilt
+    from the ladder when they are read after an update.
+
+    Attributes
+    ----------
+    window : int
+        The number of ticks covered by the ladder.
+    tick_size : float
+        The symbol's tick size, must be set with `set_precision` before a snapshot is processed.
+    base_tick : int
+        The absolute tick (price / tick_size) of the ladder's first index.
+    best_ask : int
+        Index of the best ask in the ladder, or `window` if there are no asks.
+    best_bid : int
+        Index of the best bid in the ladder, or -1 if there are no bids.
+
+    Methods
+    -------
+    set_precision(tick_size: float) -> None:
+        Sets the tick size used to map prices onto the ladder.
+    initialize_book(asks: NDArray, bids: NDArray) -> None:
+        Replaces the contents of the book with a snapshot, centering the window on its mid.
+    update_book(asks: NDArray, bids: NDArray) -> None:
+        Applies level updates to both sides of the book.
+    """
+
+    def __init__(self, size: int=500, window: int=16384) -> None:
+        """
+        Initializes the LadderOrderBook with empty ladders.
+
+        Parameters
+        ----------
+        size : int, optional
+            The maximum number of levels exposed in each of the asks and bids views, by default 500.
+        window : int, optional
+            The number of ticks covered by the ladder, by default 16384.
+        """
+        super().__init__(size)
+        self.window = window
+        self.tick_size = 0.0
+        self.base_tick = 0
+        self._ask_ladder_ = np.zeros(window, dtype=np.float64)
+        self._bid_ladder_ = np.zeros(window, dtype=np.float64)
+        self.best_ask = window
+        self.best_bid = -1
+        self._stale_ = False
+
+    @property
+    def asks(self) -> NDArray:
+        if self._stale_:
+            self._refresh_views_()
+        return self._asks_[:self.num_asks]
+
+    @property
+    def bids(self) -> NDArray:
+        if self._stale_:
+            self._refresh_views_()
+        return self._bids_[:self.num_bids]
+
+    def _refresh_views_(self) -> None:
+        """
+        Rebuilds the sorted asks and bids views from the ladders.
+        """
+        self.num_asks = ladder_levels(self._ask_ladder_, self.base_tick, self.tick_size, self.best_ask, 1, self._asks_)
+        self.num_bids = ladder_levels(self._bid_ladder_, self.base_tick, self.tick_size, self.best_bid, -1, self._bids_)
+        self._asks_changed_from_ = 0
+        self._bids_changed_from_ = 0
+        self._stale_ = False
+
+    def _recenter_(self, mid_idx: int) -> None:
+        """
+        Shifts the ladders so that the given index becomes the middle of the window.
+        Levels shifted outside of the window are discarded.
+
+        Parameters
+        ----------
+        mid_idx : int
+            The ladder index to move to the center of the window.
+        """
+        shift = mid_idx - self.window // 2
+
+        for ladder in (self._ask_ladder_, self._bid_ladder_):
+            if shift >= self.window or -shift >= self.window:
+                ladder[:] = 0.0
+            elif shift > 0:
+                ladder[:-shift] = ladder[shift:]
+                ladder[-shift:] = 0.0
+            elif shift < 0:
+                ladder[-shift:] = ladder[:shift]
+                ladder[:-shift] = 0.0
+
+        self.base_tick += shift
+        self.best_ask = self._next_level_(self._ask_ladder_, max(self.best_ask - shift, 0), 1)
+        self.best_bid = self._next_level_(self._bid_ladder_, min(self.best_bid - shift, self.window - 1), -1)
+
+    def _next_level_(self, ladder: NDArray, start: int, step: int) -> int:
+        """
+        Returns the first populated index at or beyond `start` when walking in direction `step`.
+        """
+        if step > 0:
+            populated = np.flatnonzero(ladder[start:] > 0) if start < self.window else ladder[:0]
+        else:
+            populated = np.flatnonzero(ladder[:start + 1] > 0) if start >= 0 else ladder[:0]
+
+        if populated.size == 0:
+            return self.window if step > 0 else -1
+
+        return start + populated[0] if step > 0 else populated[-1]
+
+    def set_precision(self, tick_size: float) -> None:
+        """
+        Sets the tick size used to map prices onto the ladder.
+
+        Parameters
+        ----------
+        tick_size : float
+            The symbol's tick size.
+        """
+        self.tick_size = tick_size
+
+    def initialize_book(self, asks: NDArray, bids: NDArray) -> None:
+        """
+        Replaces the contents of the order book with a snapshot, centering the window on the snapshot's mid price.
+
+        Parameters
+        ----------
+        asks : NDArray
+            The ask levels of the snapshot, each a [price, quantity] pair.
+        bids : NDArray
+            The bid levels of the snapshot, each a [price, quantity] pair.
+        """
+        if self.tick_size <= 0:
+            raise ValueError("Tick size must be set before initializing a ladder book!")
+
+        asks, bids = asks.reshape(-1, 2), bids.reshape(-1, 2)
+        prices = np.concatenate((asks[:, 0], bids[:, 0]))
+
+        if asks.size and bids.size:
+            mid = (asks[:, 0].min() + bids[:, 0].max()) / 2
+        else:
+            mid = prices.mean() if prices.size else 0.0
+
+        self.base_tick = int(np.rint(mid / self.tick_size)) - self.window // 2
+        self._ask_ladder_[:] = 0.0
+        self._bid_ladder_[:] = 0.0
+        self.best_ask, self.best_bid = self.window, -1
+        self.update_book(asks, bids)
+
+    def update_book(self, asks: NDArray, bids: NDArray) -> None:
+        """
+        Applies level updates to both sides of the order book, re-centering the window
+        if the mid price has drifted into its outer quarters.
+
+        Parameters
+        ----------
+        asks : NDArray
+            Ask level updates, each a [price, quantity] pair. A quantity of zero removes the level.
+        bids : NDArray
+            Bid level updates, each a [price, quantity] pair. A quantity of zero removes the level.
+
+        Raises
+        ------
+        ValueError
+            If the tick size hasn't been set yet.
+        """
+        if self.tick_size <= 0:
+            raise ValueError("Tick size must be set before updating a ladder book!")
+
+        self.best_ask, self.best_bid = update_ladder(
+            asks=self._ask_ladder_,
+            bids=self._bid_ladder_,
+            base_tick=self.base_tick,
+            tick_size=self.tick_size,
+            ask_data=asks.reshape(-1, 2),
+            bid_data=bids.reshape(-1, 2),
+            best_ask=self.best_ask,
+            best_bid=self.best_bid
+        )
+        self._stale_ = True
+
+        if self.best_ask < self.window and self.best_bid >= 0:
+            mid_idx = (self.best_ask + self.best_bid) // 2
+
+            if abs(mid_idx - self.window // 2) > self.window // 4:
+                self._recenter_(mid_idx)
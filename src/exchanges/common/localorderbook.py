@@ -1,67 +1,636 @@
 import numpy as np
+from collections import deque
+from numba import njit
 from numpy.typing import NDArray
-from typing import Dict
+from typing import Dict, List, Tuple
+
+@njit(cache=True)
+def search_side(side: NDArray, num_levels: int, price: float, ascending: bool) -> int:
+    """
+    Binary searches the populated part of a sorted book side for a price.
+
+    Parameters
+    ----------
+    side : NDArray
+        A preallocated array of [price, quantity] rows, sorted by price.
+    num_levels : int
+        The number of populated rows at the top of `side`.
+    price : float
+        The price to search for.
+    ascending : bool
+        True if `side` is sorted by ascending price (asks), False if descending (bids).
+
+    Returns
+    -------
+    int
+        The index of the level with the given price if present, otherwise the index
+        at which it would need to be inserted to keep the side sorted.
+    """
+    lo, hi = 0, num_levels
+
+    while lo < hi:
+        mid = (lo + hi) >> 1
+        mid_price = side[mid, 0]
+
+        if (mid_price < price) if ascending else (mid_price > price):
+            lo = mid + 1
+        else:
+            hi = mid
+
+    return lo
+
+@njit(cache=True)
+def update_side(side: NDArray, num_levels: int, data: NDArray, ascending: bool) -> Tuple[int, int]:
+    """
+    Applies a set of level updates in-place to a sorted, fixed-capacity book side.
+
+    Steps:
+    1. Binary search the side for the level's price.
+    2. If the quantity is zero, delete the level (if present) by shifting deeper levels up.
+    3. If the level exists, overwrite its quantity.
+    4. Otherwise insert it by shifting deeper levels down, dropping the worst level if the side is full.
+
+    Parameters
+    ----------
+    side : NDArray
+        A preallocated array of [price, quantity] rows, sorted by price.
+    num_levels : int
+        The number of populated rows at the top of `side`.
+    data : NDArray
+        The level updates to apply, each a [price, quantity] pair.
+    ascending : bool
+        True if `side` is sorted by ascending price (asks), False if descending (bids).
+
+    Returns
+    -------
+    Tuple[int, int]
+        The number of populated rows after applying the updates, and the index of
+        the shallowest row changed (or the side's capacity if none were).
+
+    Notes
+    -----
+    - Levels which would sort beyond the side's capacity are discarded, matching the
+      previous behaviour of truncating the book to its top levels after every update.
+    """
+    capacity = side.shape[0]
+    first_changed = capacity
+
+    for i in range(data.shape[0]):
+        price, qty = data[i, 0], data[i, 1]
+        idx = search_side(side, num_levels, price, ascending)
+        exists = idx < num_levels and side[idx, 0] == price
+
+        if (qty > 0 or exists) and idx < first_changed:
+            first_changed = idx
+
+        if qty > 0:
+            if exists:
+                side[idx, 1] = qty
+
+            elif idx < capacity:
+                last = min(num_levels, capacity - 1)
+
+                for j in range(last, idx, -1):
+                    side[j, 0] = side[j - 1, 0]
+                    side[j, 1] = side[j - 1, 1]
+
+                side[idx, 0] = price
+                side[idx, 1] = qty
+                num_levels = last + 1
+
+        elif exists:
+            for j in range(idx, num_levels - 1):
+                side[j, 0] = side[j + 1, 0]
+                side[j, 1] = side[j + 1, 1]
+
+            num_levels -= 1
+
+    return num_levels, first_changed
+
+@njit(cache=True)
+def accumulate_side(side: NDArray, cumulative: NDArray, start: int, num_levels: int) -> None:
+    """
+    Recomputes the cumulative quantity and notional of a book side from a given level onwards.
+
+    Parameters
+    ----------
+    side : NDArray
+        An array of [price, quantity] rows, best level first.
+    cumulative : NDArray
+        An array of [cumulative quantity, cumulative notional] rows to patch in-place.
+    start : int
+        The first level whose sums are out of date. Rows before it are left untouched.
+    num_levels : int
+        The number of populated rows in `side`.
+    """
+    qty = cumulative[start - 1, 0] if start > 0 else 0.0
+    notional = cumulative[start - 1, 1] if start > 0 else 0.0
+
+    for i in range(start, num_levels):
+        qty += side[i, 1]
+        notional += side[i, 0] * side[i, 1]
+        cumulative[i, 0] = qty
+        cumulative[i, 1] = notional
+
+@njit(cache=True)
+def count_within(side: NDArray, num_levels: int, limit: float, ascending: bool) -> int:
+    """
+    Counts the levels priced at or better than a limit, with a binary search.
+
+    Parameters
+    ----------
+    side : NDArray
+        An array of [price, quantity] rows, sorted by price.
+    num_levels : int
+        The number of populated rows in `side`.
+    limit : float
+        The worst price to include.
+    ascending : bool
+        True if `side` is sorted by ascending price (asks), False if descending (bids).
+
+    Returns
+    -------
+    int
+        The number of levels priced at or better than `limit`.
+    """
+    lo, hi = 0, num_levels
+
+    while lo < hi:
+        mid = (lo + hi) >> 1
+        mid_price = side[mid, 0]
+
+        if (mid_price <= limit) if ascending else (mid_price >= limit):
+            lo = mid + 1
+        else:
+            hi = mid
+
+    return lo
+
+@njit(cache=True)
+def fill_band_totals(side: NDArray, cumulative: NDArray, num_levels: int, bands: NDArray, ascending: bool, totals: NDArray) -> None:
+    """
+    Fills the total quantity resting within each band of a side's best price, from its cumulative sums.
+
+    Parameters
+    ----------
+    side : NDArray
+        An array of [price, quantity] rows, best level first.
+    cumulative : NDArray
+        The side's [cumulative quantity, cumulative notional] rows, up to date.
+    num_levels : int
+        The number of populated rows in `side`.
+    bands : NDArray
+        Band widths as fractions of the best price (eg, 0.001 for 10 bps).
+    ascending : bool
+        True if `side` is sorted by ascending price (asks), False if descending (bids).
+    totals : NDArray
+        An array of the same size as `bands`, filled with the quantity within each band.
+    """
+    if num_levels == 0:
+        totals[:] = 0.0
+        return None
+
+    best = side[0, 0]
+
+    for i in range(bands.size):
+        limit = best * (1 + bands[i]) if ascending else best * (1 - bands[i])
+        num_within = count_within(side, num_levels, limit, ascending)
+        totals[i] = cumulative[num_within - 1, 0] if num_within > 0 else 0.0
+
+def net_changes(data: NDArray) -> NDArray:
+    """
+    Reduces a sequence of level updates to the last update for each price.
+
+    Parameters
+    ----------
+    data : NDArray
+        Level updates, each a [price, quantity] pair, in the order they were received.
+
+    Returns
+    -------
+    NDArray
+        The net level updates, one per price, sorted by ascending price.
+    """
+    if data.shape[0] < 2:
+        return data
+
+    latest_first = data[::-1]
+    _, idx = np.unique(latest_first[:, 0], return_index=True)
+    return latest_first[idx]
+
 
 class BaseOrderBook:
     """
     A base class for maintaining and updating an order book with ask and bid orders.
 
+    Each side is stored in a preallocated array kept sorted at all times (asks ascending,
+    bids descending), and updated in-place with binary-search inserts, updates and deletes.
+    No allocations are made while applying deltas.
+
+    Cumulative quantity and notional (price * quantity) are cached per level, and only patched
+    from the shallowest level a delta touched, the next time they are read. VAMP and depth-band
+    totals are then O(1) and O(log n) lookups respectively.
+
+    Deltas are validated against the last applied update ID. Out-of-order deltas are buffered
+    until the missing ones arrive, and if a gap is not filled within `max_pending` deltas the
+    book flags itself for a resync from a fresh snapshot. The same applies while awaiting a
+    snapshot, as the snapshot then has to bridge a buffer which has been restarted.
+
     Attributes
     ----------
+    size : int
+        The maximum number of levels kept on each side of the book.
     asks : NDArray
-        A NumPy array to store ask orders. Each order is represented by a [price, quantity] pair.
+        A view of the populated ask levels, each represented by a [price, quantity] pair.
     bids : NDArray
-        A NumPy array to store bid orders. Each order is represented by a [price, quantity] pair.
+        A view of the populated bid levels, each represented by a [price, quantity] pair.
+    ask_cumulative : NDArray
+        A view of [cumulative quantity, cumulative notional] rows for the ask levels.
+    bid_cumulative : NDArray
+        A view of [cumulative quantity, cumulative notional] rows for the bid levels.
+    update_id : int
+        The ID of the last applied snapshot or delta.
+    synced : bool
+        True if the book has been built from a snapshot and all deltas since have been applied.
+    needs_resync : bool
+        True if the book has detected an unrecoverable gap and needs a fresh snapshot.
+    coalesced_count : int
+        The number of deltas merged into another delta's update instead of being applied separately.
+    gap_count : int
+        The number of sequence gaps detected.
+    resync_count : int
+        The number of resyncs started.
+    max_pending : int
+        The maximum number of deltas buffered before the buffer is restarted and a resync requested.
+    first_pending_id : int
+        The first update ID of the deltas buffered, or 0 if none are.
 
     Methods
     -------
-    sort_book():
-        Sorts the ask and bid arrays by price in ascending and descending order, respectively.
-    update_book(asks_or_bids: NDArray, data: NDArray) -> NDArray:
-        Updates the order book (asks or bids) with new data.
+    set_precision(tick_size: float) -> None:
+        Passes the symbol's tick size to engines which need it.
+    initialize_book(asks: NDArray, bids: NDArray) -> None:
+        Replaces the contents of the book with a snapshot.
+    update_book(asks: NDArray, bids: NDArray) -> None:
+        Applies level updates to both sides of the book.
+    vamp(depth: int) -> float:
+        Returns the volume-weighted average mid-price over the top `depth` levels.
+    band_totals(bands: NDArray, bid_totals: NDArray, ask_totals: NDArray) -> None:
+        Fills the total quantity within each band (fraction of the best price) of each side.
+    reset_sequence(update_id: int, bridge: bool) -> None:
+        Marks the book as synced to a snapshot, then applies any buffered deltas following it.
+    sequence_update(first_id: int, prev_id: int, last_id: int, asks: NDArray, bids: NDArray) -> None:
+        Validates a delta's sequence before applying or buffering it.
+    sequence_updates(deltas: List[Tuple]) -> None:
+        Validates a run of deltas, applying their net level changes at once if they chain.
+    begin_resync() -> None:
+        Acknowledges a resync request, buffering deltas until the next snapshot.
     process(recv):
         Abstract method for processing incoming data. To be implemented by derived classes.
     """
 
-    def __init__(self) -> None:
+    def __init__(self, size: int=500, max_pending: int=50) -> None:
         """
-        Initializes the BaseOrderBook with empty asks and bids arrays.
+        Initializes the BaseOrderBook with empty, preallocated asks and bids arrays.
+
+        Parameters
+        ----------
+        size : int, optional
+            The maximum number of levels kept on each side of the book, by default 500.
+        max_pending : int, optional
+            The maximum number of out-of-order deltas buffered before a resync is requested, by default 50.
         """
-        self.asks = np.empty((0, 2), dtype=np.float64)
-        self.bids = np.empty((0, 2), dtype=np.float64)
+        self.size = size
+        self._asks_ = np.zeros((size, 2), dtype=np.float64)
+        self._bids_ = np.zeros((size, 2), dtype=np.float64)
+        self.num_asks = 0
+        self.num_bids = 0
+
+        # NOTE: Reused by derived classes to parse incoming levels without allocating
+        self._ask_buffer_ = np.empty((size, 2), dtype=np.float64)
+        self._bid_buffer_ = np.empty((size, 2), dtype=np.float64)
+
+        self._ask_cumulative_ = np.zeros((size, 2), dtype=np.float64)
+        self._bid_cumulative_ = np.zeros((size, 2), dtype=np.float64)
+        self._asks_changed_from_ = 0
+        self._bids_changed_from_ = 0
+
+        self.update_id = -1
+        self.synced = False
+        self.needs_resync = False
+        self.coalesced_count = 0
+        self.gap_count = 0
+        self.resync_count = 0
+        self._bridge_ = False
+        self.max_pending = max_pending
+        self._pending_ = deque()
+
+    @property
+    def asks(self) -> NDArray:
+        return self._asks_[:self.num_asks]
+
+    @property
+    def first_pending_id(self) -> int:
+        return min(delta[0] for delta in self._pending_) if self._pending_ else 0
+
+    @property
+    def bids(self) -> NDArray:
+        return self._bids_[:self.num_bids]
+
+    @property
+    def ask_cumulative(self) -> NDArray:
+        self._refresh_aggregates_()
+        return self._ask_cumulative_[:self.num_asks]
+
+    @property
+    def bid_cumulative(self) -> NDArray:
+        self._refresh_aggregates_()
+        return self._bid_cumulative_[:self.num_bids]
 
-    def sort_book(self) -> None:
+    def _refresh_aggregates_(self) -> None:
         """
-        Sorts the ask orders in ascending order and bid orders in descending order by price.
-        Only keeps the top 500 orders in each.
+        Patches the cumulative sums of each side from the shallowest level changed since they were last read.
         """
-        self.asks = self.asks[self.asks[:, 0].argsort()][:500]
-        self.bids = self.bids[self.bids[:, 0].argsort()[::-1]][:500]
+        asks, bids = self.asks, self.bids  # NOTE: Ensures derived engines have refreshed their views
 
-    def update_book(self, asks_or_bids: NDArray, data: NDArray) -> NDArray:
+        if self._asks_changed_from_ < self.num_asks:
+            accumulate_side(asks, self._ask_cumulative_, self._asks_changed_from_, self.num_asks)
+
+        if self._bids_changed_from_ < self.num_bids:
+            accumulate_side(bids, self._bid_cumulative_, self._bids_changed_from_, self.num_bids)
+
+        self._asks_changed_from_ = self.size
+        self._bids_changed_from_ = self.size
+
+    def _load_side_(self, side: NDArray, data: NDArray, ascending: bool) -> int:
         """
-        Updates the specified order book (asks or bids) with new data.
+        Sorts snapshot levels and copies the best `size` of them into a side.
 
         Parameters
         ----------
-        asks_or_bids : NDArray
-            The current state of either the asks or bids in the order book.
+        side : NDArray
+            The preallocated side to overwrite.
         data : NDArray
-            New data to be integrated into the asks or bids. Each element is a [price, quantity] pair.
+            The snapshot levels, each a [price, quantity] pair, in any order.
+        ascending : bool
+            True if the side is sorted by ascending price (asks), False if descending (bids).
 
         Returns
         -------
-        NDArray
-            The updated asks or bids array.
+        int
+            The number of populated rows in the side.
+        """
+        data = data.reshape(-1, 2)
+        data = data[data[:, 1] > 0]
+        order = data[:, 0].argsort()
+
+        if not ascending:
+            order = order[::-1]
+
+        num_levels = min(order.size, self.size)
+        side[:num_levels] = data[order[:num_levels]]
+        return num_levels
+
+    def set_precision(self, tick_size: float) -> None:
         """
-        for price, qty in data:
-            # Remove orders with the specified price
-            asks_or_bids = asks_or_bids[asks_or_bids[:, 0] != price]
-            # Add new or updated order if quantity is greater than zero
-            if qty > 0:
-                asks_or_bids = np.vstack((asks_or_bids, np.array([price, qty])))
+        Passes the symbol's tick size to the book. Unused by the sorted-array engine.
 
-        return asks_or_bids
+        Parameters
+        ----------
+        tick_size : float
+            The symbol's tick size.
+        """
+        pass
+
+    def initialize_book(self, asks: NDArray, bids: NDArray) -> None:
+        """
+        Replaces the contents of the order book with a snapshot.
+
+        Parameters
+        ----------
+        asks : NDArray
+            The ask levels of the snapshot, each a [price, quantity] pair.
+        bids : NDArray
+            The bid levels of the snapshot, each a [price, quantity] pair.
+        """
+        self.num_asks = self._load_side_(self._asks_, asks, True)
+        self.num_bids = self._load_side_(self._bids_, bids, False)
+        self._asks_changed_from_ = 0
+        self._bids_changed_from_ = 0
+
+    def update_book(self, asks: NDArray, bids: NDArray) -> None:
+        """
+        Applies level updates to both sides of the order book.
+
+        Parameters
+        ----------
+        asks : NDArray
+            Ask level updates, each a [price, quantity] pair. A quantity of zero removes the level.
+        bids : NDArray
+            Bid level updates, each a [price, quantity] pair. A quantity of zero removes the level.
+        """
+        self.num_asks, asks_changed_from = update_side(self._asks_, self.num_asks, asks.reshape(-1, 2), True)
+        self.num_bids, bids_changed_from = update_side(self._bids_, self.num_bids, bids.reshape(-1, 2), False)
+        self._asks_changed_from_ = min(self._asks_changed_from_, asks_changed_from)
+        self._bids_changed_from_ = min(self._bids_changed_from_, bids_changed_from)
+
+    def vamp(self, depth: int=10) -> float:
+        """
+        Calculates the Volume-Weighted Average Mid-Price (VAMP) over the top `depth` levels,
+        as the average of each side's notional divided by its quantity.
+
+        Parameters
+        ----------
+        depth : int, optional
+            The number of levels of each side to consider, by default 10.
+
+        Returns
+        -------
+        float
+            The VAMP, or 0.0 if either side of the book is empty.
+        """
+        self._refresh_aggregates_()
+        num_asks, num_bids = min(depth, self.num_asks), min(depth, self.num_bids)
+
+        if num_asks == 0 or num_bids == 0:
+            return 0.0
+
+        bid_qty, bid_notional = self._bid_cumulative_[num_bids - 1]
+        ask_qty, ask_notional = self._ask_cumulative_[num_asks - 1]
+
+        return (bid_notional / bid_qty + ask_notional / ask_qty) / 2
+
+    def band_totals(self, bands: NDArray, bid_totals: NDArray, ask_totals: NDArray) -> None:
+        """
+        Fills the total quantity resting within each band of the best price, on each side.
+
+        Parameters
+        ----------
+        bands : NDArray
+            Band widths as fractions of the best price (eg, 0.001 for 10 bps).
+        bid_totals : NDArray
+            An array of the same size as `bands`, filled with the bid quantity priced at or above best_bid * (1 - band).
+        ask_totals : NDArray
+            An array of the same size as `bands`, filled with the ask quantity priced at or below best_ask * (1 + band).
+        """
+        self._refresh_aggregates_()
+        fill_band_totals(self._bids_, self._bid_cumulative_, self.num_bids, bands, False, bid_totals)
+        fill_band_totals(self._asks_, self._ask_cumulative_, self.num_asks, bands, True, ask_totals)
+
+    def _is_stale_(self, last_id: int) -> bool:
+        """
+        Truthy whether a delta ending at `last_id` is already reflected in the book.
+        While bridging from a REST snapshot, a delta ending exactly at the snapshot's ID is still applied.
+        """
+        return last_id < self.update_id or (last_id == self.update_id and not self._bridge_)
+
+    def _follows_(self, first_id: int, prev_id: int, last_id: int) -> bool:
+        """
+        Truthy whether a delta directly follows the last applied update.
+        While bridging from a REST snapshot, the first delta only needs to span the snapshot's ID.
+        """
+        if self._bridge_:
+            return first_id <= self.update_id <= last_id
+
+        return prev_id == self.update_id
+
+    def _apply_(self, last_id: int, asks: NDArray, bids: NDArray) -> None:
+        """
+        Applies a validated delta and advances the sequence.
+        """
+        self.update_book(asks, bids)
+        self.update_id = last_id
+        self._bridge_ = False
+
+    def _drain_pending_(self) -> None:
+        """
+        Applies any buffered deltas which now follow the sequence, discarding stale ones.
+        """
+        progress = True
+
+        while progress and self._pending_:
+            progress = False
+
+            for delta in list(self._pending_):
+                first_id, prev_id, last_id, asks, bids = delta
+
+                if self._is_stale_(last_id):
+                    self._pending_.remove(delta)
+
+                elif self._follows_(first_id, prev_id, last_id):
+                    self._pending_.remove(delta)
+                    self._apply_(last_id, asks, bids)
+                    progress = True
+
+    def reset_sequence(self, update_id: int, bridge: bool=False) -> None:
+        """
+        Marks the book as synced to a snapshot with the given update ID, then applies
+        any buffered deltas which follow it.
+
+        Parameters
+        ----------
+        update_id : int
+            The update ID of the snapshot the book was initialized with.
+        bridge : bool, optional
+            True if the snapshot came from REST, in which case the first delta applied
+            only needs to span `update_id` rather than directly follow it, by default False.
+        """
+        self.update_id = update_id
+        self.synced = True
+        self.needs_resync = False
+        self._bridge_ = bridge
+        self._drain_pending_()
+
+        if self._pending_:
+            self.gap_count += 1
+
+    def sequence_update(self, first_id: int, prev_id: int, last_id: int, asks: NDArray, bids: NDArray) -> None:
+        """
+        Validates the sequence of a delta, applying it if it follows the last applied update,
+        dropping it if stale, and otherwise buffering it until the gap is filled or a resync is needed.
+
+        Parameters
+        ----------
+        first_id : int
+            The first update ID covered by the delta.
+        prev_id : int
+            The update ID the delta expects to have been applied last.
+        last_id : int
+            The last update ID covered by the delta.
+        asks : NDArray
+            Ask level updates, each a [price, quantity] pair.
+        bids : NDArray
+            Bid level updates, each a [price, quantity] pair.
+        """
+        if self.synced:
+            if self._is_stale_(last_id):
+                return None
+
+            if self._follows_(first_id, prev_id, last_id):
+                self._apply_(last_id, asks, bids)
+
+                if self._pending_:
+                    self._drain_pending_()
+
+                return None
+
+            if not self._pending_:
+                self.gap_count += 1
+
+        # NOTE: On overflow, synced or not, the buffer is restarted and a fresh snapshot requested,
+        # as evicting its oldest deltas could leave a gap no snapshot fetched before could bridge
+        if len(self._pending_) >= self.max_pending:
+            self._pending_.clear()
+            self.synced = False
+            self.needs_resync = True
+
+        # NOTE: Copied as the arrays may be views of the (reused) parse buffers
+        self._pending_.append((first_id, prev_id, last_id, asks.copy(), bids.copy()))
+
+    def _chains_(self, deltas: List[Tuple]) -> bool:
+        """
+        Truthy whether each delta in a run follows the one before it, starting from the last applied update.
+        """
+        update_id, bridge = self.update_id, self._bridge_
+
+        for first_id, prev_id, last_id, _, _ in deltas:
+            if not (first_id <= update_id <= last_id if bridge else prev_id == update_id):
+                return False
+
+            update_id, bridge = last_id, False
+
+        return True
+
+    def sequence_updates(self, deltas: List[Tuple]) -> None:
+        """
+        Validates a run of deltas received together, coalescing them if possible.
+
+        If the book is synced with nothing buffered and the run chains on from the last applied
+        update, the level updates of all deltas are merged into a net change set and applied once.
+        Otherwise, each delta goes through `sequence_update` in order.
+
+        Parameters
+        ----------
+        deltas : List[Tuple]
+            Deltas in the order received, each a (first_id, prev_id, last_id, asks, bids) tuple.
+        """
+        if len(deltas) > 1 and self.synced and not self._pending_ and self._chains_(deltas):
+            asks = net_changes(np.concatenate([delta[3].reshape(-1, 2) for delta in deltas]))
+            bids = net_changes(np.concatenate([delta[4].reshape(-1, 2) for delta in deltas]))
+            self._apply_(deltas[-1][2], asks, bids)
+            self.coalesced_count += len(deltas) - 1
+            return None
+
+        for delta in deltas:
+            self.sequence_update(*delta)
+
+    def begin_resync(self) -> None:
+        """
+        Acknowledges a resync, marking the book as unsynced so deltas are buffered until the next snapshot.
+        """
+        self.synced = False
+        self.needs_resync = False
+        self.resync_count += 1
 
     def process(self, recv: Dict) -> Exception:
         """
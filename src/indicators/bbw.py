@@ -1,6 +1,8 @@
+import math
 import numpy as np
 from numba import njit
 from numpy.typing import NDArray
+from typing import Optional
 
 @njit(cache=True)
 def bbw(klines: NDArray, length: int, multiplier: float) -> float:
@@ -28,4 +30,131 @@ def bbw(klines: NDArray, length: int, multiplier: float) -> float:
     """
     closes = klines[:, 4]
     dev = multiplier * np.std(closes[-length:])
-    return 2 * dev 
\ No newline at end of file
+    return 2 * dev 
+class StreamingBBW:
+    """
+    Maintains the Bollinger Band Width of the last `length` closes from rolling sums, updating in O(1)
+    as candles are added or the current candle is overwritten, instead of recalculating `bbw` each time.
+
+    The sums are of the closes minus a reference close (the latest close when seeded), which keeps
+    the values small and avoids the cancellation of the naive sum-of-squares variance. As add/remove
+    updates accumulate rounding error, `stale` turns True after `length` updates, so the state can
+    be reseeded from the closes (an amortized O(1) cost, which also moves the reference close).
+
+    Attributes
+    ----------
+    length : int
+        The number of most recent closes used.
+    count : int
+        The number of closes currently in the window (less than `length` while warming up).
+
+    Methods
+    -------
+    seed(closes: NDArray) -> None:
+        Resets the state from the most recent closes.
+    push(close: float, outgoing: Optional[float]) -> None:
+        Adds the close of a new candle, removing the close leaving the window, if any.
+    replace(previous: float, close: float) -> None:
+        Updates the close of the current candle.
+    width(multiplier: float) -> float:
+        Returns the width of the bands, as calculated by `bbw`.
+    """
+
+    def __init__(self, length: int) -> None:
+        """
+        Initializes an empty StreamingBBW.
+
+        Parameters
+        ----------
+        length : int
+            The number of most recent closes used.
+        """
+        self.length = length
+        self.count = 0
+        self._shift_ = 0.0
+        self._sum_ = 0.0
+        self._sum_sq_ = 0.0
+        self._updates_ = 0
+
+    @property
+    def stale(self) -> bool:
+        return self._updates_ >= self.length
+
+    def seed(self, closes: NDArray) -> None:
+        """
+        Resets the state from the most recent closes, recalculating the sums from scratch.
+
+        Parameters
+        ----------
+        closes : NDArray
+            The closes, oldest first. Only the last `length` are used.
+        """
+        closes = closes[-self.length:]
+        self.count = closes.shape[0]
+        self._shift_ = float(closes[-1]) if self.count else 0.0
+        shifted = closes - self._shift_
+        self._sum_ = float(np.sum(shifted))
+        self._sum_sq_ = float(np.sum(shifted * shifted))
+        self._updates_ = 0
+
+    def push(self, close: float, outgoing: Optional[float]) -> None:
+        """
+        Adds the close of a new candle to the window.
+
+        Parameters
+        ----------
+        close : float
+            The close of the new candle.
+        outgoing : float or None
+            The close leaving the window, or None if the window isn't full yet.
+        """
+        value = close - self._shift_
+        self._sum_ += value
+        self._sum_sq_ += value * value
+
+        if outgoing is None:
+            self.count += 1
+
+        else:
+            value = outgoing - self._shift_
+            self._sum_ -= value
+            self._sum_sq_ -= value * value
+
+        self._updates_ += 1
+
+    def replace(self, previous: float, close: float) -> None:
+        """
+        Updates the close of the current (most recent) candle.
+
+        Parameters
+        ----------
+        previous : float
+            The close it is replacing.
+        close : float
+            The updated close.
+        """
+        old, new = previous - self._shift_, close - self._shift_
+        self._sum_ += new - old
+        self._sum_sq_ += new * new - old * old
+        self._updates_ += 1
+
+    def width(self, multiplier: float) -> float:
+        """
+        Calculates the width of the Bollinger Bands, 2 * multiplier * std (population) of the closes.
+
+        Parameters
+        ----------
+        multiplier : float
+            The multiplier for the standard deviation.
+
+        Returns
+        -------
+        float
+            The width of the bands, or 0 if there are no closes.
+        """
+        if self.count == 0:
+            return 0.0
+
+        mean = self._sum_ / self.count
+        variance = max(self._sum_sq_ / self.count - mean * mean, 0.0)
+        return 2 * multiplier * math.sqrt(variance)
@@ -37,7 +37,7 @@ def ema(arr_in: NDArray, window: int, alpha: Optional[float]=0) -> NDArray:
 
     return ewma
 
-@njit
+@njit(cache=True)
 def ema_weights(window: int, reverse: bool=False, alpha: Optional[float]=0) -> NDArray:
     """
     Calculate EMA (Exponential Moving Average)-like weights for a given window size.
@@ -1,14 +1,22 @@
 import asyncio
+import importlib.util
 import numpy as np
 import os
 import yaml
 from collections import deque
-from numpy_ringbuffer import RingBuffer
 from typing import Dict
 from numpy.typing import NDArray
 from src.exchanges.common.localorderbook import BaseOrderBook
-from src.exchanges.binance.websockets.handlers.orderbook import OrderBookBinance
-from src.exchanges.bybit.websockets.handlers.orderbook import OrderBookBybit
+from src.exchanges.binance.websockets.handlers.orderbook import OrderBookBinance, LadderOrderBookBinance
+from src.exchanges.bybit.websockets.handlers.orderbook import OrderBookBybit, LadderOrderBookBybit
+from src.exchanges.bybit.ratelimit import RequestScheduler
+from src.indicators.bbw import StreamingBBW
+from src.strategy.features.registry import load_weights
+from src.strategy.features.trades_imbalance import StreamingTradesImbalance
+from src.utils.events import MarketEvents
+from src.utils.misc import datetime_now as dt_now
+from src.utils.ringbuffer import RingBuffer, TimedRingBuffer
+from src.utils.startup import Startup
 
 class SharedState:
     """
@@ -37,6 +45,7 @@ class SharedState:
     """
 
     PARAM_PATH = os.path.dirname(os.path.realpath(__file__)) + "/../parameters.yaml"  
+    _book_modes_ = ["SORTED", "LADDER"]
 
     def __init__(self) -> None:
         """
@@ -54,19 +63,25 @@ class SharedState:
 
         # Initialize market data attributes for Binance and Bybit
         self.binance_ws_connected = False
-        self.binance_trades = RingBuffer(capacity=1000, dtype=(float, 4))
+        self.binance_trades = TimedRingBuffer(capacity=1000, width=4)
+        self.binance_trades_imbalance = StreamingTradesImbalance(window=1000)
         self.binance_bba = np.ones((2, 2), dtype=np.float64)
-        self.binance_book = OrderBookBinance()
+        self.binance_book = LadderOrderBookBinance() if self.binance_book_mode == "LADDER" else OrderBookBinance()
         self.binance_last_price = 0
 
         self.bybit_ws_connected = False
-        self.bybit_klines = RingBuffer(capacity=500, dtype=(float, 7))
-        self.bybit_trades = RingBuffer(capacity=1000, dtype=(float, 4))
+        self.bybit_klines = RingBuffer(capacity=500, width=7)
+        self.bybit_bbw = StreamingBBW(length=self.bb_length)
+        self.bybit_trades = TimedRingBuffer(capacity=1000, width=4)
+        self.bybit_trades_imbalance = StreamingTradesImbalance(window=1000)
         self.bybit_bba = np.ones((2, 2), dtype=np.float64)
-        self.bybit_book = OrderBookBybit()
+        self.bybit_book = LadderOrderBookBybit() if self.bybit_book_mode == "LADDER" else OrderBookBybit()
         self.bybit_mark_price = 0
 
         # Other shared attributes
+        self.market_events = MarketEvents()
+        self.startup = Startup()
+        self.request_scheduler = RequestScheduler()
         self.current_orders = {}
         self.execution_feed = deque(maxlen=100)
         self.volatility_value = 0
@@ -76,11 +91,39 @@ class SharedState:
     def _load_settings_(self, settings: Dict, reload: bool=False) -> None:
         """
         Updates trading parameters and settings from a dictionary of settings.
+
+        Invalid feature weights raise a ValueError on startup, while on a reload they are reported
+        and the previous weights kept, so a bad edit doesn't stop the parameters refreshing.
+
+        Examples
+        --------
+        >>> example = os.path.dirname(os.path.realpath(__file__)) + "/../parameters.yaml.example"
+        >>> settings = yaml.safe_load(open(example))
+        >>> ss = SharedState.__new__(SharedState)
+        >>> ss._load_settings_(settings)
+        >>> weights = ss.feature_weights
+        >>> settings["feature_weights"] = {"bybit_bba_imbalance": None}
+        >>> ss._load_settings_(settings, reload=True)  # doctest: +ELLIPSIS
+        20...: Error reloading feature weights, keeping the previous ones: Weight of bybit_bba_imbalance must be a number, not None!
+        >>> ss.feature_weights is weights
+        True
+        >>> ss._load_settings_(settings)
+        Traceback (most recent call last):
+        ...
+        ValueError: Weight of bybit_bba_imbalance must be a number, not None!
         """
         if not reload:
             self.primary_data_feed = str(settings["primary_data_feed"]).upper()
             self.binance_symbol = str(settings["binance_symbol"])
             self.bybit_symbol = str(settings["bybit_symbol"])
+            self.binance_book_mode = str(settings.get("binance_book_mode", "sorted")).upper()
+            self.bybit_book_mode = str(settings.get("bybit_book_mode", "sorted")).upper()
+
+            # NOTE: msgspec is optional, so without it the setting is turned off and messages are decoded into dicts
+            self.typed_decoding = bool(settings.get("typed_decoding", True)) and importlib.util.find_spec("msgspec") is not None
+
+            if self.binance_book_mode not in self._book_modes_ or self.bybit_book_mode not in self._book_modes_:
+                raise ValueError(f"Book modes must be one of {self._book_modes_}!")
 
         self.account_size = float(settings["account_size"])
         self.bb_length = int(settings["bollinger_band_length"])
@@ -92,6 +135,25 @@ class SharedState:
         self.min_order_size = float(settings["min_order_size"])
         self.max_order_size = float(settings["max_order_size"])
         self.inventory_extreme = float(settings["inventory_extreme"])
+        self.trades_window_ms = int(settings.get("trades_window_ms", 0))
+        self.quote_interval_ms = int(settings.get("quote_interval_ms", 100))
+        self.price_tolerance_bps = float(settings.get("price_tolerance_bps", 0.5))
+        self.size_tolerance = float(settings.get("size_tolerance", 0.1))
+
+        # NOTE: Invalid weights fail startup, but a bad edit while running keeps the previous weights
+        try:
+            feature_weights = load_weights(settings.get("feature_weights"), self.primary_data_feed)
+
+        except ValueError as e:
+            if not reload:
+                raise
+
+            print(f"{dt_now()}: Error reloading feature weights, keeping the previous ones: {e}")
+            return
+
+        # NOTE: Kept as the same array when unchanged, so readers can tell a reload apart from a change
+        if not np.array_equal(feature_weights, getattr(self, "feature_weights", None)):
+            self.feature_weights = feature_weights
 
     def _load_initial_settings_(self) -> None:
         """
@@ -185,10 +247,9 @@ class SharedState:
         Calculates the Volume-Weighted Average Mid-Price (VAMP) over a specified depth from the order book.
 
         Steps:
-        1. Sum the quantities for the top `depth` bids and asks separately.
-        2. Calculate the weighted price for each bid and ask up to the specified depth, using their quantities as weights.
-        3. Compute the fair value for bids and asks by multiplying each price by its relative weight and summing the results.
-        4. Calculate the VAMP as the average of the bid and ask fair values.
+        1. Read the cumulative quantity and notional of the top `depth` bids and asks, maintained by the book.
+        2. Compute the fair value for bids and asks as their notional divided by their quantity.
+        3. Calculate the VAMP as the average of the bid and ask fair values.
 
         Parameters
         ----------
@@ -202,9 +263,4 @@ class SharedState:
         float
             The calculated VAMP, representing an average price adjusted for volume at each depth level.
         """
-        bids_qty_sum = sum(bid[1] for bid in book.bids[:depth])
-        asks_qty_sum = sum(ask[1] for ask in book.asks[:depth])
-        bid_fair = sum(bid[0] * (bid[1] / bids_qty_sum) for bid in book.bids[:depth])
-        ask_fair = sum(ask[0] * (ask[1] / asks_qty_sum) for ask in book.asks[:depth])
-
-        return (bid_fair + ask_fair) / 2
\ No newline at end of file
+        return book.vamp(depth)
\ No newline at end of file
@@ -1,10 +1,15 @@
 import asyncio
+from time import perf_counter
+from typing import List
 from src.utils.misc import datetime_now as dt_now
+from src.exchanges.bybit.endpoints import BaseEndpoints as BybitEndpoints, PublicGetLinks as BybitLinks
+from src.exchanges.binance.endpoints import BaseEndpoints as BinanceEndpoints, PublicGetLinks as BinanceLinks
+from src.exchanges.common.session import warm_connections
 from src.strategy.ws_feeds.bybitmarketdata import BybitMarketData
-from src.strategy.ws_feeds.binancemarketdata import BinanceMarketData
 from src.strategy.ws_feeds.bybitprivatedata import BybitPrivateData
 from src.strategy.marketmaker import MarketMaker
 from src.strategy.oms import OMS
+from src.strategy.warmup import warmup
 from src.sharedstate import SharedState
 
 class DataFeeds:
@@ -33,6 +38,8 @@ class DataFeeds:
         ]
 
         if self.ss.primary_data_feed == "BINANCE":
+            # NOTE: Imported only when used, so a Bybit-only setup doesn't pay for importing it
+            from src.strategy.ws_feeds.binancemarketdata import BinanceMarketData
             tasks.append(asyncio.create_task(BinanceMarketData(self.ss).start_feed()))
 
         await asyncio.gather(*tasks)
@@ -41,8 +48,14 @@ class DataFeeds:
 class Strategy:
     """
     Defines and executes the trading strategy using market data and order management systems.
+
+    The strategy starts as soon as the feeds it needs are live and its kernels are warmed up (see
+    Startup), then iterates as soon as any of its inputs are updated (see MarketEvents), at most
+    once every `quote_interval_ms`, and at least once a second while markets are quiet.
     """
 
+    _idle_timeout_ = 1  # NOTE: Seconds, matching the previous polling interval
+
     def __init__(self, ss: SharedState) -> None:
         """
         Initializes the Strategy with shared application state.
@@ -53,40 +66,77 @@ class Strategy:
             An instance of SharedState containing shared application data.
         """
         self.ss = ss
+        self._start_ = perf_counter()
 
-    async def _wait_for_ws_confirmation_(self) -> None:
+    def _dependencies_(self) -> List[str]:
         """
-        Waits for confirmation that the WebSocket connections are established.
+        The startup dependencies the strategy needs before quoting.
         """
-        while True: 
-            await asyncio.sleep(1)  # Check every second
+        dependencies = ["warmup", "connections", "bybit_market", "bybit_account"]
+
+        if self.ss.primary_data_feed == "BINANCE":
+            dependencies.append("binance_market")
 
-            if not self.ss.bybit_ws_connected:
-                continue
+        return dependencies
 
-            if self.ss.primary_data_feed == "BINANCE" and not self.ss.binance_ws_connected:
-                continue
+    def _hosts_(self) -> List[str]:
+        """
+        A cheap URL of each REST host the strategy sends requests to, to open connections to ahead of time.
+        """
+        urls = [BybitEndpoints.MAINNET1 + BybitLinks.SERVER_TIME]
+
+        if self.ss.primary_data_feed == "BINANCE":
+            urls.append(BinanceEndpoints.FUTURES + BinanceLinks.SERVER_TIME)
 
-            break
+        return urls
 
     async def primary_loop(self) -> None:
         """
-        The primary loop of the strategy, executing continuously after WebSocket confirmations.
+        The primary loop of the strategy, executing once its dependencies are ready whenever
+        market data changes.
         """
-        print(f"{dt_now()}: Starting data feeds...")
-        await self._wait_for_ws_confirmation_()
+        await self.ss.startup.wait_for(self._dependencies_())
+        self.ss.startup.report()
         print(f"{dt_now()}: Starting strategy...")
 
+        # NOTE: Kept across iterations, so features are only recalculated when their inputs change,
+        # and the OMS's request and order change rates are counted over time
+        market_maker = MarketMaker(self.ss)
+        oms = OMS(self.ss)
+
+        first_iteration = True
+
         while True:
-            await asyncio.sleep(1)  # Strategy iteration delay
-            new_orders, spread = MarketMaker(self.ss).generate_quotes(debug=False)
-            await OMS(self.ss).run(new_orders, spread)
+            await self.ss.market_events.wait(self._idle_timeout_)
+            tick_start = perf_counter()
+            new_orders, _ = market_maker.generate_quotes(debug=False)
+            tick_end = perf_counter()
+            await oms.run(new_orders)
+
+            if first_iteration:
+                first_iteration = False
+                print(
+                    f"{dt_now()}: First quotes sent | First tick: {(tick_end - tick_start) * 1e3:.2f}ms "
+                    f"| Time to first quote: {perf_counter() - self._start_:.2f}s"
+                )
+
+            await asyncio.sleep(self.ss.quote_interval_ms / 1000)  # Updates meanwhile wake the next iteration
 
     async def run(self) -> None:
         """
-        Runs the strategy by starting data feeds and entering the primary strategy loop.
+        Runs the strategy by warming up its kernels, then starting the data feeds and entering the
+        primary strategy loop once they are ready.
         """
+        # NOTE: The warm-up holds the GIL while compiling, so runs before the feeds rather than
+        # alongside them, where it would stall their messages and REST requests
+        print(f"{dt_now()}: Warming up...")
+        start = perf_counter()
+        warmup(self.ss)
+        self.ss.startup.set_ready("warmup", start)
+
+        print(f"{dt_now()}: Starting data feeds...")
         await asyncio.gather(
+            self.ss.startup.stage("connections", warm_connections(self._hosts_())),
             DataFeeds(self.ss).start_feeds(),
             self.primary_loop()
-        )
\ No newline at end of file
+        )
@@ -0,0 +1,200 @@
+import numpy as np
+from numba import njit
+from numpy.typing import NDArray
+from src.strategy.features.ob_imbalance import banded_imbalance
+from src.strategy.features.trades_imbalance import trades_imbalance
+
+@njit(cache=True)
+def dirty_features(
+    dependencies: NDArray,
+    versions: NDArray,
+    times: NDArray,
+    weights: NDArray,
+    always: NDArray,
+    seen: NDArray,
+    input_times: NDArray,
+    dirty: NDArray
+) -> bool:
+    """
+    Flags the features whose inputs were updated since they were last calculated.
+
+    Each feature's version is the sum of its inputs' versions, which grows whenever any of them
+    is updated. Features with a weight of 0 are never flagged.
+
+    Parameters
+    ----------
+    dependencies : NDArray
+        A boolean array of shape (num_features, num_inputs), True where a feature uses an input.
+    versions : NDArray
+        The number of updates to each input (MarketEvents.versions).
+    times : NDArray
+        The time of the last update to each input (MarketEvents.times).
+    weights : NDArray
+        The weight of each feature.
+    always : NDArray
+        A boolean array, True for features to recalculate regardless of their inputs.
+    seen : NDArray
+        The version each feature was last calculated at, updated in place for flagged features.
+    input_times : NDArray
+        Filled with the time of the latest update to each feature's inputs.
+    dirty : NDArray
+        Filled with True for the features to recalculate.
+
+    Returns
+    -------
+    bool
+        True if any feature was flagged.
+    """
+    any_dirty = False
+
+    for i in range(dependencies.shape[0]):
+        version, latest = 0, 0
+
+        for j in range(dependencies.shape[1]):
+            if dependencies[i, j]:
+                version += versions[j]
+                latest = max(latest, times[j])
+
+        input_times[i] = latest
+        dirty[i] = weights[i] != 0.0 and (always[i] or version != seen[i])
+
+        if dirty[i]:
+            seen[i] = version
+            any_dirty = True
+
+    return any_dirty
+
+@njit(cache=True)
+def _wmid_(bba: NDArray) -> float:
+    imb = bba[0, 1] / (bba[0, 1] + bba[1, 1])
+    return bba[1, 0] * imb + bba[0, 0] * (1 - imb)
+
+@njit(cache=True)
+def _log_spread_(price: float, reference: float) -> float:
+    # NOTE: 0.0 until both are known, eg before the ticker is received or while a book side is empty
+    if price <= 0.0 or reference <= 0.0:
+        return 0.0
+
+    return np.log(price / reference) * 100
+
+@njit(cache=True)
+def _trades_feature_(trades: NDArray, value: float) -> float:
+    return trades_imbalance(trades, trades.shape[0]) if trades.shape[0] > 0 else value
+
+@njit(cache=True)
+def fused_features(
+    bybit_bba: NDArray,
+    binance_bba: NDArray,
+    bybit_vamp: float,
+    binance_vamp: float,
+    bybit_band_totals: NDArray,
+    binance_band_totals: NDArray,
+    bybit_trades: NDArray,
+    binance_trades: NDArray,
+    trades_values: NDArray,
+    mark_price: float,
+    depth_weights: NDArray,
+    weights: NDArray,
+    dirty: NDArray,
+    out: NDArray
+) -> float:
+    """
+    Calculates the features flagged as dirty, and the weighted sum of all of them (the skew), in
+    a single call. Features are indexed in the order of FEATURES (see src.strategy.features.registry).
+
+    Features which aren't dirty keep their previous value in `out`. Disabled features (eg, Binance's
+    in a Bybit-only setup) have a weight of 0, so they are never flagged by `dirty_features`, and
+    their inputs may be passed as empty arrays or zeros. The spreads to the mark price and VAMPs
+    are 0.0 while their reference is 0 (eg, before the ticker is received, or while a side of a
+    book is empty).
+
+    Parameters
+    ----------
+    bybit_bba : NDArray
+        Bybit's best bid and ask, in the format [[bid price, bid size], [ask price, ask size]].
+    binance_bba : NDArray
+        Binance's best bid and ask, in the same format.
+    bybit_vamp : float
+        The VAMP of Bybit's book, as maintained by the book (see BaseOrderBook.vamp).
+    binance_vamp : float
+        The VAMP of Binance's book.
+    bybit_band_totals : NDArray
+        The [bid, ask] quantities within each orderbook imbalance depth of Bybit's book (see BaseOrderBook.band_totals).
+    binance_band_totals : NDArray
+        The same for Binance's book.
+    bybit_trades : NDArray
+        Bybit's trades to calculate the trades imbalance from, oldest first, or an empty array
+        to use `trades_values[1]` instead (eg, from a StreamingTradesImbalance).
+    binance_trades : NDArray
+        Binance's trades, or an empty array to use `trades_values[0]` instead.
+    trades_values : NDArray
+        The [binance, bybit] trades imbalances used when their trades are empty.
+    mark_price : float
+        Bybit's mark price.
+    depth_weights : NDArray
+        The weight of each depth's imbalance.
+    weights : NDArray
+        The weight of each feature, in the order of FEATURES.
+    dirty : NDArray
+        A boolean array, True for the features to recalculate (see `dirty_features`).
+    out : NDArray
+        The feature vector, in the order of FEATURES, with dirty features updated in place.
+
+    Returns
+    -------
+    float
+        The weighted sum of the features.
+
+    Examples
+    --------
+    With Binance's book empty (so its VAMP is 0) and no mark price received yet:
+
+    >>> bba = np.array([[3000.0, 2.0], [3000.5, 1.0]])
+    >>> no_trades = np.empty((0, 4))
+    >>> out = np.zeros(10)
+    >>> skew = fused_features(
+    ...     bba, bba, 3000.2, 0.0, np.ones((2, 6)), np.zeros((2, 6)), no_trades, no_trades,
+    ...     np.zeros(2), 0.0, np.full(6, 1 / 6), np.ones(10), np.ones(10, dtype=np.bool_), out
+    ... )
+    >>> out[[2, 4, 5]]
+    array([0.        , 0.00444405, 0.        ])
+    """
+    bybit_wmid = _wmid_(bybit_bba)
+    binance_wmid = _wmid_(binance_bba) if dirty[3] or dirty[5] else 0.0
+
+    if dirty[0]:
+        out[0] = ((bybit_bba[0, 1] / (bybit_bba[1, 1] + bybit_bba[0, 1])) - 0.5) * 2
+
+    if dirty[1]:
+        out[1] = ((binance_bba[0, 1] / (binance_bba[1, 1] + binance_bba[0, 1])) - 0.5) * 2
+
+    if dirty[2]:
+        out[2] = _log_spread_(bybit_wmid, mark_price)
+
+    if dirty[3]:
+        out[3] = _log_spread_(bybit_wmid, binance_wmid)
+
+    if dirty[4]:
+        out[4] = _log_spread_(bybit_wmid, bybit_vamp)
+
+    if dirty[5]:
+        out[5] = _log_spread_(binance_wmid, binance_vamp)
+
+    if dirty[6]:
+        out[6] = banded_imbalance(binance_band_totals[0], binance_band_totals[1], depth_weights)
+
+    if dirty[7]:
+        out[7] = _trades_feature_(binance_trades, trades_values[0])
+
+    if dirty[8]:
+        out[8] = banded_imbalance(bybit_band_totals[0], bybit_band_totals[1], depth_weights)
+
+    if dirty[9]:
+        out[9] = _trades_feature_(bybit_trades, trades_values[1])
+
+    skew = 0.0
+
+    for i in range(out.size):
+        skew += out[i] * weights[i]
+
+    return skew
@@ -1,106 +1,151 @@
 import numpy as np
-from src.strategy.features.mark_spread import log_price_difference
-from src.strategy.features.bba_imbalance import bba_imbalance
-from src.strategy.features.ob_imbalance import orderbook_imbalance
-from src.strategy.features.trades_imbalance import trades_imbalance
+from numpy.typing import NDArray
+from src.strategy.features.trades_imbalance import StreamingTradesImbalance
+from src.strategy.features.fused import dirty_features, fused_features
+from src.strategy.features.registry import FEATURES, FEATURE_NAMES, FEATURE_INPUTS
+from src.indicators.ema import ema_weights
 from src.sharedstate import SharedState
+from src.utils.events import MarketEvents
+from src.utils.misc import time_ms, datetime_now as dt_now
+from src.utils.ringbuffer import TimedRingBuffer
+from typing import Tuple
 
 class Features:
     """
-    WARNING: Some features are disabled for Bybit-only streams    
+    WARNING: Features using Binance data are disabled for Bybit-only streams
+
+    The features are declared in src.strategy.features.registry, and weighted by the
+    `feature_weights` of parameters.yaml (SharedState.feature_weights), which are hot-reloaded.
+    Disabled features (weighted 0) are never calculated, and their inputs are never read.
+
+    Features are recalculated lazily, only when `generate_skew` is called and only if one of
+    their inputs was updated (see MarketEvents) since they were last calculated, so an instance
+    should be kept for the lifetime of the strategy.
+
+    Attributes
+    ----------
+    ss : SharedState
+        Shared application state containing configuration and market data.
+    values : NDArray
+        The feature vector as of the last `generate_skew` call, in the order of `names`.
+    names : Tuple[str, ...]
+        The name of each feature in `values`.
+    input_times : NDArray
+        The time of the latest update to each feature's inputs, in milliseconds.
     """
     _orderbook_depths_ = np.array([10, 25, 50, 100, 200, 500], dtype=np.int64)
-    _trades_window_ = 1000
+    _vamp_depth_ = 10
+
+    # NOTE: Trades leave a time window as time passes, so these are recalculated on every call while one is set
+    _trades_features_ = [FEATURE_NAMES.index("binance_trades_imbalance"), FEATURE_NAMES.index("bybit_trades_imbalance")]
+    _vamp_features_ = [FEATURE_NAMES.index("binance_wmid_vamp_spread"), FEATURE_NAMES.index("bybit_wmid_vamp_spread")]
+    _imbalance_features_ = [FEATURE_NAMES.index("binance_orderbook_imbalance"), FEATURE_NAMES.index("bybit_orderbook_imbalance")]
+    _dependencies_ = np.array([
+        [name in inputs for name in MarketEvents.INPUTS] for inputs in FEATURE_INPUTS
+    ], dtype=np.bool_)
+
+    names = FEATURE_NAMES
 
     def __init__(self, ss: SharedState) -> None:
         self.ss = ss
+        self.values = np.zeros(len(FEATURE_NAMES), dtype=np.float64)
+        self.input_times = np.zeros(len(FEATURE_NAMES), dtype=np.int64)
+        self._seen_ = np.full(len(FEATURE_NAMES), -1, dtype=np.int64)
+        self._dirty_ = np.zeros(len(FEATURE_NAMES), dtype=np.bool_)
+        self._always_ = np.zeros(len(FEATURE_NAMES), dtype=np.bool_)
+        self._bands_ = self._orderbook_depths_ / 1e-4  # NOTE: Converted as in orderbook_imbalance
+        self._band_totals_ = np.zeros((2, 2, self._orderbook_depths_.size), dtype=np.float64)
+        self._depth_weights_ = ema_weights(self._orderbook_depths_.size)
+        self._trades_values_ = np.zeros(2, dtype=np.float64)
+        self._vamps_ = np.zeros(2, dtype=np.float64)
+        self._no_trades_ = np.empty((0, 4), dtype=np.float64)
+        self._weights_ = None
 
-    def bybit_mark_wmid_spread(self) -> float:
-        return log_price_difference(
-            follow=self.ss.bybit_mark_price, 
-            base=self.ss.bybit_wmid
-        )
+    def _trades_input_(self, trades: TimedRingBuffer, stream: StreamingTradesImbalance) -> Tuple[NDArray, float]:
+        """
+        The trades and streamed value `fused_features` takes for a venue, over the configured window.
 
-    def binance_bybit_wmid_spread(self) -> float:
-        return log_price_difference(
-            follow=self.ss.binance_wmid, 
-            base=self.ss.bybit_wmid
-        )
+        For the last `stream.window` trades, the streaming value is read directly once enough trades
+        have been seen. For the last `trades_window_ms` milliseconds (if set), or until then, the
+        trades in the window are passed to be calculated from.
+        """
+        if self.ss.trades_window_ms > 0:
+            return trades.since(time_ms() - self.ss.trades_window_ms), 0.0
 
-    def bybit_bba_imbalance(self) -> float:
-        return bba_imbalance(
-            bba=self.ss.bybit_bba
-        )
-    
-    def binance_bba_imbalance(self) -> float:
-        return bba_imbalance(
-            bba=self.ss.binance_bba
-        )
-    
-    def bybit_wmid_vamp_spread(self) -> float:
-        return log_price_difference(
-            follow=self.ss.bybit_vamp, 
-            base=self.ss.bybit_wmid
-        )
-
-    def binance_wmid_vamp_spread(self) -> float:
-        return log_price_difference(
-            follow=self.ss.binance_vamp, 
-            base=self.ss.binance_wmid
-        )
-    
-    def bybit_orderbook_imbalance(self) -> float:
-        return orderbook_imbalance(
-            bids=self.ss.bybit_book.bids,
-            asks=self.ss.bybit_book.asks,
-            depths=self._orderbook_depths_
-        )
+        if stream.ready:
+            return trades.recent(0), stream.value
 
-    def binance_orderbook_imbalance(self) -> float:
-        return orderbook_imbalance(
-            bids=self.ss.binance_book.bids,
-            asks=self.ss.binance_book.asks,
-            depths=self._orderbook_depths_
-        )
-    
-    def bybit_trades_imbalance(self) -> float:
-        return trades_imbalance(
-            trades=self.ss.bybit_trades._unwrap(), 
-            window=self._trades_window_
-        )
+        return trades.recent(stream.window), 0.0
 
-    def binance_trades_imbalance(self) -> float:
-        return trades_imbalance(
-            trades=self.ss.binance_trades._unwrap(), 
-            window=self._trades_window_
+    def _set_weights_(self, weights: NDArray) -> None:
+        """
+        Switches to newly loaded weights, clearing the values of features they disable, which
+        are then recalculated if enabled again.
+        """
+        self._weights_ = weights
+        self.values[weights == 0.0] = 0.0
+        self._seen_[weights == 0.0] = -1
+        enabled = [feature for feature, weight in zip(FEATURES, weights) if weight != 0.0]
+        print(
+            f"{dt_now()}: Features enabled: {', '.join(feature.name for feature in enabled)} "
+            f"| Cost: {sum(feature.cost for feature in enabled)}"
         )
 
     def generate_skew(self) -> float:
-        total_skew = 0
-
-        if self.ss.primary_data_feed == "BINANCE":
-            # Total weight = 0.4
-            total_skew += self.bybit_bba_imbalance() * 0.025
-            total_skew += self.binance_bba_imbalance() * 0.025
-            total_skew += self.bybit_mark_wmid_spread() * 0.075
-            total_skew += self.binance_bybit_wmid_spread() * 0.075
-            total_skew += self.bybit_wmid_vamp_spread() * 0.075
-            total_skew += self.binance_wmid_vamp_spread() * 0.075
-
-            # Total weight = 0.6
-            total_skew += self.binance_orderbook_imbalance() * 0.2
-            total_skew += self.binance_trades_imbalance() * 0.2
-            total_skew += self.bybit_orderbook_imbalance() * 0.1
-            total_skew += self.bybit_trades_imbalance() * 0.1
-
-        else:
-            # Total weight = 0.5
-            total_skew += self.bybit_bba_imbalance() * 0.1
-            total_skew += self.bybit_mark_wmid_spread() * 0.15
-            total_skew += self.bybit_wmid_vamp_spread() * 0.15
-
-            # Total weight = 0.5
-            total_skew += self.bybit_orderbook_imbalance() * 0.25
-            total_skew += self.bybit_trades_imbalance() * 0.25
-
-        return total_skew
\ No newline at end of file
+        """
+        Recalculates the features whose inputs changed and returns the weighted sum of all of them,
+        in a single call to `fused_features`, leaving the feature vector in `values` (eg, for logging).
+
+        Returns
+        -------
+        float
+            The weighted skew of the features.
+        """
+        weights = self.ss.feature_weights
+
+        if weights is not self._weights_:
+            self._set_weights_(weights)
+
+        events = self.ss.market_events
+        self._always_[self._trades_features_] = self.ss.trades_window_ms > 0
+
+        if not dirty_features(
+            self._dependencies_, events.versions, events.times, weights,
+            self._always_, self._seen_, self.input_times, self._dirty_
+        ):
+            return float(np.dot(self.values, weights))
+
+        # NOTE: Only the inputs of the features being recalculated are read (eg, slicing trade windows)
+        uses = dict(zip(MarketEvents.INPUTS, self._dependencies_[self._dirty_].any(axis=0)))
+        bybit_trades, binance_trades = self._no_trades_, self._no_trades_
+
+        if uses["bybit_trades"]:
+            bybit_trades, self._trades_values_[1] = self._trades_input_(self.ss.bybit_trades, self.ss.bybit_trades_imbalance)
+
+        if uses["binance_trades"]:
+            binance_trades, self._trades_values_[0] = self._trades_input_(self.ss.binance_trades, self.ss.binance_trades_imbalance)
+
+        # NOTE: Read from the cumulative sums the books maintain, as [binance, bybit]
+        for i, book in enumerate((self.ss.binance_book, self.ss.bybit_book)):
+            if self._dirty_[self._vamp_features_[i]]:
+                self._vamps_[i] = book.vamp(self._vamp_depth_)
+
+            if self._dirty_[self._imbalance_features_[i]]:
+                book.band_totals(self._bands_, self._band_totals_[i, 0], self._band_totals_[i, 1])
+
+        return fused_features(
+            bybit_bba=self.ss.bybit_bba,
+            binance_bba=self.ss.binance_bba,
+            bybit_vamp=self._vamps_[1],
+            binance_vamp=self._vamps_[0],
+            bybit_band_totals=self._band_totals_[1],
+            binance_band_totals=self._band_totals_[0],
+            bybit_trades=bybit_trades,
+            binance_trades=binance_trades,
+            trades_values=self._trades_values_,
+            mark_price=float(self.ss.bybit_mark_price),
+            depth_weights=self._depth_weights_,
+            weights=weights,
+            dirty=self._dirty_,
+            out=self.values
+        )
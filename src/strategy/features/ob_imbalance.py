@@ -53,26 +53,101 @@ def orderbook_imbalance(bids: NDArray, asks: NDArray, depths: NDArray) -> float:
     >>> orderbook_imbalance(bids, asks, depths)
     -0.24142990048382099
     """
-    num_depths = depths.size
     depths = depths / 1e-4  # NOTE: Converting from BPS to decimals
-    weights = ema_weights(num_depths)
-    imbalances = np.empty(num_depths, dtype=np.float64)
-
-    bid_p, bid_q = bids.T
-    ask_p, ask_q = asks.T
-    best_bid_p, best_ask_p = bid_p[0], ask_p[0]
-    
-    for i in range(num_depths):
-        min_bid = best_bid_p * (1 - depths[i])
-        max_ask = best_ask_p * (1 + depths[i])
-
-        num_bids_within_depth = bid_p[bid_p >= min_bid].size
-        num_asks_within_depth = ask_p[ask_p <= max_ask].size
-        total_bid_size_within_depth = np.sum(bid_q[:num_bids_within_depth])
-        total_ask_size_within_depth = np.sum(ask_q[:num_asks_within_depth])
-
-        imbalances[i] = np.log(total_bid_size_within_depth / total_ask_size_within_depth)
-
-    weighted_imbalance = np.sum(imbalances * weights)
-    
-    return weighted_imbalance
\ No newline at end of file
+    weights = ema_weights(depths.size)
+    return weighted_orderbook_imbalance(bids, asks, depths, weights)
+
+@njit(cache=True)
+def weighted_orderbook_imbalance(bids: NDArray, asks: NDArray, depths: NDArray, weights: NDArray) -> float:
+    """
+    Calculates the order book imbalance across price depths with precomputed weights, as used by
+    `orderbook_imbalance` and by callers which convert the depths and build the weights only once.
+
+    The cumulative quantity of each side is computed once, and the number of levels within every
+    depth is then found with a single binary search per side. Depths can be any grid (finer bands,
+    or not sorted), as each is searched for independently. Books which maintain their cumulative
+    sums should pass their band totals to `banded_imbalance` instead (see BaseOrderBook.band_totals).
+
+    Parameters
+    ----------
+    bids : NDArray
+        An array of bid prices and quantities, best first.
+    asks : NDArray
+        An array of ask prices and quantities, best first.
+    depths : NDArray
+        An array of price depths, already converted as in `orderbook_imbalance`.
+    weights : NDArray
+        The weight of each depth's imbalance, of the same size as `depths`.
+
+    Returns
+    -------
+    float
+        The weighted imbalance across the depths, or 0.0 if either side is empty.
+
+    Examples
+    --------
+    >>> bids = np.array([[100.00, 0.35194], [99.75, 0.16040], [99.50, 0.46248], [99.25, 0.79625], [99.00, 0.19408]])
+    >>> asks = np.array([[101.00, 0.80763], [101.25, 0.30421], [101.50, 0.04038], [101.75, 0.39473], [102.00, 0.97438]])
+    >>> depths = np.array([10, 20, 30, 40, 50])
+    >>> weighted_orderbook_imbalance(bids, asks, depths / 1e-4, ema_weights(depths.size))
+    -0.24142990048382099
+    """
+    if bids.shape[0] == 0 or asks.shape[0] == 0:
+        return 0.0
+
+    bid_cumulative = np.cumsum(bids[:, 1])
+    ask_cumulative = np.cumsum(asks[:, 1])
+
+    # NOTE: Bids are sorted by descending price, so they're searched by their negated prices
+    num_bids_within_depths = np.searchsorted(-bids[:, 0], -bids[0, 0] * (1 - depths), side="right")
+    num_asks_within_depths = np.searchsorted(asks[:, 0], asks[0, 0] * (1 + depths), side="right")
+    bid_totals = np.zeros(depths.size, dtype=np.float64)
+    ask_totals = np.zeros(depths.size, dtype=np.float64)
+
+    for i in range(depths.size):
+        num_bids, num_asks = num_bids_within_depths[i], num_asks_within_depths[i]
+        bid_totals[i] = bid_cumulative[num_bids - 1] if num_bids > 0 else 0.0
+        ask_totals[i] = ask_cumulative[num_asks - 1] if num_asks > 0 else 0.0
+
+    return banded_imbalance(bid_totals, ask_totals, weights)
+
+@njit(cache=True)
+def banded_imbalance(bid_totals: NDArray, ask_totals: NDArray, weights: NDArray) -> float:
+    """
+    Calculates the weighted order book imbalance from the total quantity of each side within each
+    depth, eg as maintained by the book (see BaseOrderBook.band_totals).
+
+    Parameters
+    ----------
+    bid_totals : NDArray
+        The bid quantity within each depth.
+    ask_totals : NDArray
+        The ask quantity within each depth.
+    weights : NDArray
+        The weight of each depth's imbalance, of the same size as the totals.
+
+    Returns
+    -------
+    float
+        The weighted imbalance across the depths, or 0.0 if either side is empty.
+
+    Examples
+    --------
+    The depths of `orderbook_imbalance`'s example reach past the whole book, so each band holds
+    every level, giving the same imbalance from the totals alone:
+
+    >>> bid_totals = np.full(5, 0.35194 + 0.16040 + 0.46248 + 0.79625 + 0.19408)
+    >>> ask_totals = np.full(5, 0.80763 + 0.30421 + 0.04038 + 0.39473 + 0.97438)
+    >>> banded_imbalance(bid_totals, ask_totals, ema_weights(5))
+    -0.24142990048382099
+    """
+    # NOTE: Every depth includes the best level, so a side is empty if its totals are 0
+    if bid_totals.size == 0 or bid_totals[0] <= 0.0 or ask_totals[0] <= 0.0:
+        return 0.0
+
+    weighted_imbalance = 0.0
+
+    for i in range(bid_totals.size):
+        weighted_imbalance += np.log(bid_totals[i] / ask_totals[i]) * weights[i]
+
+    return weighted_imbalance
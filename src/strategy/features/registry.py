@@ -0,0 +1,139 @@
+import numpy as np
+from dataclasses import dataclass
+from numpy.typing import NDArray
+from typing import Dict, Optional, Tuple
+
+@dataclass(frozen=True)
+class FeatureSpec:
+    """
+    Declares a feature calculated by `fused_features`.
+
+    Attributes
+    ----------
+    name : str
+        The name of the feature, as used for its weight in parameters.yaml.
+    inputs : Tuple[str, ...]
+        The MarketEvents inputs the feature is calculated from.
+    cost : int
+        The rough relative cost of recalculating the feature: 1 for a few operations on the BBAs,
+        10 for the top levels of a book or lookups in its cumulative sums, and 100 for a trade window.
+    """
+    name: str
+    inputs: Tuple[str, ...]
+    cost: int
+
+    @property
+    def venues(self) -> Tuple[str, ...]:
+        return tuple(sorted({name.split("_")[0].upper() for name in self.inputs}))
+
+
+# NOTE: The order is the order of the feature vector and weights of `fused_features`, which
+# calculates each feature at its index here, so features can only be appended.
+FEATURES = (
+    FeatureSpec("bybit_bba_imbalance", ("bybit_bba",), 1),
+    FeatureSpec("binance_bba_imbalance", ("binance_bba",), 1),
+    FeatureSpec("bybit_mark_wmid_spread", ("bybit_bba", "bybit_ticker"), 1),
+    FeatureSpec("binance_bybit_wmid_spread", ("bybit_bba", "binance_bba"), 1),
+    FeatureSpec("bybit_wmid_vamp_spread", ("bybit_bba", "bybit_book"), 10),
+    FeatureSpec("binance_wmid_vamp_spread", ("binance_bba", "binance_book"), 10),
+    FeatureSpec("binance_orderbook_imbalance", ("binance_book",), 10),
+    FeatureSpec("binance_trades_imbalance", ("binance_trades",), 100),
+    FeatureSpec("bybit_orderbook_imbalance", ("bybit_book",), 10),
+    FeatureSpec("bybit_trades_imbalance", ("bybit_trades",), 100),
+)
+
+FEATURE_NAMES = tuple(feature.name for feature in FEATURES)
+FEATURE_INPUTS = tuple(feature.inputs for feature in FEATURES)
+
+# NOTE: Used for the primary data feed when parameters.yaml doesn't set `feature_weights`.
+DEFAULT_WEIGHTS = {
+    "BINANCE": {
+        "bybit_bba_imbalance": 0.025,
+        "binance_bba_imbalance": 0.025,
+        "bybit_mark_wmid_spread": 0.075,
+        "binance_bybit_wmid_spread": 0.075,
+        "bybit_wmid_vamp_spread": 0.075,
+        "binance_wmid_vamp_spread": 0.075,
+        "binance_orderbook_imbalance": 0.2,
+        "binance_trades_imbalance": 0.2,
+        "bybit_orderbook_imbalance": 0.1,
+        "bybit_trades_imbalance": 0.1,
+    },
+    "BYBIT": {
+        "bybit_bba_imbalance": 0.1,
+        "bybit_mark_wmid_spread": 0.15,
+        "bybit_wmid_vamp_spread": 0.15,
+        "bybit_orderbook_imbalance": 0.25,
+        "bybit_trades_imbalance": 0.25,
+    },
+}
+
+def load_weights(weights: Optional[Dict[str, float]], primary_data_feed: str) -> NDArray:
+    """
+    Converts feature weights from parameters.yaml into the weights array of `fused_features`.
+
+    Features which aren't listed, or are weighted 0, are disabled.
+
+    Parameters
+    ----------
+    weights : Dict[str, float], optional
+        The weight of each enabled feature by name, or None for the defaults of the primary data feed.
+    primary_data_feed : str
+        The primary data feed, "BINANCE" or "BYBIT".
+
+    Returns
+    -------
+    NDArray
+        The weight of each feature, in the order of FEATURES.
+
+    Raises
+    ------
+    ValueError
+        If the weights aren't a mapping, a feature is unknown or its weight isn't a finite number,
+        or a feature uses Binance data while the primary data feed is Bybit.
+
+    Examples
+    --------
+    >>> load_weights({"bybit_bba_imbalance": 0.5}, "BYBIT")[:3]
+    array([0.5, 0. , 0. ])
+    >>> load_weights({"bybit_bba_imbalance": None}, "BYBIT")
+    Traceback (most recent call last):
+    ...
+    ValueError: Weight of bybit_bba_imbalance must be a number, not None!
+    >>> load_weights({"bybit_bba_imbalance": "high"}, "BYBIT")
+    Traceback (most recent call last):
+    ...
+    ValueError: Weight of bybit_bba_imbalance must be a number, not 'high'!
+    >>> load_weights(["bybit_bba_imbalance"], "BYBIT")
+    Traceback (most recent call last):
+    ...
+    ValueError: Feature weights must map feature names to weights, not ['bybit_bba_imbalance']!
+    """
+    if weights is None:
+        weights = DEFAULT_WEIGHTS[primary_data_feed]
+
+    if not isinstance(weights, dict):
+        raise ValueError(f"Feature weights must map feature names to weights, not {weights!r}!")
+
+    unknown = set(weights) - set(FEATURE_NAMES)
+
+    if unknown:
+        raise ValueError(f"Unknown features {sorted(unknown, key=str)}, must be among {list(FEATURE_NAMES)}!")
+
+    arr = np.zeros(len(FEATURES), dtype=np.float64)
+
+    for i, feature in enumerate(FEATURES):
+        weight = weights.get(feature.name, 0.0)
+
+        try:
+            arr[i] = float(weight)
+        except (TypeError, ValueError):
+            raise ValueError(f"Weight of {feature.name} must be a number, not {weight!r}!") from None
+
+        if not np.isfinite(arr[i]):
+            raise ValueError(f"Weight of {feature.name} must be a number, not {weight!r}!")
+
+        if arr[i] != 0.0 and "BINANCE" in feature.venues and primary_data_feed != "BINANCE":
+            raise ValueError(f"Feature {feature.name} requires Binance as the primary data feed!")
+
+    return arr
@@ -10,11 +10,14 @@ def trades_imbalance(trades: NDArray, window: int) -> float:
     using geometrically weighted quantities. The imbalance reflects the dominance of buy or sell trades,
     weighted by the recency of trades in the window.
 
+    The window can be count-based (the last `window` trades) or time-based, by passing the trades
+    within a time window (eg, from `TimedRingBuffer.since`) along with their count as `window`.
+
     Steps:
     1. Determine the effective window size, the lesser of the specified window or the total trades count.
     2. Generate exponential moving average (EMA) weights for the effective window size, with recent trades
        given higher significance.
-    3. Iterate through the trades within the window, applying the weights to the log of (1 + trade quantity)
+    3. Iterate through the most recent trades within the window, applying the weights to the log of (1 + trade quantity)
        to calculate weighted trade quantities. Separate cumulative totals are maintained for buys and sells based
        on the trade side.
     4. Compute the normalized imbalance as the difference between cumulative buy and sell quantities divided
@@ -23,14 +26,15 @@ def trades_imbalance(trades: NDArray, window: int) -> float:
     Parameters
     ----------
     trades : NDArray
-        A 2D array of trade data, where each row represents a trade in format [time, side, price, size]
+        A 2D array of trade data, oldest first, where each row represents a trade in format [time, side, price, size]
     window : int
         The number of most recent trades to consider for the imbalance calculation.
 
     Returns
     -------
     float
-        The normalized imbalance, ranging from -1 (complete sell dominance) to 1 (complete buy dominance).
+        The normalized imbalance, ranging from -1 (complete sell dominance) to 1 (complete buy dominance),
+        or 0 if there are no trades in the window.
 
     Examples
     --------
@@ -43,19 +47,188 @@ def trades_imbalance(trades: NDArray, window: int) -> float:
     ... ])
     >>> window = 5
     >>> print(trades_imbalance(trades, window))
-    -0.7421903970691232
+    0.742191037441798
     """
     window = min(window, trades.shape[0])
+    start = trades.shape[0] - window
+
+    if window == 0:
+        return 0.0
+
     weights = ema_weights(window, reverse=True)
     delta_buys, delta_sells = 0.0, 0.0
     
     for i in range(window):
-        trade_side = trades[i, 1]
-        weighted_qty = np.log(1 + trades[i, 3]) * weights[i]
+        trade_side = trades[start + i, 1]
+        weighted_qty = np.log(1 + trades[start + i, 3]) * weights[i]
 
         if trade_side == 0.0:
             delta_buys += weighted_qty
         else:
             delta_sells += weighted_qty
 
-    return (delta_buys - delta_sells) / (delta_buys + delta_sells)
\ No newline at end of file
+    total = delta_buys + delta_sells
+
+    if total == 0.0:
+        return 0.0
+
+    return (delta_buys - delta_sells) / total
+@njit(cache=True)
+def stream_trades_imbalance(sums: NDArray, history: NDArray, trades: NDArray, window: int, alpha: float) -> None:
+    """
+    Updates the decayed buy/sell sums of a rolling `window` of trades with new trades, in place.
+
+    Each new trade decays the sums by (1 - alpha) and adds its weighted quantity with weight
+    alpha, so the most recent trade carries alpha and the trade k trades back alpha * (1 - alpha)^k,
+    exactly as the `ema_weights` used by `trades_imbalance`. The trade falling out of the window
+    (now `window` trades back) is then subtracted at its weight alpha * (1 - alpha)^window.
+
+    Parameters
+    ----------
+    sums : NDArray
+        The [buys, sells] sums to update.
+    history : NDArray
+        The last `window` trades (or all, if fewer) before the new ones, oldest first.
+    trades : NDArray
+        The new trades, oldest first, in format [time, side, price, size].
+    window : int
+        The number of most recent trades in the rolling window.
+    alpha : float
+        The decay factor, 3 / (window + 1) to match `trades_imbalance`.
+    """
+    decay = 1.0 - alpha
+    tail = alpha * decay ** window
+    num_history = history.shape[0]
+
+    for i in range(trades.shape[0]):
+        sums[0] *= decay
+        sums[1] *= decay
+
+        weighted_qty = np.log(1 + trades[i, 3]) * alpha
+
+        if trades[i, 1] == 0.0:
+            sums[0] += weighted_qty
+        else:
+            sums[1] += weighted_qty
+
+        outgoing = num_history + i - window
+
+        if outgoing < 0:
+            continue
+
+        if outgoing < num_history:
+            side, qty = history[outgoing, 1], history[outgoing, 3]
+        else:
+            side, qty = trades[outgoing - num_history, 1], trades[outgoing - num_history, 3]
+
+        if side == 0.0:
+            sums[0] -= np.log(1 + qty) * tail
+        else:
+            sums[1] -= np.log(1 + qty) * tail
+
+
+class StreamingTradesImbalance:
+    """
+    Maintains the trades imbalance of the last `window` trades as they arrive, so reading it is O(1).
+
+    Once `window` trades have been seen, `value` matches `trades_imbalance(trades, window)` over the
+    same trades to within an absolute tolerance of 1e-12 (rounding errors decay along with the
+    trades, so they don't accumulate; ~1e-14 is typical over millions of trades). Before that,
+    `trades_imbalance` uses a decay factor based on the number of trades held, so `ready` is
+    False and the batch kernel should be used instead.
+
+    Attributes
+    ----------
+    window : int
+        The number of most recent trades in the rolling window.
+    alpha : float
+        The decay factor, 3 / (window + 1).
+    count : int
+        The number of trades seen so far.
+
+    Methods
+    -------
+    update(history: NDArray, trades: NDArray) -> None:
+        Adds several new trades.
+    push(side: float, qty: float, history: NDArray) -> None:
+        Adds a single new trade.
+
+    Examples
+    --------
+    Streaming trades through a window of 50, one at a time and in blocks, so older trades fall out
+    of it, matches the batch kernel over the same buffer:
+
+    >>> from src.utils.ringbuffer import TimedRingBuffer
+    >>> rng = np.random.default_rng(0)
+    >>> trades = np.column_stack([np.arange(500.0), rng.integers(0, 2, 500), np.full(500, 100.0), rng.random(500)])
+    >>> buffer, stream = TimedRingBuffer(capacity=100, width=4), StreamingTradesImbalance(window=50)
+    >>> for trade in trades[:200]:
+    ...     stream.push(trade[1], trade[3], buffer.recent(stream.window))
+    ...     buffer.append(trade)
+    >>> stream.ready, bool(abs(stream.value - trades_imbalance(buffer.recent(50), 50)) < 1e-12)
+    (True, True)
+    >>> for block in np.split(trades[200:], [7, 20, 80, 150]):
+    ...     stream.update(buffer.recent(stream.window), block)
+    ...     buffer.extend(block)
+    >>> bool(abs(stream.value - trades_imbalance(buffer.recent(50), 50)) < 1e-12)
+    True
+    """
+
+    def __init__(self, window: int) -> None:
+        """
+        Initializes the StreamingTradesImbalance with empty sums.
+
+        Parameters
+        ----------
+        window : int
+            The number of most recent trades in the rolling window.
+        """
+        self.window = window
+        self.alpha = 3 / float(window + 1)
+        self.count = 0
+        self._sums_ = np.zeros(2, dtype=np.float64)
+        self._row_ = np.zeros((1, 4), dtype=np.float64)
+
+    @property
+    def ready(self) -> bool:
+        return self.count >= self.window
+
+    @property
+    def value(self) -> float:
+        """
+        The normalized imbalance of the last `window` trades, from -1 (sell dominance) to 1 (buy dominance).
+        """
+        total = self._sums_[0] + self._sums_[1]
+        return (self._sums_[0] - self._sums_[1]) / total if total > 0.0 else 0.0
+
+    def update(self, history: NDArray, trades: NDArray) -> None:
+        """
+        Adds new trades, which must be called before they are added to the trade buffer.
+
+        Parameters
+        ----------
+        history : NDArray
+            The last `window` trades (or all, if fewer) held before the new ones, oldest first.
+        trades : NDArray
+            The new trades, oldest first, in format [time, side, price, size].
+        """
+        stream_trades_imbalance(self._sums_, history, trades, self.window, self.alpha)
+        self.count += trades.shape[0]
+
+    def push(self, side: float, qty: float, history: NDArray) -> None:
+        """
+        Adds a single new trade without allocating an array for it, which must be called
+        before it is added to the trade buffer.
+
+        Parameters
+        ----------
+        side : float
+            The side of the trade, 0.0 for buys and 1.0 for sells.
+        qty : float
+            The size of the trade.
+        history : NDArray
+            The last `window` trades (or all, if fewer) held before the new one, oldest first.
+        """
+        self._row_[0, 1] = side
+        self._row_[0, 3] = qty
+        self.update(history, self._row_)
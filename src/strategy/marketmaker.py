@@ -224,6 +224,7 @@ class MarketMaker:
         List[Tuple[str, float, float]]
             A list of quotes, where each quote is a tuple containing the side, price, and size.
         """
+        self.spread = self._adjusted_spread_()
         bid_skew, ask_skew = self._skew_()
         bid_prices, ask_prices = self._prices_(bid_skew, ask_skew)
         bid_sizes, ask_sizes = self._sizes_(bid_skew, ask_skew)
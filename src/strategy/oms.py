@@ -1,32 +1,88 @@
 import asyncio
-from typing import List, Tuple, Coroutine, Union
-from src.utils.jit_funcs import nbabs
+from dataclasses import dataclass, field
+from time import perf_counter
+from itertools import chain
+from typing import Callable, Dict, Iterable, Iterator, List, Tuple, Union
+from src.utils.misc import datetime_now as dt_now
 from src.exchanges.bybit.post.order import Order
+from src.exchanges.bybit.ratelimit import Priority
 from src.sharedstate import SharedState
 
+@dataclass
+class OrderDiff:
+    """
+    The changes needed to turn the current orders into the desired quotes.
+
+    Attributes
+    ----------
+    amends : List[Tuple[str, float, float]]
+        The orders to amend, each as (order ID, new price, new quantity).
+    cancels : List[str]
+        The IDs of the orders to cancel.
+    creates : List[Tuple[str, float, float]]
+        The orders to create, each as (side, price, quantity).
+    kept : int
+        The number of current orders already matching a quote, left untouched.
+    """
+    amends: List[Tuple[str, float, float]] = field(default_factory=list)
+    cancels: List[str] = field(default_factory=list)
+    creates: List[Tuple[str, float, float]] = field(default_factory=list)
+    kept: int = 0
+
+    @property
+    def empty(self) -> bool:
+        return not (self.amends or self.cancels or self.creates)
+
+
 class OMS:
     """
-    Manages the order lifecycle for Bybit, including segregating, amending, and placing orders based on strategy needs.
+    Manages the order lifecycle for Bybit, reconciling the orders resting on the exchange with
+    the quotes generated by the strategy using as few requests as possible.
+
+    Each side's current orders and quotes are compared best price first. Orders within the price
+    and size tolerances of a quote are left untouched, keeping their queue priority. The rest are
+    amended to the remaining quotes in order, and any orders or quotes left over are cancelled or
+    created. Each kind of change is sent with its batch endpoint, all concurrently.
+
+    If rate limited, cancels and creates reducing the position are sent first. Creates and amends
+    still waiting after `quote_interval_ms` are dropped, as the next iteration supersedes them
+    with a diff against fresh quotes.
+
+    Kept across iterations of the strategy, so the requests sent and orders changed are counted
+    and reported every `report_interval` seconds.
 
     Attributes
     ----------
     ss : SharedState
         Shared state object to access and update application-wide data.
+    order : Order
+        Sends the order requests, over the shared session.
+    report_interval : int
+        The time between reports of the request and order change rates, in seconds.
+    stats : Dict[str, int]
+        The number of ticks, requests sent, and orders kept, amended, cancelled and created since the last report.
 
     Methods
     -------
-    segregate_current_orders(orders: Dict) -> Tuple[List, List]:
+    segregate_current_orders() -> Tuple[List, List]:
         Segregates and sorts current orders into buys and sells.
     segregate_new_orders(orders: List) -> Tuple[List, List]:
         Segregates and sorts new orders into buys and sells.
-    amend_orders(current_orders: List, new_orders: List) -> Coroutine:
-        Amends existing orders based on new order instructions.
+    diff(new_orders: List) -> OrderDiff:
+        Finds the amends, cancels and creates needed to match the new orders.
     run(new_orders: List) -> Coroutine:
-        Orchestrates the order management process, including order segregation, synchronization, and amendment.
+        Reconciles the current orders with the new orders on the exchange.
+    report() -> None:
+        Prints the request and order change rates since the last report, and resets them.
     """
 
+    report_interval = 60
+
     def __init__(self, ss: SharedState) -> None:
         self.ss = ss
+        self.order = Order(self.ss)
+        self.stats = dict.fromkeys(["ticks", "requests", "kept", "amended", "cancelled", "created"], 0)
+        self._reported_ = perf_counter()
 
     def segregate_current_orders(self) -> Tuple[List, List]:
         buys, sells = [], []
@@ -49,136 +105,156 @@ class OMS:
         buys.sort(key=lambda x: x[1], reverse=True)
         sells.sort(key=lambda x: x[1])
         return buys, sells
-    
-    def _orders_within_spread_(self, orders: List, spread: float) -> Union[List]:
-        within_spread = []
-        lower, upper = self.ss.bybit_mid - spread, self.ss.bybit_mid + spread
 
-        for order in orders:
-            price = order[1] if isinstance(order[1], float) else order[2]
-            if price >= lower and price <= upper:
-                within_spread.append(order)
-        return within_spread
+    def _within_tolerance_(self, current: List, new: List) -> bool:
+        """Truthy whether a current order is close enough to a new quote to be left as is"""
+        return (
+            abs(current[2] - new[1]) <= new[1] * self.ss.price_tolerance_bps / 10_000
+            and abs(current[3] - new[2]) <= new[2] * self.ss.size_tolerance
+        )
+
+    def _diff_side_(self, current: List, new: List, diff: OrderDiff) -> None:
+        """
+        Adds the changes for one side of the book to the diff, both sides sorted best price first.
+        """
+        unmatched = []
 
-    def _orders_outside_spread_(self, orders: List, spread: float) -> Union[List]:
-        outside_spread = []
-        lower, upper = self.ss.bybit_mid - spread, self.ss.bybit_mid + spread
+        for quote in new:
+            for i, order in enumerate(current):
+                if self._within_tolerance_(order, quote):
+                    current.pop(i)
+                    diff.kept += 1
+                    break
+            else:
+                unmatched.append(quote)
 
-        for order in orders:
-            price = order[1] if isinstance(order[1], float) else order[2]
-            if price < lower or price > upper:
-                outside_spread.append(order)
-        return outside_spread
-
-    def _within_bounds_(self, new_delta: float, sensitivity: float = 0.1) -> bool:
-        """Truthy whether delta is within min/max limits to change"""
-        lower = self.__primary_delta__ * (1 - sensitivity)
-        upper = self.__primary_delta__ * (1 + sensitivity)
-        return lower < new_delta and upper > new_delta
-    
-    async def amend_orders(self, current_orders: List, new_orders: List) -> Coroutine:
-        tasks = [
-            asyncio.create_task(Order(self.ss).amend((current[0], new[1], new[2])))
-            for current, new in zip(current_orders, new_orders)
-            if nbabs(current[2] - new[1]) > self.ss.buffer
-        ]
-        return await asyncio.gather(*tasks)
-
-    async def replace_orders(self, to_cancel: List, to_send: List) -> Coroutine:
-        ids_to_cancel = [order[0] for order in to_cancel]
-        tasks = [Order(self.ss).cancel_batch(ids_to_cancel)]
-        tasks.append(Order(self.ss).order_limit_batch(to_send))
-        return await asyncio.gather(*tasks)
-
-    async def run(self, new_orders: List[Tuple[str, float, float]], spread: float) -> None:
+        # NOTE: Amends replace cancel/create pairs, as one request changes an order in place
+        for order, quote in zip(current, unmatched):
+            diff.amends.append((order[0], quote[1], quote[2]))
+
+        diff.cancels.extend(order[0] for order in current[len(unmatched):])
+        diff.creates.extend(tuple(quote) for quote in unmatched[len(current):])
+
+    def diff(self, new_orders: List[Tuple[str, float, float]]) -> OrderDiff:
+        """
+        Finds the smallest set of amends, cancels and creates which turn the current orders into the new ones.
+
+        Parameters
+        ----------
+        new_orders : List[Tuple[str, float, float]]
+            A list of new orders, where each order is represented as a tuple of side, price, and quantity.
+
+        Returns
+        -------
+        OrderDiff
+            The changes to make, leaving orders within tolerance of a new order untouched.
+        """
+        current_bids, current_asks = self.segregate_current_orders()
+        new_bids, new_asks = self.segregate_new_orders(new_orders)
+
+        diff = OrderDiff()
+        self._diff_side_(current_bids, new_bids, diff)
+        self._diff_side_(current_asks, new_asks, diff)
+        return diff
+
+    @staticmethod
+    def _acks_(orders: List, responses: List) -> Iterator[Tuple]:
+        """Pairs each order with its acknowledgement, skipping batches which failed or were dropped"""
+        for i, response in enumerate(responses):
+            if response is not None:
+                yield from zip(orders[i * 10:(i + 1) * 10], response["result"]["list"])
+
+    def _apply_(self, created: Iterable[Tuple], amended: Iterable[Tuple], cancelled: Iterable[Tuple]) -> None:
         """
-        Orchestrates the order management process by comparing new orders against current ones,
-        determining necessary adjustments, and executing them.
+        Records the orders created, amended and cancelled in the shared state as soon as the exchange
+        acknowledges them, so the next iteration doesn't act on them again before the order stream does.
+        """
+        for (side, price, qty), ack in created:
+            if ack.get("orderId"):
+                self.ss.current_orders[ack["orderId"]] = {"side": side, "price": price, "qty": qty}
+
+        for (order_id, price, qty), ack in amended:
+            if ack.get("orderId") and order_id in self.ss.current_orders:
+                self.ss.current_orders[order_id].update(price=price, qty=qty)
 
-        Steps:
-        1. No current orders
-            -> Cancel all (for safety), then send new orders
+        for _, ack in cancelled:
+            if ack.get("orderId"):
+                self.ss.current_orders.pop(ack["orderId"], None)
 
-        2. All are bids/asks and have changed (extreme scenario)
-            -> Cancel missing and send new in singles
+    def _reducing_side_(self) -> Union[str, None]:
+        """The side whose orders reduce the position, if any"""
+        if self.ss.inventory_delta > 0:
+            return "Sell"
+        elif self.ss.inventory_delta < 0:
+            return "Buy"
 
-        3. Current and new sides dont match (switching from/to extreme scenario)
-            -> Cancel all and send all new
+        return None
 
-        4. 4 close to BBA orders have changed
-            -> Amend changed orders to new price/qty
+    async def _send_(self, method: Callable, orders: List, *args) -> List:
+        return await method(orders, *args) if orders else []
 
-        5. Outer orders have changed more than buffer
-            -> Cancel changed and send changed as batch
+    async def run(self, new_orders: List[Tuple[str, float, float]]) -> None:
+        """
+        Reconciles the current orders with the new orders, sending only the changes needed (see `diff`).
 
         Parameters
         ----------
         new_orders : List[Tuple[str, float, float]]
             A list of new orders, where each order is represented as a tuple of side, price, and quantity.
         """
+        diff = self.diff(new_orders)
+        self.stats["ticks"] += 1
+        self.stats["kept"] += diff.kept
 
-        # 1st check
-        # if not self.ss.current_orders:
-        # print("1st check triggered here!")
-        await Order(self.ss).cancel_all()
-        await Order(self.ss).order_limit_batch(new_orders)
-        # print(f"New orders: {self._orders_within_spread_(new_orders, spread)}")
-        current_bids, current_asks = self.segregate_current_orders()
-        # print(f"Current orders: {self._orders_within_spread_(current_bids + current_asks, spread)}")
-        return None
+        if not diff.empty:
+            reducing_side = self._reducing_side_()
+            reducing = [order for order in diff.creates if order[0] == reducing_side]
+            others = [order for order in diff.creates if order[0] != reducing_side]
+            max_wait = self.ss.quote_interval_ms / 1000
 
-        # Sorting/segregating current & new orders
-        current_bids, current_asks = self.segregate_current_orders()
-        current_best_bids, current_best_asks = current_bids[:2], current_asks[:2]
-        current_outer_bids, current_outer_asks = current_bids[2:], current_asks[2:]
+            results = await asyncio.gather(
+                self._send_(self.order.order_limit_batch, reducing, Priority.URGENT, max_wait),
+                self._send_(self.order.order_limit_batch, others, Priority.QUOTE, max_wait),
+                self._send_(self.order.amend_batch, diff.amends, max_wait),
+                self._send_(self.order.cancel_batch, diff.cancels),
+            )
+            created = list(chain(self._acks_(reducing, results[0]), self._acks_(others, results[1])))
+            amended = list(self._acks_(diff.amends, results[2]))
+            cancelled = list(self._acks_(diff.cancels, results[3]))
+            self._apply_(created, amended, cancelled)
 
-        new_bids, new_asks = self.segregate_new_orders(new_orders)
-        new_best_bids, new_best_asks = new_bids[:2], new_asks[:2]
-        new_outer_bids, new_outer_asks = new_bids[2:], new_asks[2:]
-
-        # 2nd check
-        current_sides_len = len(set(order[1][0] for order in current_bids + current_asks))
-        new_sides_len = len(set(order[0] for order in new_orders))
-
-        if (current_sides_len == 1) and (new_sides_len == 1):
-            print("2nd check triggered here!")
-            current_unique_prices = set(order[2] for order in current_bids + current_asks)
-            new_unique_prices = set(order[1] for order in new_orders)
-            prices_to_cancel = current_unique_prices - new_unique_prices
-            prices_to_send = new_unique_prices - current_unique_prices
-
-            if prices_to_cancel or prices_to_send:
-                batches_to_cancel = []
-                batches_to_send = []
-                for price in prices_to_cancel:
-                    batches_to_cancel.append(order[0] for order in current_bids + current_asks if order[2] == price)
-                for price in prices_to_send:
-                    batches_to_send.append(order for order in new_orders if order[1] == price)
-                await self.replace_orders(batches_to_cancel, batches_to_send)
-
-            return None 
-
-        # 3rd check
-        if current_sides_len - new_sides_len != 0:
-            print("3rd check triggered here!")
-            await Order(self.ss).cancel_all()
-            await Order(self.ss).order_limit_batch(new_orders)
-
-        # 4th check
-        if new_best_bids and new_best_asks:
-            print("4th check triggered here!")
-            await self.amend_orders(current_best_bids, new_best_bids)
-            await self.amend_orders(current_best_asks, new_best_asks)
-
-        # 5th check
-        print("5th check triggered here!")
-        amend_batches = []
-
-        for current, new in zip(current_outer_bids + current_outer_asks, new_outer_bids + new_outer_asks):
-            if nbabs(current[2] - new[1]) > self.ss.buffer:
-                amend_batches.append([current[0], new[1], new[2]])
-
-        if amend_batches:
-            await Order(self.ss).amend_batch(amend_batches)
-
-        return None
\ No newline at end of file
+            # NOTE: Batches which were dropped by the rate limiter, or failed, count as neither requests nor changes
+            self.stats["requests"] += sum(response is not None for result in results for response in result)
+            self.stats["amended"] += len(amended)
+            self.stats["cancelled"] += len(cancelled)
+            self.stats["created"] += len(created)
+
+        if perf_counter() - self._reported_ >= self.report_interval:
+            self.report()
+
+    def report(self) -> None:
+        """
+        Prints the requests sent per second and orders changed per tick since the last report, along with
+        how the rate limiter handled the requests (see RequestScheduler.stats), then resets them.
+        """
+        elapsed = perf_counter() - self._reported_
+        ticks = max(self.stats["ticks"], 1)
+        changed = self.stats["amended"] + self.stats["cancelled"] + self.stats["created"]
+        quoted = self.stats["kept"] + self.stats["amended"] + self.stats["created"]
+
+        print(
+            f"{dt_now()}: OMS | Requests/s: {self.stats['requests'] / elapsed:.2f} | "
+            f"Orders changed/tick: {changed / ticks:.2f} | Amended: {self.stats['amended']} | "
+            f"Cancelled: {self.stats['cancelled']} | Created: {self.stats['created']} | "
+            f"Kept: {self.stats['kept'] / max(quoted, 1):.0%}"
+        )
+
+        scheduler = self.ss.request_scheduler
+        print(
+            f"{dt_now()}: Rate limiter | Immediate: {scheduler.stats['immediate']} | Waited: {scheduler.stats['waited']} | "
+            f"Dropped: {scheduler.stats['dropped']} | Limited: {scheduler.stats['limited']}"
+        )
+
+        self.stats = dict.fromkeys(self.stats, 0)
+        scheduler.stats = dict.fromkeys(scheduler.stats, 0)
+        self._reported_ = perf_counter()
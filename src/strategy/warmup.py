@@ -0,0 +1,186 @@
+"""
+Compiles and exercises every numba kernel used live before the feeds go live, so the first messages and
+the first strategy iteration don't pay for JIT compilation.
+
+Kernels are run through the same handlers, books, buffers and strategy classes as live, on a
+synthetic deep copy of the shared state, so they are compiled for the dtypes and array layouts seen
+in production without touching any live object. As every kernel is cached (`cache=True`), compiled code is written to numba's
+on-disk cache, and later warm-ups (or live calls) only load it.
+
+Running this module populates the cache ahead of time, eg as a build step of a deploy, so fresh
+deploys skip JIT compilation entirely:
+    $ python -m src.strategy.warmup
+
+NOTE: Numba's cache is keyed on the source files and the CPU, so it must be populated with the
+same code, on the same CPU model, as it is run on.
+"""
+
+import copy
+import numpy as np
+from time import perf_counter
+from typing import Dict, List
+from src.exchanges.bybit.websockets.handlers.kline import BybitKlineHandler
+from src.exchanges.bybit.websockets.handlers.orderbook import BybitBBAHandler
+from src.exchanges.bybit.websockets.handlers.ticker import BybitTickerHandler
+from src.exchanges.bybit.websockets.handlers.trades import BybitTradesHandler
+from src.exchanges.binance.websockets.handlers.orderbook import BinanceBBAHandler
+from src.exchanges.binance.websockets.handlers.trades import BinanceTradesHandler
+from src.exchanges.bybit.ratelimit import RequestScheduler
+from src.indicators.bbw import StreamingBBW
+from src.strategy.features.trades_imbalance import StreamingTradesImbalance
+from src.strategy.marketmaker import MarketMaker
+from src.sharedstate import SharedState
+from src.utils.events import MarketEvents
+from src.utils.misc import datetime_now as dt_now
+from src.utils.ringbuffer import RingBuffer, TimedRingBuffer
+from src.utils.startup import Startup
+
+def _levels_(start: float, step: float, num_levels: int) -> List[List[str]]:
+    return [[f"{start + step * i:.2f}", f"{1 + (i % 7) * 0.125:.3f}"] for i in range(num_levels)]
+
+def _synthetic_state_(ss: SharedState) -> SharedState:
+    """
+    Deep copies the shared state's settings, with fresh market data in place of the live data.
+    """
+    # NOTE: The live books and runtime objects (eg, the startup and request scheduler) are swapped
+    # for fresh ones through the memo, rather than copied, so nothing is shared with the live state
+    books = {venue: type(getattr(ss, f"{venue}_book"))() for venue in ("binance", "bybit")}
+    fresh = {
+        "binance_book": books["binance"],
+        "bybit_book": books["bybit"],
+        "market_events": MarketEvents(),
+        "startup": Startup(),
+        "request_scheduler": RequestScheduler(),
+    }
+    state = copy.deepcopy(ss, {id(getattr(ss, name)): obj for name, obj in fresh.items()})
+    state.bybit_tick_size, state.bybit_lot_size = 0.01, 0.001
+    state.binance_tick_size, state.binance_lot_size = 0.01, 0.001
+
+    for venue, book in books.items():
+        book.set_precision(0.01)
+        setattr(state, f"{venue}_bba", np.ones((2, 2), dtype=np.float64))
+        setattr(state, f"{venue}_trades", TimedRingBuffer(capacity=1000, width=4))
+        setattr(state, f"{venue}_trades_imbalance", StreamingTradesImbalance(window=1000))
+
+    state.bybit_klines = RingBuffer(capacity=500, width=7)
+    state.bybit_bbw = StreamingBBW(length=ss.bb_length)
+    state.bybit_mark_price = 0
+    state.binance_last_price = 0
+    state.volatility_value = 0
+    state.inventory_delta = 0
+    state.current_orders = {}
+    state.binance_ws_connected = state.bybit_ws_connected = False
+    return state
+
+def _warm_books_(state: SharedState) -> None:
+    bybit, binance = state.bybit_book, state.binance_book
+
+    # NOTE: Batches of several deltas are coalesced, while single deltas are applied directly
+    bybit.process_batch([
+        bybit.unpack({"type": "snapshot", "data": {"u": 1, "a": _levels_(3000.01, 0.01, 200), "b": _levels_(3000.0, -0.01, 200)}}),
+        bybit.unpack({"type": "delta", "data": {"u": 2, "a": _levels_(3000.05, 0.02, 12), "b": _levels_(2999.9, -0.03, 12)}}),
+        bybit.unpack({"type": "delta", "data": {"u": 3, "a": [["3000.02", "0"]], "b": [["2999.99", "0"]]}}),
+    ])
+    bybit.process({"type": "delta", "data": {"u": 4, "a": _levels_(3000.03, 0.04, 12), "b": _levels_(2999.95, -0.05, 12)}})
+    bybit.vamp()
+
+    binance.process_snapshot({"lastUpdateId": 100, "asks": _levels_(3000.51, 0.01, 200), "bids": _levels_(3000.5, -0.01, 200)})
+    binance.process_batch([
+        binance.unpack({"data": {"U": 95, "pu": 94, "u": 105, "a": _levels_(3000.55, 0.02, 12), "b": _levels_(3000.4, -0.03, 12)}}),
+        binance.unpack({"data": {"U": 106, "pu": 105, "u": 110, "a": [["3000.52", "0"]], "b": [["3000.49", "0"]]}}),
+    ])
+    binance.process({"data": {"U": 111, "pu": 110, "u": 115, "a": _levels_(3000.53, 0.04, 12), "b": _levels_(3000.45, -0.05, 12)}})
+    binance.vamp()
+
+    BybitBBAHandler(state).process({"data": {"a": [["3000.01", "1.5"]], "b": [["3000.0", "2.5"]]}})
+    BinanceBBAHandler(state).process({"data": {"b": "3000.5", "B": "3.5", "a": "3000.51", "A": "1.25"}})
+    BybitTickerHandler(state).process({"data": {"markPrice": "3000.2"}})
+
+def _bybit_trades_msg_(start: int, num_trades: int) -> Dict:
+    return {"data": [
+        {"T": start + i, "S": "Buy" if i % 3 else "Sell", "p": "3000.1", "v": f"{0.01 * (i % 50 + 1):.3f}"}
+        for i in range(num_trades)
+    ]}
+
+def _binance_trade_msg_(time: int) -> Dict:
+    return {"data": {"T": time, "p": "3000.6", "q": f"{0.01 * (time % 50 + 1):.3f}", "m": bool(time % 2)}}
+
+def _warm_trades_(state: SharedState) -> None:
+    # NOTE: Fewer trades than the window, so the batch trades imbalance is used until the strategy stage adds more
+    BybitTradesHandler(state).initialize([
+        {"time": str(1700000000000 - i), "side": "Buy" if i % 3 else "Sell", "price": "3000.1", "size": f"{0.01 * (i % 50 + 1):.3f}"}
+        for i in range(500)
+    ])
+    BinanceTradesHandler(state).initialize([
+        {"time": 1700000000000 + i, "isBuyerMaker": bool(i % 2), "price": "3000.6", "qty": f"{0.01 * (i % 50 + 1):.3f}"}
+        for i in range(500)
+    ])
+    BybitTradesHandler(state).process(_bybit_trades_msg_(1700000000001, 5))
+    BinanceTradesHandler(state).process(_binance_trade_msg_(1700000000500))
+
+def _warm_klines_(state: SharedState) -> None:
+    handler = BybitKlineHandler(state)
+    handler.initialize([
+        [str(1700000000000 - i * 60000), "3000", "3001", "2999", f"{3000 + (i % 5) * 0.5}", "100", "300000"]
+        for i in range(500)
+    ])
+
+    # NOTE: A candle being updated, then a new candle
+    for start in (1700000000000, 1700000060000):
+        handler.process({"data": [{
+            "start": str(start), "open": "3000", "high": "3001", "low": "2999",
+            "close": "3000.5", "volume": "100", "turnover": "300000"
+        }]})
+
+def _warm_strategy_(state: SharedState) -> None:
+    market_maker = MarketMaker(state)
+    market_maker.generate_quotes()
+
+    # NOTE: Fills the trade windows, so the streamed trades imbalance is read from then on
+    BybitTradesHandler(state).process(_bybit_trades_msg_(1700000000100, 1000))
+    binance = BinanceTradesHandler(state)
+
+    for time in range(1700000000600, 1700000001600):
+        binance.process(_binance_trade_msg_(time))
+
+    market_maker.generate_quotes()
+
+def warmup(ss: SharedState) -> Dict[str, float]:
+    """
+    Compiles (or loads from the cache) and exercises every kernel used live, on a synthetic copy of the shared state.
+
+    Parameters
+    ----------
+    ss : SharedState
+        The shared state, whose settings (eg, book modes and weights) are used. It isn't modified.
+
+    Returns
+    -------
+    Dict[str, float]
+        The time taken by each stage of the warm-up, in seconds.
+    """
+    state = _synthetic_state_(ss)
+    stages = {
+        "books": _warm_books_,
+        "trades": _warm_trades_,
+        "klines": _warm_klines_,
+        "strategy": _warm_strategy_,
+    }
+    timings = {}
+
+    for name, stage in stages.items():
+        start = perf_counter()
+        stage(state)
+        timings[name] = perf_counter() - start
+
+    print(
+        f"{dt_now()}: Warm-up finished in {sum(timings.values()):.2f}s | "
+        + " | ".join(f"{name}: {seconds:.2f}s" for name, seconds in timings.items())
+    )
+
+    return timings
+
+if __name__ == "__main__":
+    from dotenv import load_dotenv
+    load_dotenv()
+    warmup(SharedState())
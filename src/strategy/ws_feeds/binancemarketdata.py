@@ -1,8 +1,11 @@
+import asyncio
 import orjson
 import websockets
-from typing import Coroutine, Union
+from time import monotonic, perf_counter
+from typing import Coroutine, Optional, Union
 
-from src.utils.misc import datetime_now as dt_now
+from src.utils.misc import datetime_now as dt_now, optional_import
+from src.exchanges.common.batching import MessageBatcher
 from src.exchanges.binance.get.client import BinancePublicGet
 from src.exchanges.binance.websockets.handlers.orderbook import BinanceBBAHandler
 from src.exchanges.binance.websockets.handlers.trades import BinanceTradesHandler
@@ -25,11 +28,27 @@ class BinanceMarketData:
         A list of topics for which the WebSocket connection is established.
     stream_handler_map : dict
         A mapping of topics to their corresponding handler functions.
+    decoder : TopicDecoder or None
+        Decodes messages into typed structs, if typed decoding is enabled and available.
+    typed_handler_map : dict
+        A mapping of the decoder's struct types to their corresponding typed handler functions.
+    report_interval : int
+        The time between reports of the order book's coalesced messages, gaps and resyncs, in seconds.
 
     Methods
     -------
     _initialize_() -> Coroutine:
-        Initializes the market data by fetching the latest order book and trades.
+        Initializes the market data and precision, fetching them concurrently.
+    _load_trades_() -> Coroutine:
+        Fetches the latest trades.
+    _resync_book_() -> None:
+        Starts rebuilding the order book from a REST snapshot and the diffs buffered while fetching it.
+    _load_snapshot_() -> Coroutine:
+        Fetches the REST snapshot used to resync the order book.
+    _get_precision_() -> Coroutine:
+        Fetches the symbol's tick & lot size.
+    _report_() -> None:
+        Prints the order book messages coalesced since the last report, and the gaps and resyncs so far.
     _stream_():
         Establishes a WebSocket connection and listens for incoming messages.
     start_feed() -> Coroutine:
@@ -37,6 +56,12 @@ class BinanceMarketData:
     """
 
     _topics_ = ["Orderbook", "BBA", "Trades"]
+    report_interval = 60
+
+    # NOTE: Seconds between snapshot requests, doubled after each failure up to the maximum, so an
+    # outage or rate limit (HTTP 429) doesn't turn into a request every message
+    _snapshot_interval_ = 1.0
+    _max_snapshot_backoff_ = 60.0
 
     def __init__(self, ss: SharedState) -> None:
         """
@@ -51,51 +76,209 @@ class BinanceMarketData:
         self.public_ws = BinancePublicWs(self.ss)
         self.ws_url, self.ws_topics = self.public_ws.multi_stream_request(topics=self._topics_)
 
+        # NOTE: Orderbook messages are handled in batches by the stream, see _stream_()
+        handlers = [
+            BinanceBBAHandler(self.ss),
+            BinanceTradesHandler(self.ss),
+        ]
+
+        self.book_stream = self.ws_topics[0]
         self.stream_handler_map = {
-            self.ws_topics[0]: self.ss.binance_book.process,
-            self.ws_topics[1]: BinanceBBAHandler(self.ss).process,
-            self.ws_topics[2]: BinanceTradesHandler(self.ss).process,
+            stream: handler.process for stream, handler in zip(self.ws_topics[1:], handlers)
         }
 
+        self.decoder = None
+        self.typed_handler_map = {}
+        self._reported_ = perf_counter()
+        self._coalesced_ = 0
+        self._resync_task_: Optional[asyncio.Task] = None
+        self._snapshot_failures_ = 0
+        self._next_snapshot_ = 0.0
+        self._fetching_ = False
+
+        # NOTE: msgspec is optional, messages are decoded into dicts without it
+        binance_decoder = optional_import("src.exchanges.binance.websockets.schemas", "binance_decoder") if self.ss.typed_decoding else None
+
+        if binance_decoder is not None:
+            self.decoder = binance_decoder(self.ws_topics)
+            self.book_schema = self.decoder.schemas[self.book_stream]
+            self.typed_handler_map = {
+                self.decoder.schemas[stream]: handler.process_typed
+                for stream, handler in zip(self.ws_topics[1:], handlers)
+            }
+
     async def _initialize_(self) -> None:
         """
-        Fetches the latest order book and trades data to initialize the market data before streaming.
+        Fetches the latest trades and the symbol's precision concurrently to initialize the market
+        data before streaming. Each is timed as a stage of the startup.
+
+        The order book is built once the stream is live (see `_resync_book_`), so that
+        no diffs are missed between the snapshot and the first streamed update.
+        """
+        await asyncio.gather(
+            self.ss.startup.stage("binance_trades", self._load_trades_()),
+            self.ss.startup.stage("binance_precision", self._get_precision_()),
+        )
+
+    async def _load_trades_(self) -> None:
+        """
+        Fetches the latest trades to initialize the trades buffer.
         """
-        book = await BinancePublicGet(self.ss).orderbook(500)
         trades = await BinancePublicGet(self.ss).trades(1000)
-        self.ss.binance_book.process_snapshot(book)
         BinanceTradesHandler(self.ss).initialize(trades)
 
+    def _resync_book_(self) -> None:
+        """
+        Marks the order book as resyncing, so the stream buffers incoming diffs, and
+        fetches a REST snapshot in the background to rebuild it from.
+
+        A snapshot still being fetched for an earlier resync is cancelled first, as it may
+        predate the diffs now buffered and would otherwise be applied after the new one. A resync
+        still waiting to fetch its snapshot (see `_load_snapshot_`) is kept instead, as its snapshot
+        will follow on from the diffs buffered meanwhile.
+        """
+        book = self.ss.binance_book
+
+        if self._resync_task_ is not None and not self._resync_task_.done():
+            if not self._fetching_:
+                book.needs_resync = False
+                return None
+
+            self._resync_task_.cancel()
+
+        book.begin_resync()
+        print(
+            f"{dt_now()}: Resyncing binance orderbook | Gaps: {book.gap_count} | Resyncs: {book.resync_count} | "
+            f"Coalesced: {book.coalesced_count}"
+        )
+        self._resync_task_ = asyncio.create_task(self._load_snapshot_())
+
+    async def _load_snapshot_(self) -> None:
+        """
+        Fetches a REST snapshot and rebuilds the order book from it and the diffs following it.
+        If the request fails, the book is flagged to retry the resync on the next message.
+
+        Snapshots are requested at most once per `_snapshot_interval_`, and after consecutive
+        failures only once the backoff (doubling up to `_max_snapshot_backoff_`) has passed.
+        """
+        delay = self._next_snapshot_ - monotonic()
+
+        if delay > 0:
+            await asyncio.sleep(delay)
+
+        self._next_snapshot_ = monotonic() + self._snapshot_interval_
+        self._fetching_ = True
+
+        try:
+            snapshot = await BinancePublicGet(self.ss).depth_snapshot(self.ss.binance_book, 500)
+            self.ss.binance_book.process_snapshot(snapshot)
+
+            # NOTE: The diffs buffered meanwhile may not follow on from the snapshot, leaving the book to resync again
+            if self.ss.binance_book.synced:
+                self.ss.market_events.mark("binance_book")
+
+            self._snapshot_failures_ = 0
+
+        except Exception as e:
+            self._snapshot_failures_ += 1
+            backoff = min(self._snapshot_interval_ * 2 ** self._snapshot_failures_, self._max_snapshot_backoff_)
+            self._next_snapshot_ = monotonic() + backoff
+            print(
+                f"{dt_now()}: Error fetching binance orderbook snapshot ({self._snapshot_failures_} in a row), "
+                f"retrying in {backoff:.0f}s: {e}"
+            )
+            self.ss.binance_book.needs_resync = True
+
+        finally:
+            self._fetching_ = False
+
     async def _get_precision_(self) -> None:
         """
         Fetches and assigns the symbol's tick & lot size to the shared market data before streaming.
         """
         info = await BinancePublicGet(self.ss).instrument_info()
-        self.ss.binance_tick_size = float(info["filters"][0]["tickSize"])
-        self.ss.binance_lot_size = float(info["filters"][1]["stepSize"])
+        filters = {f["filterType"]: f for f in info["filters"]}
+        self.ss.binance_tick_size = float(filters["PRICE_FILTER"]["tickSize"])
+        self.ss.binance_lot_size = float(filters["LOT_SIZE"]["stepSize"])
+        self.ss.binance_book.set_precision(self.ss.binance_tick_size)
+
+    def _report_(self) -> None:
+        """
+        Prints the number of order book messages coalesced since the last report, which grows when the
+        stream falls behind, along with the book's gaps and resyncs so far.
+        """
+        book = self.ss.binance_book
+        print(
+            f"{dt_now()}: Binance orderbook | Coalesced: {book.coalesced_count - self._coalesced_} | "
+            f"Gaps: {book.gap_count} | Resyncs: {book.resync_count}"
+        )
+
+        self._coalesced_ = book.coalesced_count
+        self._reported_ = perf_counter()
 
     async def _stream_(self) -> Union[Coroutine, None]:
         """
         Asynchronously listens for messages on the WebSocket and dispatches them to the appropriate handlers.
+
+        When the loop falls behind, all orderbook messages queued up are passed to the book
+        together so their diffs can be coalesced into a single update.
+
+        The feed is ready (as "binance_market" in the startup) once the book has synced to its snapshot and the BBA has been received.
         """
         await self._initialize_()
-        await self._get_precision_()
+        live = False
 
         async for websocket in websockets.connect(self.ws_url):
             print(f"{dt_now()}: Connected to {self.ws_topics} binance feeds...")
             self.ss.binance_ws_connected = True
+            batcher = MessageBatcher(websocket)
+            self._resync_book_()
 
             try:
                 while True:
-                    recv = orjson.loads(await websocket.recv())
+                    book_updates = []
+
+                    for msg in await batcher.recv():
+                        typed = self.decoder.decode(msg) if self.decoder else None
+
+                        if typed is not None:
+                            if type(typed) is self.book_schema:
+                                book_updates.append(self.ss.binance_book.unpack_typed(typed))
+                            else:
+                                self.typed_handler_map[type(typed)](typed)
+
+                            continue
+
+                        recv = orjson.loads(msg)
+
+                        if "success" in recv:
+                            continue
+
+                        if recv["stream"] == self.book_stream:
+                            book_updates.append(self.ss.binance_book.unpack(recv))
+                            continue
+
+                        handler = self.stream_handler_map.get(recv["stream"])
+
+                        if handler:
+                            handler(recv)
+
+                    # NOTE: Updates to an unsynced book are only buffered, so don't change what the strategy reads
+                    if book_updates:
+                        self.ss.binance_book.process_batch(book_updates)
+
+                        if self.ss.binance_book.synced:
+                            self.ss.market_events.mark("binance_book")
 
-                    if "success" in recv:
-                        continue
+                    if perf_counter() - self._reported_ >= self.report_interval:
+                        self._report_()
 
-                    handler = self.stream_handler_map.get(recv["stream"])
+                    if not live and self.ss.binance_book.synced and self.ss.market_events.received("binance_book", "binance_bba"):
+                        live = True
+                        self.ss.startup.set_ready("binance_market")
 
-                    if handler:
-                        handler(recv)
+                    if self.ss.binance_book.needs_resync:
+                        self._resync_book_()
 
             except websockets.ConnectionClosed:
                 continue
@@ -1,8 +1,11 @@
+import asyncio
 import orjson
 import websockets
+from time import perf_counter
 from typing import Coroutine, Union
 
-from src.utils.misc import datetime_now as dt_now
+from src.utils.misc import datetime_now as dt_now, optional_import
+from src.exchanges.common.batching import MessageBatcher
 from src.exchanges.bybit.get.public import BybitPublicClient
 from src.exchanges.bybit.endpoints import WsStreamLinks
 from src.exchanges.bybit.websockets.handlers.kline import BybitKlineHandler
@@ -28,11 +31,27 @@ class BybitMarketData:
         A list of topics for which the WebSocket connection is established.
     topic_handler_map : dict
         A mapping of topics to their corresponding handler functions.
+    decoder : TopicDecoder or None
+        Decodes messages into typed structs, if typed decoding is enabled and available.
+    typed_handler_map : dict
+        A mapping of the decoder's struct types to their corresponding typed handler functions.
+    report_interval : int
+        The time between reports of the order book's coalesced messages, gaps and resyncs, in seconds.
 
     Methods
     -------
-    _initialize_():
-        Initializes the market data by fetching the latest klines and trades.
+    _initialize_() -> Coroutine:
+        Initializes the market data and precision, fetching them concurrently.
+    _load_klines_() -> Coroutine:
+        Fetches the latest klines.
+    _load_trades_() -> Coroutine:
+        Fetches the latest trades.
+    _get_precision_() -> Coroutine:
+        Fetches the symbol's tick & lot size.
+    _resync_book_(websocket) -> Coroutine:
+        Resubscribes to the orderbook topic to receive a fresh snapshot.
+    _report_() -> None:
+        Prints the order book messages coalesced since the last report, and the gaps and resyncs so far.
     _stream_():
         Establishes a WebSocket connection and listens for incoming messages.
     start_feed() -> Coroutine:
@@ -40,6 +59,7 @@ class BybitMarketData:
     """
 
     _topics_ = ["Orderbook", "BBA", "Trades", "Ticker", "Kline"]
+    report_interval = 60
 
     def __init__(self, ss: SharedState) -> None:
         """
@@ -58,21 +78,58 @@ class BybitMarketData:
             interval=1
         )
 
+        handlers = [
+            BybitBBAHandler(self.ss),
+            BybitTradesHandler(self.ss),
+            BybitTickerHandler(self.ss),
+            BybitKlineHandler(self.ss),
+        ]
+
+        # NOTE: Orderbook messages are handled in batches by the stream, see _stream_()
+        self.book_topic = self.ws_topics[0]
         self.topic_handler_map = {
-            self.ws_topics[0]: self.ss.bybit_book.process,
-            self.ws_topics[1]: BybitBBAHandler(self.ss).process,
-            self.ws_topics[2]: BybitTradesHandler(self.ss).process,
-            self.ws_topics[3]: BybitTickerHandler(self.ss).process,
-            self.ws_topics[4]: BybitKlineHandler(self.ss).process,
+            topic: handler.process for topic, handler in zip(self.ws_topics[1:], handlers)
         }
 
+        self.decoder = None
+        self.typed_handler_map = {}
+        self._reported_ = perf_counter()
+        self._coalesced_ = 0
+
+        # NOTE: msgspec is optional, messages are decoded into dicts without it
+        bybit_decoder = optional_import("src.exchanges.bybit.websockets.schemas", "bybit_decoder") if self.ss.typed_decoding else None
+
+        if bybit_decoder is not None:
+            self.decoder = bybit_decoder(self.ws_topics)
+            self.book_schema = self.decoder.schemas[self.book_topic]
+            self.typed_handler_map = {
+                self.decoder.schemas[topic]: handler.process_typed
+                for topic, handler in zip(self.ws_topics[1:], handlers)
+            }
+
     async def _initialize_(self) -> None:
         """
-        Fetches the latest klines and trades data to initialize the market data before streaming.
+        Fetches the latest klines and trades, and the symbol's precision, concurrently to initialize
+        the market data before streaming. Each is timed as a stage of the startup.
+        """
+        await asyncio.gather(
+            self.ss.startup.stage("bybit_klines", self._load_klines_()),
+            self.ss.startup.stage("bybit_trades", self._load_trades_()),
+            self.ss.startup.stage("bybit_precision", self._get_precision_()),
+        )
+
+    async def _load_klines_(self) -> None:
+        """
+        Fetches the latest klines to initialize the kline buffer and volatility.
         """
         klines = await BybitPublicClient(self.ss).klines(1, 500)
-        trades = await BybitPublicClient(self.ss).trades(1000)
         BybitKlineHandler(self.ss).initialize(klines["result"]["list"])
+
+    async def _load_trades_(self) -> None:
+        """
+        Fetches the latest trades to initialize the trades buffer.
+        """
+        trades = await BybitPublicClient(self.ss).trades(1000)
         BybitTradesHandler(self.ss).initialize(trades["result"]["list"])
 
     async def _get_precision_(self) -> None:
@@ -82,31 +139,105 @@ class BybitMarketData:
         info = (await BybitPublicClient(self.ss).instrument_info())["result"]["list"][0]
         self.ss.bybit_tick_size = float(info["priceFilter"]["tickSize"])
         self.ss.bybit_lot_size = float(info["lotSizeFilter"]["qtyStep"])
+        self.ss.bybit_book.set_precision(self.ss.bybit_tick_size)
+
+    async def _resync_book_(self, websocket: websockets.WebSocketClientProtocol) -> None:
+        """
+        Resubscribes to the orderbook topic so Bybit sends a fresh snapshot, buffering deltas until it arrives.
+
+        Parameters
+        ----------
+        websocket : websockets.WebSocketClientProtocol
+            The connected public websocket.
+        """
+        book = self.ss.bybit_book
+        book.begin_resync()
+        print(
+            f"{dt_now()}: Resyncing bybit orderbook | Gaps: {book.gap_count} | Resyncs: {book.resync_count} | "
+            f"Coalesced: {book.coalesced_count}"
+        )
+
+        for req in self.public_ws.resubscribe_requests(self.ws_topics[:1]):
+            await websocket.send(req)
+
+    def _report_(self) -> None:
+        """
+        Prints the number of order book messages coalesced since the last report, which grows when the
+        stream falls behind, along with the book's gaps and resyncs so far.
+        """
+        book = self.ss.bybit_book
+        print(
+            f"{dt_now()}: Bybit orderbook | Coalesced: {book.coalesced_count - self._coalesced_} | "
+            f"Gaps: {book.gap_count} | Resyncs: {book.resync_count}"
+        )
+
+        self._coalesced_ = book.coalesced_count
+        self._reported_ = perf_counter()
 
     async def _stream_(self) -> Union[Coroutine, None]:
         """
         Asynchronously listens for messages on the WebSocket and dispatches them to the appropriate handlers.
+
+        When the loop falls behind, all orderbook messages queued up are passed to the book
+        together so their deltas can be coalesced into a single update.
+
+        The feed is ready (as "bybit_market" in the startup) once the book has synced to its snapshot, and the BBA and ticker have been received.
         """
         await self._initialize_()
-        await self._get_precision_()
+        live = False
 
         async for websocket in websockets.connect(WsStreamLinks.FUTURES_PUBLIC_STREAM):
             print(f"{dt_now()}: Connected to {self.ws_topics} bybit feeds...")
             self.ss.bybit_ws_connected = True
+            batcher = MessageBatcher(websocket)
 
             try:
                 await websocket.send(self.ws_req)
 
                 while True:
-                    recv = orjson.loads(await websocket.recv())
+                    book_updates = []
+
+                    for msg in await batcher.recv():
+                        typed = self.decoder.decode(msg) if self.decoder else None
+
+                        if typed is not None:
+                            if type(typed) is self.book_schema:
+                                book_updates.append(self.ss.bybit_book.unpack_typed(typed))
+                            else:
+                                self.typed_handler_map[type(typed)](typed)
+
+                            continue
+
+                        recv = orjson.loads(msg)
+
+                        if "success" in recv:
+                            continue
+
+                        if recv["topic"] == self.book_topic:
+                            book_updates.append(self.ss.bybit_book.unpack(recv))
+                            continue
+
+                        handler = self.topic_handler_map.get(recv["topic"])
+
+                        if handler:
+                            handler(recv)
+
+                    # NOTE: Updates to an unsynced book are only buffered, so don't change what the strategy reads
+                    if book_updates:
+                        self.ss.bybit_book.process_batch(book_updates)
+
+                        if self.ss.bybit_book.synced:
+                            self.ss.market_events.mark("bybit_book")
 
-                    if "success" in recv:
-                        continue
+                    if perf_counter() - self._reported_ >= self.report_interval:
+                        self._report_()
 
-                    handler = self.topic_handler_map.get(recv["topic"])
+                    if not live and self.ss.bybit_book.synced and self.ss.market_events.received("bybit_book", "bybit_bba", "bybit_ticker"):
+                        live = True
+                        self.ss.startup.set_ready("bybit_market")
 
-                    if handler:
-                        handler(recv)
+                    if self.ss.bybit_book.needs_resync:
+                        await self._resync_book_(websocket)
 
             except websockets.ConnectionClosed:
                 continue
@@ -3,7 +3,7 @@ import orjson
 import websockets
 from typing import Coroutine, Union
 
-from src.utils.misc import datetime_now as dt_now
+from src.utils.misc import datetime_now as dt_now, optional_import
 from src.exchanges.bybit.get.private import BybitPrivateGet
 from src.exchanges.bybit.endpoints import WsStreamLinks
 from src.exchanges.bybit.websockets.handlers.order import BybitOrderHandler
@@ -33,6 +33,10 @@ class BybitPrivateData:
         Handles position-related updates and synchronization.
     topic_handler_map : dict
         A mapping of topics to their corresponding handler functions.
+    decoder : TopicDecoder or None
+        Decodes messages into typed structs, if typed decoding is enabled and available.
+    typed_handler_map : dict
+        A mapping of the decoder's struct types to their corresponding typed handler functions.
 
     Methods
     -------
@@ -71,15 +75,31 @@ class BybitPrivateData:
             self.ws_topics[1]: self.order_handler.process,
         }
 
+        self.decoder = None
+        self.typed_handler_map = {}
+
+        # NOTE: msgspec is optional, messages are decoded into dicts without it
+        bybit_decoder = optional_import("src.exchanges.bybit.websockets.schemas", "bybit_decoder") if self.ss.typed_decoding else None
+
+        if bybit_decoder is not None:
+            self.decoder = bybit_decoder(self.ws_topics)
+            self.typed_handler_map = {
+                self.decoder.schemas[self.ws_topics[0]]: self.position_handler.process_typed,
+                self.decoder.schemas[self.ws_topics[1]]: self.order_handler.process_typed,
+            }
+
     async def _sync_(self) -> Coroutine:
         """
         Synchronizes open orders and current positions at regular intervals.
+
+        The account is ready (as "bybit_account" in the startup) after the first synchronization.
         """
         while True:
             open_orders = await self.private_client.open_orders()
             current_position = await self.private_client.current_position()
             self.order_handler.sync(open_orders)
             self.position_handler.sync(current_position)
+            self.ss.startup.set_ready("bybit_account")
             await asyncio.sleep(10)
 
     async def _stream_(self) -> Union[Coroutine, None]:
@@ -94,7 +114,14 @@ class BybitPrivateData:
                 await websocket.send(self.ws_req)
 
                 while True:
-                    recv = orjson.loads(await websocket.recv())
+                    msg = await websocket.recv()
+                    typed = self.decoder.decode(msg) if self.decoder else None
+
+                    if typed is not None:
+                        self.typed_handler_map[type(typed)](typed)
+                        continue
+
+                    recv = orjson.loads(msg)
 
                     if "success" in recv:
                         continue
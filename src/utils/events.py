@@ -0,0 +1,111 @@
+import asyncio
+import numpy as np
+from numpy.typing import NDArray
+from src.utils.misc import time_ms
+
+class MarketEvents:
+    """
+    Tracks when each input of the strategy was last updated, and wakes the strategy whenever one is.
+
+    Handlers call `mark` after writing an input to the shared state. Each input keeps a version,
+    counting its updates, and the time of its last update in milliseconds. Readers compare versions
+    to tell whether an input has changed since they last used it, as two updates can share a timestamp.
+
+    Attributes
+    ----------
+    INPUTS : Tuple[str, ...]
+        The names of the inputs tracked, in the order of `versions` and `times`.
+    versions : NDArray
+        The number of updates to each input, as of when it is read.
+    times : NDArray
+        The time of the last update to each input in milliseconds (0 if never updated), as of when it is read.
+
+    Methods
+    -------
+    mark(name: str) -> None:
+        Records an update to an input and wakes anything waiting.
+    received(*names: str) -> bool:
+        Checks whether each of the inputs has been updated at least once.
+    wait(timeout: float) -> Coroutine:
+        Waits until any input is updated, or for at most `timeout` seconds.
+    """
+
+    INPUTS = (
+        "bybit_bba",
+        "bybit_book",
+        "bybit_trades",
+        "bybit_ticker",
+        "bybit_kline",
+        "bybit_position",
+        "binance_bba",
+        "binance_book",
+        "binance_trades",
+    )
+
+    def __init__(self) -> None:
+        # NOTE: Kept as lists, as marks far outnumber reads and are cheaper on lists than arrays
+        self._versions_ = [0] * len(self.INPUTS)
+        self._times_ = [0] * len(self.INPUTS)
+        self._index_ = {name: i for i, name in enumerate(self.INPUTS)}
+        self._event_ = asyncio.Event()
+
+    @property
+    def versions(self) -> NDArray:
+        return np.array(self._versions_, dtype=np.int64)
+
+    @property
+    def times(self) -> NDArray:
+        return np.array(self._times_, dtype=np.int64)
+
+    def mark(self, name: str) -> None:
+        """
+        Records an update to an input and wakes anything waiting on `wait`.
+
+        Parameters
+        ----------
+        name : str
+            The name of the input updated, one of INPUTS.
+        """
+        i = self._index_[name]
+        self._versions_[i] += 1
+        self._times_[i] = time_ms()
+        self._event_.set()
+
+    def received(self, *names: str) -> bool:
+        """
+        Checks whether each of the inputs has been updated at least once, eg to tell when a feed is live.
+
+        Parameters
+        ----------
+        *names : str
+            The names of the inputs, among INPUTS.
+
+        Returns
+        -------
+        bool
+            True if all of the inputs have been updated.
+        """
+        return all(self._versions_[self._index_[name]] for name in names)
+
+    async def wait(self, timeout: float) -> bool:
+        """
+        Waits until any input is updated, returning immediately if one was since the last wait.
+
+        Parameters
+        ----------
+        timeout : float
+            The longest time to wait, in seconds.
+
+        Returns
+        -------
+        bool
+            True if an input was updated, False if the wait timed out.
+        """
+        try:
+            await asyncio.wait_for(self._event_.wait(), timeout)
+
+        except asyncio.TimeoutError:
+            return False
+
+        self._event_.clear()
+        return True
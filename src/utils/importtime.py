@@ -0,0 +1,95 @@
+import builtins
+import sys
+from collections import defaultdict
+from time import perf_counter
+from typing import Dict, List
+from src.utils.misc import datetime_now as dt_now
+
+class ImportProfiler:
+    """
+    Measures the time spent importing each module within a `with` block, like `python -X importtime`
+    but reported in-process, so it can be printed on every start.
+
+    Each module's own time excludes the modules it imports, so the times add up to the total
+    and can be summed per package.
+
+    Attributes
+    ----------
+    times : Dict[str, float]
+        The time spent importing each module newly imported in the block, excluding its own imports, in seconds.
+    total : float
+        The time spent in the block, in seconds.
+
+    Methods
+    -------
+    by_package() -> Dict[str, float]:
+        Sums the import times per top-level package.
+    report(limit: int) -> None:
+        Prints the total import time and the slowest packages.
+    """
+
+    def __init__(self) -> None:
+        self.times = {}
+        self.total = 0.0
+        self._nested_: List[float] = []
+
+    def __enter__(self) -> "ImportProfiler":
+        self._import_ = builtins.__import__
+        self._start_ = perf_counter()
+        builtins.__import__ = self._timed_import_
+        return self
+
+    def __exit__(self, *exc) -> None:
+        builtins.__import__ = self._import_
+        self.total = perf_counter() - self._start_
+
+    def _timed_import_(self, name, globals=None, locals=None, fromlist=(), level=0):
+        """
+        Times imports of modules not yet loaded, passing everything else straight through.
+        """
+        if level or name in sys.modules:
+            return self._import_(name, globals, locals, fromlist, level)
+
+        self._nested_.append(0.0)
+        start = perf_counter()
+
+        try:
+            return self._import_(name, globals, locals, fromlist, level)
+
+        finally:
+            elapsed = perf_counter() - start
+            self.times[name] = elapsed - self._nested_.pop()
+
+            if self._nested_:
+                self._nested_[-1] += elapsed
+
+    def by_package(self) -> Dict[str, float]:
+        """
+        Sums the import times per top-level package (eg, all of numba's modules under "numba").
+
+        Returns
+        -------
+        Dict[str, float]
+            The time spent importing each package's modules, in seconds, slowest first.
+        """
+        packages = defaultdict(float)
+
+        for name, seconds in self.times.items():
+            packages[name.split(".")[0]] += seconds
+
+        return dict(sorted(packages.items(), key=lambda item: item[1], reverse=True))
+
+    def report(self, limit: int=8) -> None:
+        """
+        Prints the total import time and the slowest packages.
+
+        Parameters
+        ----------
+        limit : int, optional
+            The number of packages to list, by default 8.
+        """
+        packages = list(self.by_package().items())[:limit]
+        print(
+            f"{dt_now()}: Imports took {self.total:.2f}s | "
+            + " | ".join(f"{name}: {seconds:.2f}s" for name, seconds in packages)
+        )
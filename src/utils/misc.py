@@ -1,7 +1,18 @@
+import importlib
 from time import time_ns, strftime
+from typing import Any, Optional
 
 def datetime_now() -> str:
     return strftime("%Y-%m-%d %H:%M:%S") + f".{(time_ns()//1000) % 1000000:05d}"
 
 def time_ms() -> int:
-    return time_ns()//1_000_000
\ No newline at end of file
+    return time_ns()//1_000_000
+
+def optional_import(module: str, name: str) -> Optional[Any]:
+    """
+    Imports a name from a module when first needed, or returns None if the module (or a dependency) isn't installed.
+    """
+    try:
+        return getattr(importlib.import_module(module), name)
+    except ImportError:
+        return None
\ No newline at end of file
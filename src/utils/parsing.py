@@ -0,0 +1,119 @@
+import numpy as np
+from itertools import chain
+from numba import njit
+from numpy.typing import NDArray
+from typing import List, Optional
+
+POW10 = np.array([10.0 ** i for i in range(23)], dtype=np.float64)
+
+@njit(cache=True)
+def parse_decimals(buf: NDArray, out: NDArray) -> int:
+    """
+    Parses comma-separated plain decimal strings (eg, b"3000.12,0.150") into floats.
+
+    Each number is read as an integer mantissa and a count of decimal places, then divided
+    by an exact power of ten. For mantissas below 2^53 and up to 22 decimal places this is
+    correctly rounded, so results are identical to Python's float().
+
+    Parameters
+    ----------
+    buf : NDArray
+        The ASCII bytes to parse, as a uint8 array.
+    out : NDArray
+        A preallocated float64 array to write the parsed values into.
+
+    Returns
+    -------
+    int
+        The number of values parsed, or -1 if the input contains anything other than plain
+        decimals (eg, exponents) or a value outside of the exact range, in which case the
+        caller should fall back to float().
+    """
+    num_values = 0
+    i, size = 0, buf.size
+
+    while i < size:
+        negative = buf[i] == 45  # NOTE: '-'
+
+        if negative:
+            i += 1
+
+        mantissa, decimals, digits = 0, 0, 0
+        seen_point = False
+
+        while i < size and buf[i] != 44:  # NOTE: ','
+            char = buf[i]
+
+            if 48 <= char <= 57:
+                mantissa = mantissa * 10 + (char - 48)
+                digits += 1
+
+                if seen_point:
+                    decimals += 1
+
+            elif char == 46 and not seen_point:  # NOTE: '.'
+                seen_point = True
+
+            else:
+                return -1
+
+            i += 1
+
+        if digits == 0 or digits > 18 or mantissa > 9007199254740992 or decimals > 22:
+            return -1
+
+        if num_values >= out.size:
+            return -1
+
+        value = mantissa / POW10[decimals]
+        out[num_values] = -value if negative else value
+        num_values += 1
+        i += 1
+
+    return num_values
+
+def parse_levels(levels: List[List[str]], out: Optional[NDArray]=None, threshold: int=10) -> NDArray:
+    """
+    Parses a list of ["price", "qty"] string pairs, as sent by Bybit and Binance, into a float64 array.
+
+    Steps:
+    1. Join all strings into a single comma-separated ASCII buffer.
+    2. Parse the buffer with a compiled decimal parser, directly into `out` if it is large enough.
+    3. Fall back to np.array() for small inputs (where the join costs more than it saves),
+       or if the parser rejects the input.
+
+    Parameters
+    ----------
+    levels : List[List[str]]
+        The levels to parse, each a [price, quantity] pair of decimal strings.
+    out : NDArray, optional
+        A preallocated (n, 2) float64 array to parse into. The returned array is then a view of it,
+        and is overwritten by the next call using the same buffer.
+    threshold : int, optional
+        The minimum number of levels for which the compiled parser is used, by default 10.
+
+    Returns
+    -------
+    NDArray
+        An array of [price, quantity] rows.
+
+    Examples
+    --------
+    >>> parse_levels([["3000.12", "0.150"], ["3000.13", "2"]], threshold=0)
+    array([[3.00012e+03, 1.50000e-01],
+           [3.00013e+03, 2.00000e+00]])
+    """
+    num_levels = len(levels)
+
+    if num_levels < threshold:
+        return np.array(levels, dtype=np.float64).reshape(-1, 2)
+
+    if out is None or out.shape[0] < num_levels:
+        out = np.empty((num_levels, 2), dtype=np.float64)
+
+    buf = np.frombuffer(",".join(chain.from_iterable(levels)).encode(), dtype=np.uint8)
+
+    if parse_decimals(buf, out.reshape(-1)) != num_levels * 2:
+        return np.array(levels, dtype=np.float64).reshape(-1, 2)
+
+    return out[:num_levels]
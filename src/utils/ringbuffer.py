@@ -0,0 +1,261 @@
+import numpy as np
+from numpy.typing import NDArray
+from typing import Union
+
+class RingBuffer:
+    """
+    A fixed-capacity buffer of rows, which keeps its most recent rows contiguous in memory.
+
+    Rows are stored in an array of twice the capacity, with every row written both to its slot
+    and to its slot + capacity. Whatever the position of the write cursor, the most recent rows
+    (up to the full buffer) then always sit in one contiguous slice ending at cursor + capacity,
+    so they can be returned as a view without unwrapping, and passed straight to njit kernels.
+
+    Attributes
+    ----------
+    capacity : int
+        The maximum number of rows held, after which the oldest rows are overwritten.
+    width : int
+        The number of columns in each row.
+
+    Methods
+    -------
+    append(row: NDArray) -> None:
+        Adds a row, overwriting the oldest if the buffer is full.
+    extend(rows: NDArray) -> None:
+        Adds several rows in order, overwriting the oldest if the buffer is full.
+    pop() -> NDArray:
+        Removes and returns the most recent row.
+    recent(n: int) -> NDArray:
+        Returns a view of the most recent `n` rows, oldest first.
+
+    Examples
+    --------
+    >>> buffer = RingBuffer(capacity=3, width=2)
+    >>> buffer.extend(np.array([[1.0, 10.0], [2.0, 20.0], [3.0, 30.0]]))
+    >>> buffer.append(np.array([4.0, 40.0]))
+    >>> buffer.recent(2)
+    array([[ 3., 30.],
+           [ 4., 40.]])
+    >>> buffer[-1]
+    array([ 4., 40.])
+    """
+
+    def __init__(self, capacity: int, width: int, dtype: type=np.float64) -> None:
+        """
+        Initializes an empty RingBuffer.
+
+        Parameters
+        ----------
+        capacity : int
+            The maximum number of rows held.
+        width : int
+            The number of columns in each row.
+        dtype : type, optional
+            The data type of the rows, by default np.float64.
+        """
+        self.capacity = capacity
+        self.width = width
+        self._arr_ = np.zeros((2 * capacity, width), dtype=dtype)
+        self._cursor_ = 0  # NOTE: Slot the next row is written to, in [0, capacity)
+        self._size_ = 0
+
+    def __len__(self) -> int:
+        return self._size_
+
+    def __getitem__(self, idx: Union[int, slice]) -> NDArray:
+        return self.recent(self._size_)[idx]
+
+    def __array__(self, dtype=None, copy=None) -> NDArray:
+        view = self.recent(self._size_)
+        return view.astype(dtype) if dtype is not None or copy else view
+
+    @property
+    def is_full(self) -> bool:
+        return self._size_ == self.capacity
+
+    def append(self, row: NDArray) -> None:
+        """
+        Adds a row after the most recent one, overwriting the oldest row if the buffer is full.
+
+        Parameters
+        ----------
+        row : NDArray
+            The row to add, of length `width` (any sequence of that length is accepted).
+        """
+        self._arr_[self._cursor_] = row
+        self._arr_[self._cursor_ + self.capacity] = row
+        self._cursor_ = (self._cursor_ + 1) % self.capacity
+        self._size_ = min(self._size_ + 1, self.capacity)
+
+    def extend(self, rows: NDArray) -> None:
+        """
+        Adds several rows in order, overwriting the oldest rows if the buffer is full.
+
+        Parameters
+        ----------
+        rows : NDArray
+            A 2D array of rows to add, oldest first. Only the last `capacity` rows are kept.
+        """
+        rows = rows[-self.capacity:]
+        num_rows = rows.shape[0]
+
+        if num_rows == 0:
+            return
+
+        self._write_(self._arr_, rows)
+        self._cursor_ = (self._cursor_ + num_rows) % self.capacity
+        self._size_ = min(self._size_ + num_rows, self.capacity)
+
+    def _write_(self, target: NDArray, values: NDArray) -> None:
+        """
+        Writes values into a mirrored array from the cursor onwards, wrapping around at the capacity.
+
+        Parameters
+        ----------
+        target : NDArray
+            An array of length 2 * capacity, mirrored like the rows.
+        values : NDArray
+            The values to write, at most `capacity` of them.
+        """
+        start = self._cursor_
+        first = min(values.shape[0], self.capacity - start)
+        remaining = values.shape[0] - first
+
+        target[start : start + first] = values[:first]
+        target[start + self.capacity : start + self.capacity + first] = values[:first]
+
+        if remaining:
+            target[:remaining] = values[first:]
+            target[self.capacity : self.capacity + remaining] = values[first:]
+
+    def pop(self) -> NDArray:
+        """
+        Removes the most recent row.
+
+        Returns
+        -------
+        NDArray
+            A copy of the removed row.
+        """
+        if self._size_ == 0:
+            raise IndexError("pop from an empty RingBuffer")
+
+        self._cursor_ = (self._cursor_ - 1) % self.capacity
+        self._size_ -= 1
+        return self._arr_[self._cursor_].copy()
+
+    def recent(self, n: int) -> NDArray:
+        """
+        Returns the most recent `n` rows (or all rows, if fewer are held), oldest first.
+
+        The result is a C-contiguous view into the buffer, not a copy. It should be treated as
+        read-only, and is only valid until the buffer is next written to.
+
+        Parameters
+        ----------
+        n : int
+            The number of rows to return.
+
+        Returns
+        -------
+        NDArray
+            A 2D view of shape (min(n, len(self)), width).
+        """
+        end = self._cursor_ + self.capacity
+        return self._arr_[end - min(n, self._size_) : end]
+
+
+class TimedRingBuffer(RingBuffer):
+    """
+    A RingBuffer of timestamped rows, which also keeps a monotone index of their timestamps
+    so the rows within a time window can be found by binary search.
+
+    The index holds the running maximum of the timestamps (mirrored like the rows), so it stays
+    sorted even if a row arrives slightly out of order, in which case that row is treated as
+    having the latest timestamp seen before it.
+
+    Attributes
+    ----------
+    time_column : int
+        The column of each row holding its timestamp.
+
+    Methods
+    -------
+    since(start_time: float) -> NDArray:
+        Returns a view of the rows with timestamps at or after `start_time`, oldest first.
+
+    Examples
+    --------
+    >>> buffer = TimedRingBuffer(capacity=4, width=2)
+    >>> buffer.extend(np.array([[1000.0, 1.0], [2000.0, 2.0], [3000.0, 3.0]]))
+    >>> buffer.since(1500.0)
+    array([[2.e+03, 2.e+00],
+           [3.e+03, 3.e+00]])
+    """
+
+    def __init__(self, capacity: int, width: int, dtype: type=np.float64, time_column: int=0) -> None:
+        """
+        Initializes an empty TimedRingBuffer.
+
+        Parameters
+        ----------
+        capacity : int
+            The maximum number of rows held.
+        width : int
+            The number of columns in each row.
+        dtype : type, optional
+            The data type of the rows, by default np.float64.
+        time_column : int, optional
+            The column of each row holding its timestamp, by default 0.
+        """
+        super().__init__(capacity, width, dtype)
+        self.time_column = time_column
+        self._times_ = np.full(2 * capacity, -np.inf, dtype=np.float64)
+
+    @property
+    def latest_time(self) -> float:
+        """
+        The latest timestamp held, or -inf if the buffer is empty.
+        """
+        return self._times_[self._cursor_ + self.capacity - 1] if self._size_ else -np.inf
+
+    def append(self, row: NDArray) -> None:
+        time = max(float(row[self.time_column]), self.latest_time)
+        self._times_[self._cursor_] = time
+        self._times_[self._cursor_ + self.capacity] = time
+        super().append(row)
+
+    def extend(self, rows: NDArray) -> None:
+        rows = rows[-self.capacity:]
+        num_rows = rows.shape[0]
+
+        if num_rows == 0:
+            return
+
+        times = np.maximum.accumulate(np.maximum(rows[:, self.time_column], self.latest_time))
+        self._write_(self._times_, times)
+        super().extend(rows)
+
+    def since(self, start_time: float) -> NDArray:
+        """
+        Returns the rows with timestamps at or after `start_time`, oldest first, found by binary
+        search over the timestamp index.
+
+        As with `recent`, the result is a C-contiguous view into the buffer, not a copy. The window
+        is bounded by the buffer's capacity, so it holds at most the last `capacity` rows.
+
+        Parameters
+        ----------
+        start_time : float
+            The earliest timestamp to include, in the same units as the time column.
+
+        Returns
+        -------
+        NDArray
+            A 2D view of shape (num_rows, width), where num_rows may be 0.
+        """
+        end = self._cursor_ + self.capacity
+        begin = end - self._size_
+        offset = np.searchsorted(self._times_[begin:end], start_time, side="left")
+        return self._arr_[begin + offset : end]
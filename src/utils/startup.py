@@ -0,0 +1,107 @@
+import asyncio
+from time import perf_counter
+from typing import Any, Awaitable, Dict, Iterable, Optional
+from src.utils.misc import datetime_now as dt_now
+
+class Startup:
+    """
+    Tracks the startup of each dependency of the strategy (eg, REST warm-ups and data feeds), timing
+    each one and signalling when it is ready.
+
+    Dependencies start concurrently, and anything needing some of them waits on exactly those with
+    `wait_for`, so it can start the instant they are ready rather than polling for them.
+
+    Attributes
+    ----------
+    timings : Dict[str, float]
+        The time taken by each dependency ready so far, in seconds, in the order they became ready.
+        Stages are timed from their own start, and other dependencies from the start of the process.
+
+    Methods
+    -------
+    is_ready(name: str) -> bool:
+        Checks whether a dependency is ready.
+    set_ready(name: str, start: float) -> None:
+        Records a dependency as ready, waking anything waiting on it.
+    stage(name: str, aw: Awaitable) -> Coroutine:
+        Awaits a stage of the startup, then records it as ready.
+    wait_for(names: Iterable[str]) -> Coroutine:
+        Waits until all of the dependencies are ready.
+    report() -> None:
+        Prints the time taken by each dependency.
+    """
+
+    def __init__(self) -> None:
+        self.timings = {}
+        self._start_ = perf_counter()
+        self._events_: Dict[str, asyncio.Event] = {}
+
+    def _event_(self, name: str) -> asyncio.Event:
+        if name not in self._events_:
+            self._events_[name] = asyncio.Event()
+
+        return self._events_[name]
+
+    def is_ready(self, name: str) -> bool:
+        return self._event_(name).is_set()
+
+    def set_ready(self, name: str, start: Optional[float]=None) -> None:
+        """
+        Records a dependency as ready and wakes anything waiting on it. Later calls do nothing,
+        so feeds may call this on every reconnect.
+
+        Parameters
+        ----------
+        name : str
+            The name of the dependency.
+        start : float, optional
+            When the dependency started (from `perf_counter`), by default the start of the process.
+        """
+        event = self._event_(name)
+
+        if event.is_set():
+            return
+
+        self.timings[name] = perf_counter() - (self._start_ if start is None else start)
+        event.set()
+
+    async def stage(self, name: str, aw: Awaitable) -> Any:
+        """
+        Awaits a stage of the startup (eg, a REST request), then records it as ready.
+
+        Parameters
+        ----------
+        name : str
+            The name of the stage.
+        aw : Awaitable
+            The stage itself.
+
+        Returns
+        -------
+        Any
+            The result of the stage.
+        """
+        start = perf_counter()
+        result = await aw
+        self.set_ready(name, start)
+        return result
+
+    async def wait_for(self, names: Iterable[str]) -> None:
+        """
+        Waits until all of the dependencies are ready.
+
+        Parameters
+        ----------
+        names : Iterable[str]
+            The names of the dependencies.
+        """
+        await asyncio.gather(*(self._event_(name).wait() for name in names))
+
+    def report(self) -> None:
+        """
+        Prints the time since the start of the process, and the time taken by each dependency.
+        """
+        print(
+            f"{dt_now()}: Ready after {perf_counter() - self._start_:.2f}s | "
+            + " | ".join(f"{name}: {seconds:.2f}s" for name, seconds in self.timings.items())
+        )